@@ -0,0 +1,109 @@
+"""
+Pure-ASGI middleware that applies rate limiting and CORS headers in one pass.
+
+Replaces the previous stack of a BaseHTTPMiddleware rate limiter, Starlette's
+CORSMiddleware and an @app.middleware("http") function that re-applied the same
+CORS headers. All header tuples are precomputed, and responses are passed
+through without extra tasks or body streaming.
+"""
+import json
+from typing import Iterable, Optional
+
+from rate_limiter import SlidingWindowRateLimiter
+
+
+ALLOW_METHODS = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
+
+# Plain dict form for exception handlers that build their own responses
+CORS_RESPONSE_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": ALLOW_METHODS,
+    "Access-Control-Allow-Headers": "*",
+}
+
+_CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", ALLOW_METHODS.encode()),
+    (b"access-control-allow-headers", b"*"),
+    (b"access-control-expose-headers", b"*"),
+]
+_CORS_HEADER_NAMES = frozenset(name for name, _ in _CORS_HEADERS)
+
+_PREFLIGHT_BODY = b"{}"
+_PREFLIGHT_START = {
+    "type": "http.response.start",
+    "status": 200,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_PREFLIGHT_BODY)).encode()),
+        (b"access-control-allow-origin", b"*"),
+        (b"access-control-allow-methods", ALLOW_METHODS.encode()),
+        (b"access-control-allow-headers", b"*"),
+        (b"access-control-max-age", b"3600"),
+    ],
+}
+
+_RATE_LIMITED_BODY = json.dumps({"detail": "Rate limit exceeded. Please try again later."}).encode()
+
+
+class APIMiddleware:
+    """Rate limiting plus permissive CORS for every HTTP request.
+
+    - OPTIONS preflight requests are answered directly (before rate limiting).
+    - Other requests are rate limited per client IP unless the path is exempt.
+    - Every response gets the CORS headers, replacing any set by the app.
+    WebSocket and lifespan scopes are passed through untouched.
+    """
+
+    def __init__(
+        self,
+        app,
+        calls_per_minute: int = 120,
+        exempt_paths: Iterable[str] = ("/", "/health"),
+        exempt_prefixes: Iterable[str] = ("/api/trades/stream",),
+        limiter: Optional[SlidingWindowRateLimiter] = None,
+    ):
+        self.app = app
+        self.limiter = limiter or SlidingWindowRateLimiter(limit=calls_per_minute, window=60.0)
+        self.exempt_paths = frozenset(exempt_paths)
+        self.exempt_prefixes = tuple(exempt_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS":
+            await send(_PREFLIGHT_START)
+            await send({"type": "http.response.body", "body": _PREFLIGHT_BODY})
+            return
+
+        path = scope["path"]
+        if path not in self.exempt_paths and not path.startswith(self.exempt_prefixes):
+            client = scope.get("client")
+            allowed, retry_after = self.limiter.hit(client[0] if client else "unknown")
+            if not allowed:
+                await self._send_rate_limited(send, retry_after)
+                return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                headers = [h for h in message.get("headers", ()) if h[0].lower() not in _CORS_HEADER_NAMES]
+                headers.extend(_CORS_HEADERS)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _send_rate_limited(self, send, retry_after: int):
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_RATE_LIMITED_BODY)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+                *_CORS_HEADERS,
+            ],
+        })
+        await send({"type": "http.response.body", "body": _RATE_LIMITED_BODY})
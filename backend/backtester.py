@@ -0,0 +1,326 @@
+"""
+Offline backtester for the paper-trading strategies.
+
+Replays ticks recorded by TickRecorder through the unmodified TradingBot
+strategy code (_run_trading_cycle, _run_scalping_cycle, _update_positions)
+with a simulated clock. The bot runs without Claude, Polymarket or CLOB
+clients, so analyses use the algorithmic fallback and prices come only from
+the ticks. Trades and the equity curve come back in the same shapes as
+get_recent_trades() and get_pnl_history().
+
+Usage (from the backend directory):
+    python backtester.py --start 2026-09-01 --end 2026-09-30 --out result.json
+"""
+import argparse
+import asyncio
+import contextlib
+import heapq
+import json
+import math
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from clock import VirtualClock
+from market import Market
+from tick_recorder import META_FILE, TickSegment
+from trading_bot import StrategyParams, TradingBot
+
+# (timestamp, market_id, price_yes, price_no, volume)
+Tick = Tuple[float, str, float, float, float]
+
+# Event kinds, in the order they fire when due at the same instant
+_POSITIONS, _TRADING, _SCALPING, _EQUITY = range(4)
+
+
+class _NullOutput:
+    """stdout sink for the bot's per-market logging during a replay."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of one replay."""
+    trades: List[dict]              # get_recent_trades() shape, newest first
+    equity: List[dict]              # get_pnl_history() shape, oldest first
+    stats: dict                     # get_stats() shape at the end of the replay
+    ticks: int = 0
+    markets: int = 0
+    cycles: int = 0
+    start: Optional[str] = None
+    end: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    params: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def iter_segment_ticks(segments: Iterable[TickSegment]) -> Iterator[Tick]:
+    """Yield ticks from segments in order, reading the mapped columns directly.
+
+    A missing (NaN) NO price is filled as 1 - YES; ticks without a YES price are skipped.
+    """
+    for segment in segments:
+        market_ids = segment.market_ids
+        for ts, market, yes, no, volume in zip(
+            segment.ts, segment.market, segment.price_yes, segment.price_no, segment.volume
+        ):
+            if math.isnan(yes):
+                continue
+            if math.isnan(no):
+                no = 1.0 - yes
+            yield ts, market_ids[market], yes, no, volume
+
+
+def open_segments(data_dir: str, start_day: Optional[str] = None, end_day: Optional[str] = None) -> List[TickSegment]:
+    """Open the daily segments in [start_day, end_day] (YYYY-MM-DD, inclusive), oldest first."""
+    days = sorted(
+        name for name in os.listdir(data_dir)
+        if os.path.exists(os.path.join(data_dir, name, META_FILE))
+        and (start_day is None or name >= start_day)
+        and (end_day is None or name <= end_day)
+    )
+    return [TickSegment(os.path.join(data_dir, day)) for day in days]
+
+
+class Backtester:
+    """Drives TradingBot's strategy code from a tick stream with a simulated clock.
+
+    Cadences default to the live loops: a trading cycle every 5s, a scalping
+    cycle every 3.5s (the midpoint of the live 2-5s jitter) and position updates
+    every 2s. Longer intervals trade fidelity for replay speed.
+    """
+
+    def __init__(
+        self,
+        initial_balance: float = 2000.0,
+        trading_interval: float = 5.0,
+        scalping_interval: float = 3.5,
+        position_interval: float = 2.0,
+        equity_interval: float = 300.0,
+        market_limit: int = 200,
+        scalping_limit: int = 100,
+        rank_interval: float = 300.0,
+        stale_after: float = 3600.0,
+        metadata: Optional[Dict[str, dict]] = None,
+        params: Optional[StrategyParams] = None,
+    ):
+        """
+        Args:
+            initial_balance: Starting paper balance
+            trading_interval: Simulated seconds between trading cycles
+            scalping_interval: Simulated seconds between scalping cycles (0 disables)
+            position_interval: Simulated seconds between position updates
+            equity_interval: Simulated seconds between equity curve points
+            market_limit: Markets per trading cycle, highest volume first (the live fetch size)
+            scalping_limit: Markets per scalping cycle
+            rank_interval: Simulated seconds between re-ranking markets by volume
+            stale_after: Markets without a tick for this long drop out of the ranking
+            metadata: Optional market_id -> market fields (question, endDate, liquidityNum, image)
+            params: Strategy thresholds for the replayed bot (live defaults if None)
+        """
+        self.initial_balance = initial_balance
+        self.trading_interval = trading_interval
+        self.scalping_interval = scalping_interval
+        self.position_interval = position_interval
+        self.equity_interval = equity_interval
+        self.market_limit = market_limit
+        self.scalping_limit = scalping_limit
+        self.rank_interval = rank_interval
+        self.stale_after = stale_after
+        self.metadata = metadata or {}
+        self.params = params or StrategyParams()
+        # Set directly to each event's due time; the replay never sleeps on it
+        self.clock = VirtualClock(start=0.0)
+
+    def _make_bot(self) -> TradingBot:
+        bot = TradingBot(initial_balance=self.initial_balance, params=self.params, clock=self.clock, seed=0)
+        # No network or LLM access: algorithmic analyses, prices from the ticks only
+        bot.claude_client = None
+        bot.polymarket_client = None
+        bot.clob_client = None
+        bot._clob_initialized = True
+        return bot
+
+    def _market(self, bot: TradingBot, market_id: str) -> Market:
+        """Create the market record that ticks for market_id update in place."""
+        data = {
+            'id': market_id,
+            'question': market_id,
+            'active': True,
+            'closed': False,
+            'volumeNum': 0.0,
+            'volume24hr': 0.0,
+            'liquidityNum': 0.0,
+            'tokens': [{'outcome': 'Yes', 'price': 0.5}, {'outcome': 'No', 'price': 0.5}],
+        }
+        data.update(self.metadata.get(market_id, {}))
+        return Market.from_dict(data, bot.end_dates)
+
+    def run(self, ticks: Iterable[Tick]) -> BacktestResult:
+        """Replay ticks (in timestamp order) and return the resulting trades and equity curve."""
+        return asyncio.run(self.run_async(ticks))
+
+    async def run_async(self, ticks: Iterable[Tick]) -> BacktestResult:
+        started = time.perf_counter()
+        self.clock.set_time(0.0)
+        with contextlib.redirect_stdout(_NullOutput()):
+            bot = self._make_bot()
+            markets: Dict[str, Market] = {}
+            last_tick: Dict[str, float] = {}
+            ranked: List[Market] = []
+            equity: List[dict] = []
+            tick_count = 0
+            cycles = 0
+            first_ts = None
+            schedule: List[Tuple[float, int, float]] = []
+            next_rank = 0.0
+
+            def cycle_markets() -> List[Market]:
+                cycle = list(ranked)
+                held = {p.market_id for p in bot.positions.values()}
+                if held:
+                    in_cycle = {m.id for m in cycle}
+                    cycle.extend(markets[m] for m in held if m not in in_cycle and m in markets)
+                return cycle
+
+            async def fire(kind: int, now: float):
+                nonlocal ranked, next_rank, cycles
+                if now >= next_rank:
+                    fresh = [m for m in markets.values() if now - last_tick[m.id] <= self.stale_after]
+                    ranked = heapq.nlargest(self.market_limit, fresh, key=lambda m: m.volume)
+                    next_rank = now + self.rank_interval
+
+                if kind == _TRADING:
+                    cycle = cycle_markets()
+                    await bot._run_trading_cycle(cycle)
+                    bot._update_pnl_history()
+                    bot._prune_analyses(cycle)
+                    cycles += 1
+                elif kind == _SCALPING:
+                    await bot._run_scalping_cycle(ranked[:self.scalping_limit])
+                elif kind == _POSITIONS:
+                    if bot.positions:
+                        await bot._update_positions(cycle_markets())
+                        bot._update_pnl_history()
+                else:
+                    unrealized = sum(p.unrealized_pnl for p in bot.positions.values())
+                    equity.append(bot._pnl_point_to_dict(self.clock.now(), bot.realized_pnl + unrealized))
+
+            intervals = {
+                _POSITIONS: self.position_interval,
+                _TRADING: self.trading_interval,
+                _SCALPING: self.scalping_interval,
+                _EQUITY: self.equity_interval,
+            }
+
+            ts = 0.0
+            for ts, market_id, yes, no, volume in ticks:
+                if first_ts is None:
+                    first_ts = ts
+                    self.clock.set_time(ts)
+                    schedule = [(ts + interval, kind, interval) for kind, interval in intervals.items() if interval > 0]
+                    heapq.heapify(schedule)
+                    next_rank = ts
+
+                while schedule and schedule[0][0] <= ts:
+                    due, kind, interval = heapq.heappop(schedule)
+                    self.clock.set_time(due)
+                    await fire(kind, due)
+                    heapq.heappush(schedule, (due + interval, kind, interval))
+
+                market = markets.get(market_id)
+                if market is None:
+                    market = markets[market_id] = self._market(bot, market_id)
+                market.set_token_prices(yes, no)
+                market.volume = market.volume_24h = volume
+                last_tick[market_id] = ts
+                tick_count += 1
+
+            if first_ts is not None:
+                # Close the curve at the last tick
+                self.clock.set_time(ts)
+                await fire(_EQUITY, ts)
+
+            result = BacktestResult(
+                trades=[bot._trade_to_dict(t) for t in bot.trades],
+                equity=equity,
+                stats=bot._compute_stats(),
+                ticks=tick_count,
+                markets=len(markets),
+                cycles=cycles,
+                start=datetime.fromtimestamp(first_ts).isoformat() if first_ts is not None else None,
+                end=datetime.fromtimestamp(ts).isoformat() if first_ts is not None else None,
+                params={
+                    'initialBalance': self.initial_balance,
+                    'tradingInterval': self.trading_interval,
+                    'scalpingInterval': self.scalping_interval,
+                    'positionInterval': self.position_interval,
+                    'marketLimit': self.market_limit,
+                    'strategy': asdict(self.params),
+                },
+            )
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks-dir", default=os.getenv("TICK_DATA_DIR", os.path.join("data", "ticks")))
+    parser.add_argument("--start", help="First day to replay (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last day to replay (YYYY-MM-DD)")
+    parser.add_argument("--metadata", help="JSON file mapping market id -> question/endDate/liquidityNum")
+    parser.add_argument("--balance", type=float, default=2000.0)
+    parser.add_argument("--trading-interval", type=float, default=5.0)
+    parser.add_argument("--scalping-interval", type=float, default=3.5)
+    parser.add_argument("--position-interval", type=float, default=2.0)
+    parser.add_argument("--market-limit", type=int, default=200)
+    parser.add_argument("--out", help="Write the full result as JSON to this file")
+    args = parser.parse_args()
+
+    metadata = None
+    if args.metadata:
+        with open(args.metadata, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+
+    backtester = Backtester(
+        initial_balance=args.balance,
+        trading_interval=args.trading_interval,
+        scalping_interval=args.scalping_interval,
+        position_interval=args.position_interval,
+        market_limit=args.market_limit,
+        metadata=metadata,
+    )
+    segments = open_segments(args.ticks_dir, args.start, args.end)
+    try:
+        result = backtester.run(iter_segment_ticks(segments))
+    finally:
+        for segment in segments:
+            segment.close()
+
+    # Write the results before printing the summary, so a failed print cannot lose them
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result.to_dict(), f)
+
+    stats = result.stats
+    print(f"Replayed {result.ticks:,} ticks over {result.markets:,} markets "
+          f"({result.start} -> {result.end}) in {result.elapsed_seconds:.1f}s")
+    print(f"  cycles: {result.cycles:,}  trades: {len(result.trades):,}  "
+          f"win rate: {stats['winRate']:.1f}%")
+    print(f"  balance: ${stats['balance']:,.2f}  net worth: ${stats['netWorth']:,.2f}  "
+          f"P&L: ${stats['totalProfit']:,.2f}")
+    if args.out:
+        print(f"  wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
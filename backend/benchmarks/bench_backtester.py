@@ -0,0 +1,82 @@
+"""
+Benchmark the backtester's replay speed on synthetic random-walk ticks.
+
+Records ticks for --markets markets over --hours simulated hours with
+TickRecorder, then replays them through Backtester and reports simulated
+seconds replayed per wall-clock second.
+
+Usage (from the backend directory):
+    python benchmarks/bench_backtester.py [--markets 2000] [--hours 6] [--trading-interval 60]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from backtester import Backtester, iter_segment_ticks, open_segments  # noqa: E402
+from tick_recorder import TickRecorder  # noqa: E402
+
+
+def record_ticks(data_dir: str, markets: int, hours: float, ticks_per_second: int, seed: int) -> int:
+    rng = random.Random(seed)
+    market_ids = [f"m{i}" for i in range(markets)]
+    prices = {m: rng.uniform(0.1, 0.9) for m in market_ids}
+    volumes = {m: rng.uniform(1e3, 5e5) for m in market_ids}
+
+    recorder = TickRecorder(data_dir)
+    base = time.time() - hours * 3600 - 86400
+    count = 0
+    for second in range(int(hours * 3600)):
+        for market_id in rng.sample(market_ids, ticks_per_second):
+            price = min(0.97, max(0.03, prices[market_id] + rng.gauss(0, 0.01)))
+            prices[market_id] = price
+            recorder.record(market_id, price, 1.0 - price, volumes[market_id], base + second)
+            count += 1
+    recorder.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--markets", type=int, default=2000)
+    parser.add_argument("--hours", type=float, default=6.0)
+    parser.add_argument("--ticks-per-second", type=int, default=50)
+    parser.add_argument("--trading-interval", type=float, default=60.0)
+    parser.add_argument("--scalping-interval", type=float, default=3.5)
+    parser.add_argument("--position-interval", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="backtest-")
+    try:
+        recorded = record_ticks(data_dir, args.markets, args.hours, args.ticks_per_second, args.seed)
+        backtester = Backtester(
+            trading_interval=args.trading_interval,
+            scalping_interval=args.scalping_interval,
+            position_interval=args.position_interval,
+        )
+        segments = open_segments(data_dir)
+        try:
+            result = backtester.run(iter_segment_ticks(segments))
+        finally:
+            for segment in segments:
+                segment.close()
+
+        simulated = args.hours * 3600
+        print(f"{recorded:,} ticks over {args.markets:,} markets, {args.hours:g} simulated hours")
+        print(f"  replay:      {result.elapsed_seconds:8.1f} s "
+              f"({simulated / result.elapsed_seconds:,.0f}x real time, "
+              f"{result.ticks / result.elapsed_seconds:,.0f} ticks/s)")
+        print(f"  cycles:      {result.cycles:8,} trading cycles, {len(result.trades):,} trades")
+        print(f"  month est.:  {30 * 86400 / simulated * result.elapsed_seconds / 60:8.1f} min at this density")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Throughput comparison of the API middleware stacks on /api/trading/* endpoints.
+
+"legacy" rebuilds the previous stack: a BaseHTTPMiddleware rate limiter,
+Starlette's CORSMiddleware and an @app.middleware("http") CORS function.
+"asgi" is the single pure-ASGI APIMiddleware. Both wrap the same FastAPI routes,
+which serve a TradingBot loaded with synthetic positions, trades and P&L points.
+Requests are driven in-process through the ASGI interface, so the numbers reflect
+middleware and framework overhead without network noise.
+
+Usage (from the backend directory, with requirements installed):
+    python benchmarks/bench_middleware.py [--requests 20000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from api_middleware import APIMiddleware  # noqa: E402
+from rate_limiter import SlidingWindowRateLimiter  # noqa: E402
+from trading_bot import SimulatedTrade, TradingBot, TradingPosition  # noqa: E402
+
+
+ENDPOINTS = ["/api/trading/stats", "/api/trading/positions", "/api/trading/trades", "/api/trading/pnl-history"]
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
+    "Access-Control-Allow-Headers": "*",
+}
+
+
+def make_bot() -> TradingBot:
+    bot = TradingBot()
+    bot.claude_client = None
+    now = datetime.now()
+    for i in range(20):
+        bot.positions[f"m{i}-Yes"] = TradingPosition(f"m{i}", f"Market {i}", "Yes", 0.4, 20.0, now, 0.42, 1.0)
+    for i in range(100):
+        bot.trades.append(SimulatedTrade(f"t{i}", f"m{i % 20}", f"Market {i % 20}", now, "BUY", "Yes", 0.4, 20.0, "bench"))
+    for i in range(100):
+        bot.pnl_history.append((now, float(i)))
+    return bot
+
+
+def make_app(stack: str) -> FastAPI:
+    app = FastAPI()
+    bot = make_bot()
+
+    @app.get("/api/trading/stats")
+    async def stats():
+        return bot.get_stats()
+
+    @app.get("/api/trading/positions")
+    async def positions():
+        return {"positions": bot.get_positions()}
+
+    @app.get("/api/trading/trades")
+    async def trades(limit: int = 100):
+        return {"trades": bot.get_recent_trades(limit=limit)}
+
+    @app.get("/api/trading/pnl-history")
+    async def pnl_history(limit: int = 100):
+        return {"history": bot.get_pnl_history(limit=limit)}
+
+    if stack == "asgi":
+        # Limit high enough that the benchmark never trips it
+        app.add_middleware(APIMiddleware, calls_per_minute=10**9)
+        return app
+
+    class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+        def __init__(self, app):
+            super().__init__(app)
+            self.limiter = SlidingWindowRateLimiter(limit=10**9)
+
+        async def dispatch(self, request: Request, call_next):
+            allowed, retry_after = self.limiter.hit(request.client.host if request.client else "unknown")
+            if not allowed:
+                return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded."})
+            return await call_next(request)
+
+    app.add_middleware(LegacyRateLimitMiddleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:5173"],
+        allow_origin_regex=r"https?://.*",
+        allow_credentials=False,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["*"],
+        max_age=3600,
+    )
+
+    @app.middleware("http")
+    async def add_cors_headers(request: Request, call_next):
+        response = await call_next(request)
+        for name, value in CORS_HEADERS.items():
+            response.headers[name] = value
+        response.headers["Access-Control-Expose-Headers"] = "*"
+        return response
+
+    return app
+
+
+async def call(app, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"origin", b"http://localhost:5173")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run(app, requests: int, concurrency: int) -> float:
+    # Warm up route compilation and caches
+    for path in ENDPOINTS:
+        await call(app, path)
+
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(ENDPOINTS[i % len(ENDPOINTS)])
+
+    async def worker():
+        while not queue.empty():
+            assert await call(app, queue.get_nowait()) == 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    # Silence the bot's per-call logging so it does not dominate the measurement
+    devnull = open(os.devnull, "w")
+    results = {}
+    for stack in ("legacy", "asgi"):
+        app = make_app(stack)
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            results[stack] = asyncio.run(run(app, args.requests, args.concurrency))
+        finally:
+            sys.stdout = stdout
+
+    print(f"{args.requests:,} requests over {', '.join(ENDPOINTS)} (concurrency {args.concurrency})")
+    for stack, rps in results.items():
+        print(f"  {stack:<8}{rps:>10,.0f} req/s")
+    print(f"  speedup  {results['asgi'] / results['legacy']:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
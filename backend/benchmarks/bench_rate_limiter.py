@@ -0,0 +1,131 @@
+"""
+Benchmark the API rate limiter at 100k distinct client IPs.
+
+Compares the previous per-IP timestamp-list limiter with SlidingWindowRateLimiter
+on per-request latency and retained memory, including after the clients go idle.
+
+Usage (from the backend directory):
+    python benchmarks/bench_rate_limiter.py [--clients 100000] [--requests-per-client 5]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from rate_limiter import SlidingWindowRateLimiter  # noqa: E402
+
+
+class LegacyListRateLimiter:
+    """The previous RateLimitMiddleware algorithm: one timestamp list per IP, never evicted."""
+
+    def __init__(self, limit: int, clock):
+        self.limit = limit
+        self._clock = clock
+        self.requests = {}
+
+    def hit(self, key):
+        now = self._clock()
+        if key in self.requests:
+            self.requests[key] = [t for t in self.requests[key] if now - t < 60]
+        else:
+            self.requests[key] = []
+        if len(self.requests[key]) >= self.limit:
+            return False, 60
+        self.requests[key].append(now)
+        return True, 0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_ips(count: int):
+    return [f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}" for i in range(count)]
+
+
+def _drive(limiter, clock, order):
+    for ip in order:
+        # Spread traffic over one minute of simulated time
+        clock.now += 60.0 / len(order)
+        limiter.hit(ip)
+
+
+def run(limiter_factory, ips, requests_per_client: int, seed: int = 7):
+    order = [ip for ip in ips for _ in range(requests_per_client)]
+    random.Random(seed).shuffle(order)
+
+    # Timing pass (without tracemalloc, which slows allocation-heavy code)
+    clock = FakeClock()
+    limiter = limiter_factory(clock)
+    gc.collect()
+    started = time.perf_counter()
+    _drive(limiter, clock, order)
+    elapsed = time.perf_counter() - started
+
+    # Memory pass
+    clock = FakeClock()
+    limiter = limiter_factory(clock)
+    gc.collect()
+    tracemalloc.start()
+    _drive(limiter, clock, order)
+    retained, _ = tracemalloc.get_traced_memory()
+
+    # All clients go idle; a trickle of traffic from one client should let the
+    # limiter shed idle state
+    clock.now += 600
+    for _ in range(len(ips)):
+        clock.now += 0.001
+        limiter.hit("192.168.0.1")
+    retained_after_idle, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracked = len(limiter.requests) if hasattr(limiter, "requests") else len(limiter)
+    return {
+        "requests": len(order),
+        "ns_per_request": elapsed / len(order) * 1e9,
+        "retained_mb": retained / 1e6,
+        "retained_after_idle_mb": retained_after_idle / 1e6,
+        "tracked_after_idle": tracked,
+    }
+
+
+def report(title, results):
+    print(title)
+    print(f"  {'limiter':<16}{'ns/request':>12}{'retained MB':>14}{'MB after idle':>15}{'clients after idle':>20}")
+    for name, r in results.items():
+        print(f"  {name:<16}{r['ns_per_request']:>12.0f}{r['retained_mb']:>14.1f}"
+              f"{r['retained_after_idle_mb']:>15.1f}{r['tracked_after_idle']:>20,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--requests-per-client", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=120)
+    args = parser.parse_args()
+
+    def compare(ips, requests_per_client):
+        return {
+            "legacy list": run(lambda clock: LegacyListRateLimiter(args.limit, clock), ips, requests_per_client),
+            "sliding window": run(lambda clock: SlidingWindowRateLimiter(args.limit, 60.0, clock=clock), ips, requests_per_client),
+        }
+
+    report(f"{args.clients:,} distinct IPs x {args.requests_per_client} requests/min, limit {args.limit}/min",
+           compare(make_ips(args.clients), args.requests_per_client))
+    # Busy clients close to the limit, where the legacy list scan is O(limit) per request
+    busy = max(1, args.clients // 100)
+    report(f"{busy:,} busy IPs x {args.limit} requests/min, limit {args.limit}/min",
+           compare(make_ips(busy), args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Microbenchmark of the realistic-market filter over synthetic questions.
+
+Compares the previous per-pattern implementation (one re.search per pattern,
+then a substring scan of the celebrity blocklist) with TradingBot's compiled
+alternations, both cold (every question new) and warm (memoized verdicts, as
+in the second and third loops of a cycle), and checks the verdicts agree.
+
+Usage (from the backend directory):
+    python benchmarks/bench_realistic_filter.py [--questions 50000]
+"""
+import argparse
+import contextlib
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from market import Market  # noqa: E402
+from trading_bot import (  # noqa: E402
+    POLITICAL_CELEBRITY_BLOCKLIST,
+    POLITICAL_KEYWORDS,
+    UNREALISTIC_PATTERNS,
+    TradingBot,
+)
+
+SUBJECTS = ["the Fed", "Bitcoin", "the Lakers", "Arsenal", "the Senate", "Oprah", "Taylor Swift",
+            "a YouTuber", "Ethereum", "the governor of Texas", "Mark Cuban", "CPI", "Nvidia"]
+ACTIONS = ["cut rates in December", "close above $100k", "win the championship", "pass the bill",
+           "win the presidential nomination", "release a new album", "hit a new high this week",
+           "announce a meme coin", "beat estimates"]
+
+
+def legacy_is_realistic(question: str) -> bool:
+    for pattern in UNREALISTIC_PATTERNS:
+        if re.search(pattern, question, re.IGNORECASE):
+            return False
+    if any(keyword in question for keyword in POLITICAL_KEYWORDS):
+        for celebrity in POLITICAL_CELEBRITY_BLOCKLIST:
+            if celebrity in question:
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    markets = [
+        Market(id=str(i), question=f"Will {rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} (#{i})?")
+        for i in range(args.questions)
+    ]
+    lowered = [m.question.lower() for m in markets]
+
+    started = time.perf_counter()
+    expected = [legacy_is_realistic(q) for q in lowered]
+    legacy = time.perf_counter() - started
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        bot = TradingBot()
+        started = time.perf_counter()
+        cold_verdicts = [bot._is_realistic_market(m) for m in markets]
+        cold = time.perf_counter() - started
+        started = time.perf_counter()
+        warm_verdicts = [bot._is_realistic_market(m) for m in markets]
+        warm = time.perf_counter() - started
+
+    assert cold_verdicts == expected and warm_verdicts == expected, "verdicts differ from the legacy filter"
+    rejected = expected.count(False)
+    n = args.questions
+    print(f"{n:,} questions ({rejected:,} rejected)")
+    print(f"  legacy per-pattern:  {legacy / n * 1e6:7.2f} us/question")
+    print(f"  compiled (cold):     {cold / n * 1e6:7.2f} us/question  ({legacy / cold:5.1f}x)")
+    print(f"  compiled (memoized): {warm / n * 1e6:7.2f} us/question  ({legacy / warm:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark TickRecorder ingest and read throughput.
+
+Measures the cost of record() on the caller's thread (what the event loop pays),
+the background flush rate into the mapped column files, and a full zero-copy
+column scan of the written segment.
+
+Usage (from the backend directory):
+    python benchmarks/bench_tick_recorder.py [--ticks 1000000] [--markets 2000]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from tick_recorder import TickRecorder  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--markets", type=int, default=2000)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="ticks-")
+    try:
+        market_ids = [f"0x{i:064x}" for i in range(args.markets)]
+        recorder = TickRecorder(data_dir)
+        recorder.start()
+
+        # Keep all ticks inside one UTC day
+        base = time.time()
+        base -= base % 86400
+        step = 80000.0 / args.ticks
+
+        started = time.perf_counter()
+        for i in range(args.ticks):
+            recorder.record(market_ids[i % args.markets], 0.42, 0.58, 1000.0, base + i * step)
+        record_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        recorder.close()
+        drain_seconds = time.perf_counter() - started
+
+        day = recorder.days()[0]
+        started = time.perf_counter()
+        with recorder.open_segment(day) as segment:
+            rows = len(segment)
+            total = sum(segment.price_yes)
+            open_and_scan = time.perf_counter() - started
+        bytes_on_disk = sum(
+            os.path.getsize(os.path.join(data_dir, day, name)) for name in os.listdir(os.path.join(data_dir, day))
+        )
+
+        print(f"{args.ticks:,} ticks over {args.markets:,} markets")
+        print(f"  record():        {record_seconds / args.ticks * 1e9:8.0f} ns/tick  "
+              f"({args.ticks / record_seconds:,.0f} ticks/s on the caller)")
+        print(f"  drain on close:  {drain_seconds:8.2f} s after recording finished")
+        print(f"  written:         {rows:,} rows, {bytes_on_disk / 1e6:.1f} MB on disk "
+              f"(dropped {recorder.dropped:,})")
+        print(f"  open + scan:     {open_and_scan * 1e3:8.1f} ms for one column "
+              f"(mean price_yes {total / rows:.3f})")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
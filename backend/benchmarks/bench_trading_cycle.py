@@ -0,0 +1,308 @@
+"""
+Load and latency benchmark for the trading cycle as the market count grows.
+
+For each scale (default 100, 1k, 10k and 50k markets) a fresh TradingBot on a
+VirtualClock is fed synthetic markets by a local fake PolymarketClient, with
+Claude replaced by a stub that answers instantly. Per iteration it times:
+
+    fetch        fake client get_markets() plus normalization into Market records
+    analyze      _analyze_markets()        (from bot.cycle_metrics)
+    positions    _update_positions()       inside the trading cycle
+    trades       _execute_trades()
+    trading      the whole _run_trading_cycle()
+    scalping     _run_scalping_cycle() over the top 100 markets
+    update       _update_positions() as run by the position refresh loop
+
+and reports median/p95 milliseconds per stage, peak RSS, and the allocations
+of one extra traced iteration (tracemalloc peak and net new blocks). Each scale
+runs in its own process so peak RSS is per scale. Inputs are seeded and time is
+virtual, so every run sees the same markets, prices and decisions.
+
+Results can be saved as a JSON baseline and later runs compared against it;
+stages slower than the baseline by more than --tolerance are flagged and the
+script exits non-zero. Baselines are machine-specific: record one per machine.
+
+Usage (from the backend directory):
+    python benchmarks/bench_trading_cycle.py --save-baseline benchmarks/baselines/trading_cycle.json
+    python benchmarks/bench_trading_cycle.py --baseline benchmarks/baselines/trading_cycle.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from clock import VirtualClock  # noqa: E402
+from trading_bot import TradingBot  # noqa: E402
+
+START_TIME = 1_790_000_000.0  # Fixed virtual start, so end-date windows are reproducible
+DEFAULT_SCALES = (100, 1_000, 10_000, 50_000)
+STAGES = ("fetch", "analyze", "positions", "trades", "trading", "scalping", "update")
+# Stage differences below this many milliseconds are treated as noise
+NOISE_FLOOR_MS = 1.0
+
+TOPICS = ["Lakers", "Celtics", "Arsenal", "Chelsea", "Fed rates", "CPI", "Bitcoin", "Ethereum", "S&P 500", "Oil"]
+VERBS = ["beat expectations", "close above its open", "win on Sunday", "rise this week", "hold above support"]
+UNREALISTIC = ["Will MrBeast run for president?", "Will Elon tweet a meme today?", "Will I win the lottery?"]
+
+
+class FakePolymarketClient:
+    """Serves a deterministic synthetic market set; prices random-walk on every fetch."""
+
+    def __init__(self, count: int, seed: int, now: datetime):
+        rng = random.Random(seed)
+        self.rng = rng
+        self.markets = []
+        for i in range(count):
+            roll = rng.random()
+            if roll < 0.05:
+                question = UNREALISTIC[i % len(UNREALISTIC)]
+            else:
+                question = f"Will {TOPICS[i % len(TOPICS)]} {VERBS[(i // len(TOPICS)) % len(VERBS)]} (#{i})?"
+            market = {
+                'id': f"market-{i}",
+                'question': question,
+                'volumeNum': rng.uniform(200, 500_000),
+                'liquidityNum': rng.uniform(500, 100_000),
+                'active': True,
+                'closed': False,
+                'tokens': [{'outcome': 'Yes', 'price': 0.5}, {'outcome': 'No', 'price': 0.5}],
+            }
+            # Mostly 1-4 weeks out, some far away, some undated
+            if roll < 0.75:
+                market['endDate'] = (now + timedelta(days=rng.uniform(7.5, 27))).strftime("%Y-%m-%dT%H:%M:%SZ")
+            elif roll < 0.9:
+                market['endDate'] = (now + timedelta(days=rng.uniform(60, 400))).strftime("%Y-%m-%dT%H:%M:%SZ")
+            price = rng.uniform(0.12, 0.88)
+            market['tokens'] = [{'outcome': 'Yes', 'price': price}, {'outcome': 'No', 'price': 1 - price}]
+            self.markets.append(market)
+        self.markets.sort(key=lambda m: m['volumeNum'], reverse=True)
+        self.by_id = {m['id']: m for m in self.markets}
+
+    def _step(self):
+        rng = self.rng
+        for market in self.markets:
+            price = min(0.95, max(0.05, market['tokens'][0]['price'] + rng.gauss(0, 0.01)))
+            market['tokens'] = [{'outcome': 'Yes', 'price': price}, {'outcome': 'No', 'price': 1 - price}]
+
+    async def get_markets(self, limit: int = 100, offset: int = 0, use_clob: bool = False):
+        self._step()
+        return [dict(m) for m in self.markets[offset:offset + limit]]
+
+    async def get_market_by_id(self, market_id: str):
+        market = self.by_id.get(market_id)
+        return dict(market) if market else None
+
+
+class _StubResponse:
+    def __init__(self, text: str):
+        self.content = [type("Block", (), {"text": text})()]
+
+
+class StubClaude:
+    """Answers messages.create() instantly with a deterministic trading decision."""
+
+    def __init__(self):
+        self.messages = self
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        decision = {
+            "should_trade": self.calls % 3 == 0,
+            "direction": "Yes" if self.calls % 2 else "No",
+            "confidence": 0.7,
+            "position_size_pct": 0.015,
+            "reasoning": "benchmark stub",
+        }
+        return _StubResponse(json.dumps(decision))
+
+
+async def _drive(clock: VirtualClock, coro):
+    """Run coro to completion, advancing virtual time past its clock.sleep() calls."""
+    task = asyncio.ensure_future(coro)
+    while not task.done():
+        await clock.run_for(1.0)
+    return task.result()
+
+
+async def _iteration(bot: TradingBot, client: FakePolymarketClient, clock: VirtualClock, scale: int) -> dict:
+    started = time.perf_counter()
+    markets = bot._normalize(await client.get_markets(limit=scale))
+    fetch_ms = (time.perf_counter() - started) * 1000
+
+    await _drive(clock, bot._run_trading_cycle(markets))
+    trading = bot.cycle_metrics['trading']
+    await _drive(clock, bot._run_scalping_cycle(markets[:100]))
+    bot.cycle_metrics.pop('positions', None)
+    await _drive(clock, bot._update_positions(markets))
+    bot._update_pnl_history()
+    await clock.run_for(5.0)
+
+    return {
+        'fetch': fetch_ms,
+        'analyze': trading['analyzeMs'],
+        'positions': trading['positionsMs'],
+        'trades': trading['tradesMs'],
+        'trading': trading['totalMs'],
+        'scalping': bot.cycle_metrics['scalping']['totalMs'],
+        'update': bot.cycle_metrics.get('positions', {}).get('totalMs', 0.0),
+    }
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_scale(scale: int, cycles: int, seed: int) -> dict:
+    clock = VirtualClock(start=START_TIME)
+    client = FakePolymarketClient(scale, seed, clock.now())
+    bot = TradingBot(clock=clock, seed=seed)
+    claude = StubClaude()
+    bot.claude_client = claude
+    bot.polymarket_client = client
+    bot._clob_initialized = True
+
+    # Warm-up iteration (first analyses, first positions)
+    await _iteration(bot, client, clock, scale)
+
+    samples = [await _iteration(bot, client, clock, scale) for _ in range(cycles)]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    await _iteration(bot, client, clock, scale)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    new_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    return {
+        'markets': scale,
+        'cycles': cycles,
+        'stages': {
+            stage: {
+                'median': _percentile([s[stage] for s in samples], 0.5),
+                'p95': _percentile([s[stage] for s in samples], 0.95),
+            }
+            for stage in STAGES
+        },
+        'peakRssMB': _peak_rss_mb(),
+        'allocPeakKB': traced_peak / 1024,
+        'allocNewBlocks': new_blocks,
+        'analyzed': bot.cycle_metrics['trading']['analyzed'],
+        'trades': len(bot.trades),
+        'claudeCalls': claude.calls,
+    }
+
+
+def _child(scale: int, cycles: int, seed: int):
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        result = asyncio.run(run_scale(scale, cycles, seed))
+    # Last line of output; import-time warnings may precede it
+    stdout.write("\n" + json.dumps(result) + "\n")
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """Return a list of human-readable regressions against a baseline."""
+    regressions = []
+    for scale, result in results.items():
+        previous = baseline.get('scales', {}).get(scale)
+        if not previous:
+            continue
+        for stage in STAGES:
+            now_ms = result['stages'][stage]['median']
+            then_ms = previous['stages'].get(stage, {}).get('median')
+            if then_ms is None:
+                continue
+            if now_ms > then_ms * (1 + tolerance) and now_ms - then_ms > NOISE_FLOOR_MS:
+                regressions.append(f"{scale} markets: {stage} median {then_ms:.1f}ms -> {now_ms:.1f}ms")
+        if result['peakRssMB'] > previous['peakRssMB'] * (1 + tolerance):
+            regressions.append(f"{scale} markets: peak RSS {previous['peakRssMB']:.0f}MB -> {result['peakRssMB']:.0f}MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES))
+    parser.add_argument("--cycles", type=int, default=5, help="Timed iterations per scale")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--save-baseline", help="Write results as a baseline JSON to this path")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        _child(args.child, args.cycles, args.seed)
+        return
+
+    results = {}
+    for scale in (int(s) for s in args.scales.split(",")):
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", str(scale),
+             "--cycles", str(args.cycles), "--seed", str(args.seed)],
+            capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            print(f"{scale} markets: benchmark failed\n{completed.stderr}")
+            sys.exit(completed.returncode)
+        results[str(scale)] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    header = "".join(f"{stage:^13}" for stage in STAGES)
+    print(f"median / p95 ms per stage ({args.cycles} iterations)")
+    print(f"{'markets':>8}{header}{'rss MB':>9}{'alloc KB':>10}{'blocks':>9}")
+    for scale, result in results.items():
+        stages = "".join(
+            f"{result['stages'][s]['median']:>6.1f}/{result['stages'][s]['p95']:<6.1f}" for s in STAGES
+        )
+        print(f"{int(scale):>8}{stages}{result['peakRssMB']:>9.0f}"
+              f"{result['allocPeakKB']:>10.0f}{result['allocNewBlocks']:>9,}")
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nRegressions vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            exit_code = 1
+        else:
+            print(f"\nNo regressions vs {args.baseline}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                'recordedAt': datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cycles': args.cycles,
+                'seed': args.seed,
+                'scales': results,
+            }, f, indent=2)
+        print(f"Saved baseline to {args.save_baseline}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
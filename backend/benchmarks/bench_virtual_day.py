@@ -0,0 +1,89 @@
+"""
+Run the bot's live loops (trading, position updates, scalping) on a VirtualClock.
+
+A fake Polymarket client serves --markets random-walk markets; Claude and the
+CLOB client are disabled. Reports how long --hours of simulated loop behaviour
+takes in wall time, and the resulting stats. Runs with the same --seed are
+identical.
+
+Usage (from the backend directory):
+    python benchmarks/bench_virtual_day.py [--hours 24] [--markets 20] [--seed 1]
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from clock import VirtualClock  # noqa: E402
+from trading_bot import TradingBot  # noqa: E402
+
+
+class FakePolymarketClient:
+    """Serves a fixed set of markets whose prices random-walk on every fetch."""
+
+    def __init__(self, markets: int, seed: int):
+        self.rng = random.Random(seed)
+        self.fetches = 0
+        self.lookups = 0
+        self.markets = [
+            {
+                'id': f"market-{i}",
+                'question': f"Will team {i} win tonight's game?",
+                'volumeNum': 100000.0,
+                'liquidityNum': 50000.0,
+                'tokens': [{'outcome': 'Yes', 'price': 0.4}, {'outcome': 'No', 'price': 0.6}],
+            }
+            for i in range(markets)
+        ]
+
+    async def get_markets(self, limit: int = 100, offset: int = 0, use_clob: bool = False):
+        self.fetches += 1
+        for market in self.markets:
+            price = min(0.95, max(0.05, market['tokens'][0]['price'] + self.rng.gauss(0, 0.01)))
+            market['tokens'] = [{'outcome': 'Yes', 'price': price}, {'outcome': 'No', 'price': 1 - price}]
+        return [dict(m) for m in self.markets[offset:offset + limit]]
+
+    async def get_market_by_id(self, market_id: str):
+        self.lookups += 1
+        return next((dict(m) for m in self.markets if m['id'] == market_id), None)
+
+
+async def run(hours: float, markets: int, seed: int):
+    clock = VirtualClock(start=1_790_000_000.0)
+    bot = TradingBot(clock=clock, seed=seed)
+    bot.claude_client = None
+    bot._clob_initialized = True
+    client = FakePolymarketClient(markets, seed)
+
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        bot.start(client)
+        await clock.run_for(hours * 3600)
+        bot.stop()
+        await clock.run_for(1)
+    elapsed = time.perf_counter() - started
+    return elapsed, client.fetches, client.lookups, bot._compute_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--markets", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    elapsed, fetches, lookups, stats = asyncio.run(run(args.hours, args.markets, args.seed))
+    print(f"{args.hours:g} simulated hours, {args.markets} markets: {elapsed:.1f}s wall "
+          f"({args.hours * 3600 / elapsed:,.0f}x real time, {fetches:,} market fetches, "
+          f"{lookups:,} single-market refreshes)")
+    print(f"  trades: {stats['totalTrades']}  win rate: {stats['winRate']:.1f}%  "
+          f"net worth: ${stats['netWorth']:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Async access to the synchronous py-clob-client.
+
+ClobClient methods block on HTTP requests. AsyncClobClient runs them on its
+own bounded thread pool, so CLOB calls neither block the event loop nor
+occupy the default executor used by asyncio.to_thread(), with a per-call
+timeout and per-method call/error/timeout/latency counters.
+
+A timed-out call stops being awaited, but its thread keeps running until the
+underlying request returns; the pool size bounds how many such calls can pile
+up, and further calls queue behind them.
+"""
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    from py_clob_client.client import ClobClient
+    from py_clob_client.clob_types import BookParams
+    CLOB_AVAILABLE = True
+except ImportError:
+    CLOB_AVAILABLE = False
+
+CLOB_HOST = "https://clob.polymarket.com"
+CLOB_CHAIN_ID = 137  # Polygon mainnet
+# Token ids per bulk price request
+CLOB_BATCH_SIZE = 500
+
+
+class AsyncClobClient:
+    """Awaitable wrapper running a ClobClient's blocking calls on a dedicated thread pool."""
+
+    def __init__(self, client, max_workers: int = 4, timeout: float = 10.0):
+        """
+        Args:
+            client: A ClobClient (or any object with the same synchronous methods)
+            max_workers: Threads available for concurrent CLOB calls
+            timeout: Seconds to wait for a call before raising asyncio.TimeoutError
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="clob")
+        self.in_flight = 0
+        # method name -> counters
+        self._metrics: Dict[str, dict] = {}
+
+    async def call(self, method: str, *args, timeout: Optional[float] = None, **kwargs):
+        """Run client.<method>(*args, **kwargs) on the CLOB pool and await its result.
+
+        Raises:
+            asyncio.TimeoutError: If the call takes longer than timeout (default self.timeout)
+        """
+        function = functools.partial(getattr(self.client, method), *args, **kwargs)
+        stats = self._metrics.get(method)
+        if stats is None:
+            stats = self._metrics[method] = {'calls': 0, 'errors': 0, 'timeouts': 0, 'totalMs': 0.0, 'maxMs': 0.0}
+        stats['calls'] += 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, function)
+            return await asyncio.wait_for(future, self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            stats['timeouts'] += 1
+            raise
+        except Exception:
+            stats['errors'] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            elapsed = (time.perf_counter() - started) * 1000
+            stats['totalMs'] += elapsed
+            stats['maxMs'] = max(stats['maxMs'], elapsed)
+
+    async def get_markets(self, next_cursor: str = "MA=="):
+        """One page of CLOB markets: {limit, count, next_cursor, data}."""
+        return await self.call('get_markets', next_cursor=next_cursor)
+
+    async def get_market(self, condition_id: str):
+        """A single CLOB market (with its tokens) by condition id."""
+        return await self.call('get_market', condition_id)
+
+    async def _bulk(self, method: str, params: list) -> dict:
+        """Call a multi-token endpoint in CLOB_BATCH_SIZE chunks (concurrently) and merge the results."""
+        chunks = [params[i:i + CLOB_BATCH_SIZE] for i in range(0, len(params), CLOB_BATCH_SIZE)]
+        merged = {}
+        for result in await asyncio.gather(*(self.call(method, chunk) for chunk in chunks)):
+            if isinstance(result, dict):
+                merged.update(result)
+        return merged
+
+    async def get_midpoints(self, token_ids: List[str]) -> Dict[str, str]:
+        """Order-book midpoints for many tokens in one request per chunk: {token_id: price}."""
+        if not token_ids:
+            return {}
+        return await self._bulk('get_midpoints', [BookParams(token_id=token_id) for token_id in token_ids])
+
+    async def get_prices(self, token_ids: List[str], side: str = "BUY") -> Dict[str, dict]:
+        """Best prices on one side for many tokens in one request per chunk: {token_id: {side: price}}."""
+        if not token_ids:
+            return {}
+        return await self._bulk('get_prices', [BookParams(token_id=token_id, side=side) for token_id in token_ids])
+
+    def metrics(self) -> dict:
+        """Pool settings, calls in flight and per-method counters."""
+        return {
+            'maxWorkers': self.max_workers,
+            'timeout': self.timeout,
+            'inFlight': self.in_flight,
+            'methods': {name: dict(stats) for name, stats in self._metrics.items()},
+        }
+
+    def close(self):
+        """Stop the pool; queued calls are cancelled, running ones finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global adapter shared by the trading bot and the Polymarket client
+_clob_client: Optional[AsyncClobClient] = None
+_clob_client_initialized = False
+
+
+def get_clob_client() -> Optional[AsyncClobClient]:
+    """Get the global CLOB adapter (public methods only), or None if py-clob-client is unavailable.
+
+    CLOB_MAX_WORKERS and CLOB_TIMEOUT override the pool size and per-call timeout.
+    """
+    global _clob_client, _clob_client_initialized
+    if not _clob_client_initialized:
+        _clob_client_initialized = True
+        if not CLOB_AVAILABLE:
+            print("Warning: py-clob-client not installed - install with: pip install py-clob-client")
+            return None
+        try:
+            _clob_client = AsyncClobClient(
+                ClobClient(host=CLOB_HOST, chain_id=CLOB_CHAIN_ID),
+                max_workers=int(os.getenv("CLOB_MAX_WORKERS", "4")),
+                timeout=float(os.getenv("CLOB_TIMEOUT", "10")),
+            )
+        except Exception as e:
+            print(f"Warning: Could not initialize CLOB client: {e}")
+    return _clob_client
@@ -0,0 +1,107 @@
+"""
+Clocks for the trading bot's loops and strategy timing.
+
+SystemClock is wall time and real asyncio sleeps. VirtualClock keeps its own
+time, which moves only when run_until()/run_for() advance it to the next
+pending sleep, so loops written against clock.sleep() and clock.now() can be
+fast-forwarded deterministically: a simulated day of loop behaviour takes as
+long as the work inside the loops, not 24 hours.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+
+
+class SystemClock:
+    """Wall-clock time and real sleeps."""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def time(self) -> float:
+        return time.time()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock:
+    """Simulated time that jumps straight to the next scheduled wake-up.
+
+    Coroutines call sleep() as usual; a driver awaits run_until() or run_for(),
+    which repeatedly lets the event loop settle, then advances time to the
+    earliest pending sleep and wakes it. Sleepers due at the same instant wake
+    in the order they went to sleep.
+
+    Everything the driven coroutines await besides clock.sleep() must complete
+    without waiting on wall-clock time (use fakes for network clients).
+    """
+
+    def __init__(self, start: Optional[Union[float, datetime]] = None, settle_yields: int = 20):
+        """
+        Args:
+            start: Initial time as a Unix timestamp or naive local datetime (default: now)
+            settle_yields: Event-loop passes given to woken coroutines before advancing again
+        """
+        if start is None:
+            start = time.time()
+        elif isinstance(start, datetime):
+            start = start.timestamp()
+        self.settle_yields = settle_yields
+        self._timers: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self.set_time(start)
+
+    def now(self) -> datetime:
+        return self._now
+
+    def time(self) -> float:
+        return self._time
+
+    def set_time(self, timestamp: float):
+        """Move the clock to timestamp without waking sleepers (for drivers that own time)."""
+        self._time = timestamp
+        # Naive local time, like the datetime.now() it stands in for
+        self._now = datetime.fromtimestamp(timestamp)
+
+    async def sleep(self, seconds: float):
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self._time + seconds, next(self._seq), future))
+        # A cancelled sleep leaves its future cancelled; run_until() skips it
+        await future
+
+    @property
+    def pending(self) -> int:
+        """Number of coroutines currently sleeping on this clock."""
+        return sum(1 for _, _, future in self._timers if not future.done())
+
+    async def _settle(self):
+        for _ in range(self.settle_yields):
+            await asyncio.sleep(0)
+
+    async def run_until(self, timestamp: float):
+        """Advance time to timestamp, waking every sleep due on the way in order."""
+        await self._settle()
+        while self._timers and self._timers[0][0] <= timestamp:
+            wake_time, _, future = heapq.heappop(self._timers)
+            if future.done():
+                continue
+            if wake_time > self._time:
+                self.set_time(wake_time)
+            future.set_result(None)
+            await self._settle()
+        if timestamp > self._time:
+            self.set_time(timestamp)
+
+    async def run_for(self, seconds: float):
+        """Advance time by seconds, waking every sleep due on the way in order."""
+        await self.run_until(self._time + seconds)
+
+
+Clock = Union[SystemClock, VirtualClock]
@@ -0,0 +1,124 @@
+"""
+Server-side conversation store for the chat endpoint.
+
+Clients send only the new message plus a conversation id. The server keeps the
+most recent turns of each conversation verbatim and folds older turns into a
+bounded rolling summary, so prompt size stays flat over long sessions. Sessions
+are evicted least-recently-used once the store is full.
+"""
+import re
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional
+
+
+_RECOMMENDATION_RE = re.compile(r'\*\*Recommendation:?\*\*:?\s*(.+?)(?:\n\s*\n|\Z)', re.DOTALL | re.IGNORECASE)
+_MARKDOWN_RE = re.compile(r'[*#>`_]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _condense(text: str, limit: int) -> str:
+    """Strip markdown, collapse whitespace and truncate to `limit` characters."""
+    text = _WHITESPACE_RE.sub(' ', _MARKDOWN_RE.sub('', text or '')).strip()
+    if len(text) > limit:
+        text = text[:limit - 3].rstrip() + '...'
+    return text
+
+
+def summarize_turn(role: str, content: str, limit: int = 200) -> str:
+    """Compress one turn into a single summary line.
+
+    Assistant answers follow the Key Metrics / Market Assessment / Recommendation
+    format, so the recommendation is the most useful part to keep. Otherwise the
+    first sentence is used.
+    """
+    if role == 'assistant':
+        match = _RECOMMENDATION_RE.search(content or '')
+        text = match.group(1) if match else (content or '').split('. ')[0]
+        return f"Assistant concluded: {_condense(text, limit)}"
+    return f"User asked: {_condense(content, limit)}"
+
+
+class Conversation:
+    """Bounded state of a single chat session."""
+
+    __slots__ = ('id', 'turns', 'summary_lines', 'summary_chars', 'last_access', 'total_turns')
+
+    def __init__(self, conversation_id: str):
+        self.id = conversation_id
+        self.turns: Deque[Dict[str, str]] = deque()
+        self.summary_lines: Deque[str] = deque()
+        self.summary_chars = 0
+        self.last_access = time.time()
+        self.total_turns = 0
+
+    @property
+    def summary(self) -> Optional[str]:
+        """Rolling summary of turns that were compacted out of the recent window."""
+        if not self.summary_lines:
+            return None
+        return "\n".join(self.summary_lines)
+
+    def history(self) -> List[Dict[str, str]]:
+        """Recent turns in the same shape as ChatMessage.conversation_history."""
+        return list(self.turns)
+
+
+class ConversationStore:
+    """LRU store of conversations with bounded per-session memory."""
+
+    def __init__(
+        self,
+        max_sessions: int = 5000,
+        max_recent_turns: int = 5,  # Matches the window generate_insight puts in the prompt
+        max_turn_chars: int = 4000,
+        max_summary_chars: int = 1500,
+    ):
+        self.max_sessions = max_sessions
+        self.max_recent_turns = max_recent_turns
+        self.max_turn_chars = max_turn_chars
+        self.max_summary_chars = max_summary_chars
+        self._sessions: "OrderedDict[str, Conversation]" = OrderedDict()
+        self.evictions = 0
+
+    def get_or_create(self, conversation_id: Optional[str] = None) -> Conversation:
+        """Return the conversation for `conversation_id`, creating it if unknown.
+
+        Unknown ids (e.g. evicted or from before a restart) start a fresh session
+        under the same id so the client can keep using it.
+        """
+        conversation = self._sessions.get(conversation_id) if conversation_id else None
+        if conversation is None:
+            conversation = Conversation(conversation_id or uuid.uuid4().hex)
+            self._sessions[conversation.id] = conversation
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._sessions.move_to_end(conversation.id)
+        conversation.last_access = time.time()
+        return conversation
+
+    def add_turn(self, conversation: Conversation, role: str, content: str):
+        """Append a turn, compacting the oldest turns into the rolling summary."""
+        conversation.turns.append({'role': role, 'content': (content or '')[:self.max_turn_chars]})
+        conversation.total_turns += 1
+        while len(conversation.turns) > self.max_recent_turns:
+            oldest = conversation.turns.popleft()
+            self._append_summary(conversation, summarize_turn(oldest['role'], oldest['content']))
+
+    def _append_summary(self, conversation: Conversation, line: str):
+        conversation.summary_lines.append(line)
+        conversation.summary_chars += len(line) + 1
+        while conversation.summary_chars > self.max_summary_chars and len(conversation.summary_lines) > 1:
+            dropped = conversation.summary_lines.popleft()
+            conversation.summary_chars -= len(dropped) + 1
+
+    def stats(self) -> dict:
+        """Store statistics for monitoring."""
+        return {
+            'sessions': len(self._sessions),
+            'maxSessions': self.max_sessions,
+            'evictions': self.evictions,
+        }
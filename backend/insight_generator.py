@@ -6,7 +6,73 @@ import os
 from typing import Dict, List, Optional
 import json
 import asyncio
+import re
+import time
+from collections import deque
 from datetime import datetime
+from semantic_cache import create_semantic_cache_from_env
+from url_parser import extract_urls_from_text
+
+
+# Model tiers for chat completions. Simple lookups go to the fast tier.
+MODEL_TIERS = {
+    'fast': {
+        'model': os.getenv("CHAT_FAST_MODEL", "claude-haiku-4-5-20251001"),
+        'max_tokens': int(os.getenv("CHAT_FAST_MAX_TOKENS", "800")),
+    },
+    'full': {
+        'model': os.getenv("CHAT_FULL_MODEL", "claude-sonnet-4-5-20250929"),
+        'max_tokens': 2000,
+    },
+}
+
+# Phrases that ask for reasoning or predictions rather than a data lookup
+_DEEP_QUERY_RE = re.compile(
+    r"\b(why|explain|analy[sz]e|analysis|compare|comparison|predict|prediction|forecast|"
+    r"strategy|should i|worth|recommend|think|win|outlook|scenario|risk)\b"
+)
+# Phrases that indicate a follow-up to the previous turn
+_FOLLOW_UP_RE = re.compile(
+    r"^(and|also|what about|how about|so|then|ok|okay)\b|\b(it|that|this|they|them|those|these|he|she)\b"
+)
+# Phrases that ask for numbers already present in the market data
+_LOOKUP_QUERY_RE = re.compile(
+    r"\b(odds|price|prices|probability|chance|chances|volume|liquidity|end date|ends|resolve|resolves|current)\b"
+)
+
+
+def classify_request(
+    user_query: str,
+    market_data: Optional[List[Dict]] = None,
+    market_details: Optional[Dict] = None,
+    conversation_history: Optional[List[Dict]] = None,
+) -> tuple:
+    """Classify a chat request with cheap local heuristics.
+
+    Returns:
+        Tuple of (route, tier) where route is one of 'url', 'single_market',
+        'follow_up' or 'open_ended' and tier is a key of MODEL_TIERS.
+    """
+    query = (user_query or '').lower().strip()
+    word_count = len(query.split())
+    is_deep = bool(_DEEP_QUERY_RE.search(query)) or word_count > 25
+
+    if any('polymarket.com' in url.lower() for url in extract_urls_from_text(query)):
+        route = 'url'
+    elif conversation_history and word_count <= 12 and _FOLLOW_UP_RE.search(query):
+        route = 'follow_up'
+    elif market_details or (market_data and len(market_data) == 1):
+        route = 'single_market'
+    else:
+        route = 'open_ended'
+
+    if route in ('url', 'single_market') and not is_deep:
+        tier = 'fast'
+    elif route == 'follow_up' and not is_deep and _LOOKUP_QUERY_RE.search(query):
+        tier = 'fast'
+    else:
+        tier = 'full'
+    return route, tier
 
 
 class InsightGenerator:
@@ -17,6 +83,11 @@ class InsightGenerator:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable is required")
         self.client = anthropic.Anthropic(api_key=api_key)
+        # Shares completions between near-identical questions about the same markets
+        self.response_cache = create_semantic_cache_from_env()
+        # Recent completion latencies per tier (seconds) for p50/p95 reporting
+        self.tier_latencies: Dict[str, deque] = {tier: deque(maxlen=500) for tier in MODEL_TIERS}
+        self.route_counts: Dict[str, int] = {}
     
     async def generate_insight(
         self, 
@@ -25,7 +96,76 @@ class InsightGenerator:
         market_details: Optional[Dict] = None,
         trades: Optional[List[Dict]] = None,
         conversation_history: Optional[List[Dict]] = None,
-        language: str = 'en'
+        language: str = 'en',
+        conversation_summary: Optional[str] = None
+    ) -> str:
+        """Generate insights, reusing a cached completion for near-identical requests.
+        
+        Args:
+            conversation_summary: Rolling summary of older turns that are no longer
+                included verbatim in conversation_history
+        """
+        route, tier = classify_request(user_query, market_data, market_details, conversation_history)
+        route_key = f"{route}:{tier}"
+        self.route_counts[route_key] = self.route_counts.get(route_key, 0) + 1
+        print(f"Chat route: {route} -> {tier} tier ({MODEL_TIERS[tier]['model']})")
+        
+        cache_key, prices = self.response_cache.build_key(
+            user_query,
+            market_details=market_details,
+            market_data=market_data,
+            conversation_history=conversation_history,
+            language=language,
+            conversation_summary=conversation_summary,
+            tier=tier,
+            trades=trades,
+        )
+        return await self.response_cache.get_or_generate(
+            cache_key,
+            prices,
+            lambda: self._generate_insight_uncached(
+                user_query=user_query,
+                market_data=market_data,
+                market_details=market_details,
+                trades=trades,
+                conversation_history=conversation_history,
+                language=language,
+                tier=tier,
+                conversation_summary=conversation_summary,
+            ),
+        )
+    
+    def _record_latency(self, tier: str, elapsed: float):
+        """Record a completion latency and log the running p50 for its tier."""
+        samples = self.tier_latencies[tier]
+        samples.append(elapsed)
+        ordered = sorted(samples)
+        p50 = ordered[len(ordered) // 2]
+        print(f"Chat {tier} tier completion took {elapsed * 1000:.0f}ms (p50 {p50 * 1000:.0f}ms over {len(ordered)})")
+    
+    def get_route_stats(self) -> dict:
+        """Route counts and per-tier latency percentiles (milliseconds)."""
+        tiers = {}
+        for tier, samples in self.tier_latencies.items():
+            ordered = sorted(samples)
+            tiers[tier] = {
+                'model': MODEL_TIERS[tier]['model'],
+                'completions': len(ordered),
+                'p50Ms': round(ordered[len(ordered) // 2] * 1000) if ordered else None,
+                'p95Ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000) if ordered else None,
+            }
+        return {'routes': dict(self.route_counts), 'tiers': tiers}
+    
+    async def _generate_insight_uncached(
+        self, 
+        user_query: str, 
+        market_data: Optional[List[Dict]] = None,
+        market_details: Optional[Dict] = None,
+        trades: Optional[List[Dict]] = None,
+        conversation_history: Optional[List[Dict]] = None,
+        language: str = 'en',
+        tier: str = 'full',
+        conversation_summary: Optional[str] = None
     ) -> str:
         """Generate insights based on user query and Polymarket data."""
         
@@ -276,8 +416,10 @@ Formatting Rules:
 
         # Build conversation context
         conversation_context = ""
+        if conversation_summary:
+            conversation_context = f"\n\nEarlier in this conversation (summary):\n{conversation_summary}\n"
         if conversation_history:
-            conversation_context = "\n\nPrevious conversation:\n"
+            conversation_context += "\n\nPrevious conversation:\n"
             for msg in conversation_history[-5:]:  # Last 5 messages for context
                 role = msg.get('role', 'user')
                 content = msg.get('content', '')
@@ -329,13 +471,15 @@ User query: {user_query}
 Please provide intelligent analysis and predictions based on current events, trends, historical patterns, and market dynamics. Use your knowledge to make educated predictions. When calculating time windows or time remaining, use the current date provided above."""
         
         try:
+            started = time.perf_counter()
             message = await asyncio.to_thread(
                 self.client.messages.create,
-                    model="claude-sonnet-4-5-20250929",
-                    max_tokens=2000,
+                    model=MODEL_TIERS[tier]['model'],
+                    max_tokens=MODEL_TIERS[tier]['max_tokens'],
                     system=system_prompt,
                 messages=[{"role": "user", "content": user_message}]
             )
+            self._record_latency(tier, time.perf_counter() - started)
             
             return message.content[0].text
         except Exception as e:
@@ -2,30 +2,37 @@
 FastAPI backend server for Polymarket insights chatbot.
 """
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict
+import asyncio
 import os
 import json
 import time
-from functools import lru_cache
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from polymarket_client import PolymarketClient
 from insight_generator import InsightGenerator
+from conversation_store import ConversationStore
 from url_parser import parse_polymarket_url, extract_urls_from_text
-from trading_bot import get_trading_bot
+from trading_bot import get_trading_bot, RESYNC
+from tick_recorder import get_tick_recorder
+from clob_adapter import get_clob_client
+from ttl_cache import TTLCache
+from api_middleware import APIMiddleware, CORS_RESPONSE_HEADERS
 
 # Load environment variables
 load_dotenv()
 
 # Initialize clients (before lifespan)
-polymarket_client = PolymarketClient()
+tick_recorder = get_tick_recorder()
+polymarket_client = PolymarketClient(tick_recorder=tick_recorder)
 insight_generator = InsightGenerator()
+conversation_store = ConversationStore(max_sessions=int(os.getenv("CHAT_MAX_SESSIONS", "5000")))
+# Client-sent messages accepted when re-seeding a conversation the store no longer has
+RESEED_HISTORY_MESSAGES = 10
 trading_bot = get_trading_bot()
 
 # Verify trading bot instance
@@ -53,11 +60,16 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("Stopping trading bot...")
     trading_bot.stop()
+    if tick_recorder:
+        tick_recorder.close()
     await polymarket_client.close()
+    if get_clob_client():
+        get_clob_client().close()
 
 app = FastAPI(title="Polymarket Insights Chatbot API", lifespan=lifespan)
 
-# CORS middleware for React frontend
+# Known frontend origins for the React app. APIMiddleware answers every origin
+# with "Access-Control-Allow-Origin: *"; this list is logged for deployment debugging.
 allowed_origins = [
     "http://localhost:3000",
     "http://localhost:5173",
@@ -67,9 +79,6 @@ allowed_origins = [
     "http://www.polyscout.xyz",   # www subdomain HTTP
 ]
 
-# Note: We'll use explicit origins + regex pattern instead of wildcard
-# This is more secure and works better with FastAPI CORS middleware
-
 # Add production frontend URL from environment variable if set
 production_frontend = os.getenv("FRONTEND_URL")
 if production_frontend:
@@ -100,123 +109,21 @@ if custom_domain:
 # Print allowed origins for debugging
 print(f"CORS allowed origins: {allowed_origins}")
 
-# Simple in-memory cache for frequently accessed endpoints
-_response_cache: Dict[str, tuple] = {}  # key: (response, expiry_time)
+# Shared response cache for frequently accessed endpoints (bounded, single-flight)
+response_cache = TTLCache(max_entries=1000, name="responses")
 
-def get_cached_response(cache_key: str, ttl: int = 5) -> Optional[Dict]:
-    """Get cached response if not expired."""
-    if cache_key in _response_cache:
-        response, expiry = _response_cache[cache_key]
-        if time.time() < expiry:
-            return response
-        else:
-            del _response_cache[cache_key]
-    return None
-
-def set_cached_response(cache_key: str, response: Dict, ttl: int = 5):
-    """Cache a response with TTL in seconds."""
-    expiry = time.time() + ttl
-    _response_cache[cache_key] = (response, expiry)
-    # Clean up expired entries periodically (keep cache size reasonable)
-    if len(_response_cache) > 1000:
-        now = time.time()
-        expired_keys = [k for k, (_, exp) in _response_cache.items() if exp < now]
-        for k in expired_keys:
-            del _response_cache[k]
-
-# Rate limiting middleware
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple rate limiting to prevent API abuse."""
-    def __init__(self, app, calls_per_minute: int = 120):
-        super().__init__(app)
-        self.calls_per_minute = calls_per_minute
-        self.requests: Dict[str, List[float]] = {}
-    
-    async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for health checks and WebSocket
-        if request.url.path in ["/", "/health"] or request.url.path.startswith("/api/trades/stream"):
-            return await call_next(request)
-        
-        client_ip = request.client.host if request.client else "unknown"
-        now = time.time()
-        
-        # Clean old requests
-        if client_ip in self.requests:
-            self.requests[client_ip] = [
-                req_time for req_time in self.requests[client_ip]
-                if now - req_time < 60
-            ]
-        else:
-            self.requests[client_ip] = []
-        
-        # Check rate limit
-        if len(self.requests[client_ip]) >= self.calls_per_minute:
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded. Please try again later."},
-                headers={"Retry-After": "60"}
-            )
-        
-        # Record this request
-        self.requests[client_ip].append(now)
-        
-        return await call_next(request)
-
-# Add rate limiting middleware (before CORS)
-app.add_middleware(RateLimitMiddleware, calls_per_minute=120)
-
-# Add CORS middleware - use regex to allow ALL origins
-# This will fix the CORS issue immediately
-# IMPORTANT: allow_credentials must be False when using allow_origin_regex with .*
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,  # Explicit origins
-    allow_origin_regex=r"https?://.*",  # Allow ANY origin - matches http:// and https://
-    allow_credentials=False,  # Must be False when using regex that matches all
-    allow_methods=["*"],  # Allow all methods
-    allow_headers=["*"],  # Allow all headers
-    expose_headers=["*"],
-    max_age=3600,  # Cache preflight requests for 1 hour
-)
-
-# Add custom middleware to ALWAYS add CORS headers, even on errors
-# This must be AFTER CORS middleware to ensure headers are always present
-@app.middleware("http")
-async def add_cors_headers(request: Request, call_next):
-    """Add CORS headers to ALL responses, including errors."""
-    # Handle OPTIONS preflight requests
-    if request.method == "OPTIONS":
-        response = JSONResponse(
-            content={},
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
-                "Access-Control-Allow-Headers": "*",
-                "Access-Control-Max-Age": "3600",
-            }
-        )
-        return response
-    
-    try:
-        response = await call_next(request)
-    except Exception as e:
-        # If there's an error, create a response with CORS headers
-        response = JSONResponse(
-            status_code=500,
-            content={"detail": str(e)},
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
-                "Access-Control-Allow-Headers": "*",
-            }
-        )
-    
-    # Always add CORS headers to the response
-    response.headers["Access-Control-Allow-Origin"] = "*"
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-    response.headers["Access-Control-Allow-Headers"] = "*"
-    response.headers["Access-Control-Expose-Headers"] = "*"
-    return response
+# Idle time after which the trading stream sends a heartbeat
+STREAM_HEARTBEAT_SECONDS = 25
+
+# Serialized dashboard snapshot for the latest bot state version. ETags include
+# the process start time because state versions restart from zero on reboot.
+_snapshot_epoch = format(int(time.time()), "x")
+_snapshot_cache = {"version": None, "body": None}
+
+# Rate limiting and CORS in a single pure-ASGI middleware.
+# Preflight requests are answered directly and every response gets
+# "Access-Control-Allow-Origin: *", including rate-limited and error responses.
+app.add_middleware(APIMiddleware, calls_per_minute=120)
 
 # Add exception handlers that also include CORS headers
 @app.exception_handler(StarletteHTTPException)
@@ -225,11 +132,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
-            "Access-Control-Allow-Headers": "*",
-        }
+        headers=CORS_RESPONSE_HEADERS
     )
 
 @app.exception_handler(RequestValidationError)
@@ -238,11 +141,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     return JSONResponse(
         status_code=422,
         content={"detail": exc.errors()},
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
-            "Access-Control-Allow-Headers": "*",
-        }
+        headers=CORS_RESPONSE_HEADERS
     )
 
 @app.exception_handler(Exception)
@@ -254,11 +153,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     return JSONResponse(
         status_code=500,
         content={"detail": str(exc)},
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
-            "Access-Control-Allow-Headers": "*",
-        }
+        headers=CORS_RESPONSE_HEADERS
     )
 
 
@@ -270,13 +165,15 @@ class ChatMessage(BaseModel):
     message: str
     market_id: Optional[str] = None
     search_query: Optional[str] = None
-    conversation_history: Optional[List[MessageHistory]] = None
+    conversation_id: Optional[str] = None  # Server keeps the history for this conversation
+    conversation_history: Optional[List[MessageHistory]] = None  # Recent history, re-seeds a lost conversation
     language: Optional[str] = 'en'  # 'en' or 'zh'
 
 
 class ChatResponse(BaseModel):
     response: str
     markets: Optional[List[dict]] = None
+    conversation_id: Optional[str] = None
 
 
 @app.get("/")
@@ -368,10 +265,14 @@ async def chat(message: ChatMessage):
                 # Don't use fallback - it returns top volume markets which are often irrelevant
                 # market_data = await polymarket_client.get_markets(limit=10)
         
-        # Convert conversation history to dict format if provided
-        conv_history = None
-        if message.conversation_history:
-            conv_history = [{"role": msg.role, "content": msg.content} for msg in message.conversation_history]
+        # Load the server-side conversation. Clients send their last few messages
+        # too; they seed the conversation only if the server no longer has it
+        # (restart or eviction).
+        conversation = conversation_store.get_or_create(message.conversation_id)
+        if message.conversation_history and not conversation.turns and not conversation.summary_lines:
+            for msg in message.conversation_history[-RESEED_HISTORY_MESSAGES:]:
+                conversation_store.add_turn(conversation, msg.role, msg.content)
+        conv_history = conversation.history() or None
         
         # Generate insight using Claude
         insight = await insight_generator.generate_insight(
@@ -380,32 +281,44 @@ async def chat(message: ChatMessage):
             market_details=market_details,
             trades=trades,
             conversation_history=conv_history,
-            language=message.language or 'en'
+            language=message.language or 'en',
+            conversation_summary=conversation.summary
         )
         
+        conversation_store.add_turn(conversation, 'user', message.message)
+        conversation_store.add_turn(conversation, 'assistant', insight)
+        
         return ChatResponse(
             response=insight,
-            markets=market_data if market_data else None
+            markets=market_data if market_data else None,
+            conversation_id=conversation.id
         )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
 
 
+@app.get("/api/chat/stats")
+async def get_chat_stats():
+    """Get chat model routing and response cache statistics."""
+    return {
+        "routing": insight_generator.get_route_stats(),
+        "cache": insight_generator.response_cache.stats(),
+        "conversations": conversation_store.stats(),
+    }
+
+
 @app.get("/api/markets")
 async def get_markets(limit: int = 20, offset: int = 0):
     """Get list of active markets."""
     try:
-        # Cache markets for 10 seconds (they don't change that frequently)
-        cache_key = f"markets_{limit}_{offset}"
-        cached = get_cached_response(cache_key, ttl=10)
-        if cached:
-            return cached
+        # Cache markets for 10 seconds (they don't change that frequently) and
+        # serve them stale for up to 30 more seconds while refreshing
+        async def load():
+            markets = await polymarket_client.get_markets(limit=limit, offset=offset)
+            return {"markets": markets}
         
-        markets = await polymarket_client.get_markets(limit=limit, offset=offset)
-        response = {"markets": markets}
-        set_cached_response(cache_key, response, ttl=10)
-        return response
+        return await response_cache.get_or_load(f"markets_{limit}_{offset}", load, ttl=10, stale_ttl=30)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching markets: {str(e)}")
 
@@ -544,124 +457,180 @@ async def stream_price_updates(websocket: WebSocket):
 async def get_trading_stats():
     """Get trading bot statistics."""
     # Cache stats for 2 seconds (called frequently by frontend)
-    cache_key = "trading_stats"
-    cached = get_cached_response(cache_key, ttl=2)
-    if cached:
-        return cached
-    
-    bot_instance_id = id(trading_bot)
-    # Reduce logging in production
-    if os.getenv("DEBUG", "false").lower() == "true":
-        print(f"API /stats: Trading bot instance ID: {bot_instance_id}")
-        print(f"API /stats: Bot has {len(trading_bot.trades)} trades, {len(trading_bot.positions)} positions")
-    
-    stats = trading_bot.get_stats()
-    
-    # Add debug info to stats response (only in debug mode)
-    if os.getenv("DEBUG", "false").lower() == "true":
-        stats["_debug"] = {
-            "bot_instance_id": str(bot_instance_id),
-            "bot_is_running": trading_bot.is_running,
-            "internal_trades_count": len(trading_bot.trades),
-            "has_claude_client": trading_bot.claude_client is not None,
-            "has_clob_client": trading_bot.clob_client is not None,
-            "clob_initialized": trading_bot._clob_initialized if hasattr(trading_bot, '_clob_initialized') else False,
-            "market_analyses_count": len(trading_bot.market_analyses)
-        }
+    async def load():
+        bot_instance_id = id(trading_bot)
+        # Reduce logging in production
+        if os.getenv("DEBUG", "false").lower() == "true":
+            print(f"API /stats: Trading bot instance ID: {bot_instance_id}")
+            print(f"API /stats: Bot has {len(trading_bot.trades)} trades, {len(trading_bot.positions)} positions")
+        
+        stats = trading_bot.get_stats()
+        
+        # Add debug info to stats response (only in debug mode).
+        # Copy first: the stats dict belongs to the bot's published snapshot.
+        if os.getenv("DEBUG", "false").lower() == "true":
+            stats = dict(stats)
+            stats["_debug"] = {
+                "bot_instance_id": str(bot_instance_id),
+                "bot_is_running": trading_bot.is_running,
+                "internal_trades_count": len(trading_bot.trades),
+                "has_claude_client": trading_bot.claude_client is not None,
+                "has_clob_client": trading_bot.clob_client is not None,
+                "clob_initialized": trading_bot._clob_initialized if hasattr(trading_bot, '_clob_initialized') else False,
+                "market_analyses_count": len(trading_bot.market_analyses),
+                "cycle_metrics": trading_bot.cycle_metrics,
+                "clob": trading_bot.clob_client.metrics() if trading_bot.clob_client else None,
+            }
+        return stats
     
-    set_cached_response(cache_key, stats, ttl=2)
-    return stats
+    return await response_cache.get_or_load("trading_stats", load, ttl=2)
 
 
 @app.get("/api/trading/positions")
 async def get_trading_positions():
     """Get all open trading positions."""
     # Cache positions for 2 seconds
-    cache_key = "trading_positions"
-    cached = get_cached_response(cache_key, ttl=2)
-    if cached:
-        return cached
-    
-    positions = trading_bot.get_positions()
-    if os.getenv("DEBUG", "false").lower() == "true":
-        print(f"API: Returning {len(positions)} positions")
+    async def load():
+        positions = trading_bot.get_positions()
+        if os.getenv("DEBUG", "false").lower() == "true":
+            print(f"API: Returning {len(positions)} positions")
+        return {"positions": positions}
     
-    response = {"positions": positions}
-    set_cached_response(cache_key, response, ttl=2)
-    return response
+    return await response_cache.get_or_load("trading_positions", load, ttl=2)
 
 
 @app.get("/api/trading/trades")
 async def get_trading_trades(limit: int = 100):
     """Get recent trades."""
     # Cache trades for 2 seconds
-    cache_key = f"trading_trades_{limit}"
-    cached = get_cached_response(cache_key, ttl=2)
-    if cached:
-        return cached
-    
-    bot_instance_id = id(trading_bot)
-    # Reduce logging in production
-    if os.getenv("DEBUG", "false").lower() == "true":
-        print(f"API /trades: Trading bot instance ID: {bot_instance_id}")
-        print(f"API /trades: Bot is_running: {trading_bot.is_running}")
-        print(f"API /trades: Bot has {len(trading_bot.trades)} trades in internal list")
-    
-    trades = trading_bot.get_recent_trades(limit=limit)
-    
-    # Include debug info only in debug mode
-    response = {"trades": trades}
-    if os.getenv("DEBUG", "false").lower() == "true":
-        response["_debug"] = {
-            "bot_instance_id": str(bot_instance_id),
-            "bot_is_running": trading_bot.is_running,
-            "internal_trades_count": len(trading_bot.trades),
-            "positions_count": len(trading_bot.positions),
-            "balance": trading_bot.balance,
-            "returned_trades_count": len(trades),
-            "has_claude_client": trading_bot.claude_client is not None,
-            "has_clob_client": trading_bot.clob_client is not None,
-            "market_analyses_count": len(trading_bot.market_analyses)
-        }
+    async def load():
+        bot_instance_id = id(trading_bot)
+        # Reduce logging in production
+        if os.getenv("DEBUG", "false").lower() == "true":
+            print(f"API /trades: Trading bot instance ID: {bot_instance_id}")
+            print(f"API /trades: Bot is_running: {trading_bot.is_running}")
+            print(f"API /trades: Bot has {len(trading_bot.trades)} trades in internal list")
+        
+        trades = trading_bot.get_recent_trades(limit=limit)
+        
+        # Include debug info only in debug mode
+        response = {"trades": trades}
+        if os.getenv("DEBUG", "false").lower() == "true":
+            response["_debug"] = {
+                "bot_instance_id": str(bot_instance_id),
+                "bot_is_running": trading_bot.is_running,
+                "internal_trades_count": len(trading_bot.trades),
+                "positions_count": len(trading_bot.positions),
+                "balance": trading_bot.balance,
+                "returned_trades_count": len(trades),
+                "has_claude_client": trading_bot.claude_client is not None,
+                "has_clob_client": trading_bot.clob_client is not None,
+                "market_analyses_count": len(trading_bot.market_analyses)
+            }
+        return response
     
-    set_cached_response(cache_key, response, ttl=2)
-    return response
+    return await response_cache.get_or_load(f"trading_trades_{limit}", load, ttl=2)
 
 
 @app.get("/api/trading/analyses")
 async def get_market_analyses():
     """Get market analyses."""
     # Cache analyses for 5 seconds
-    cache_key = "trading_analyses"
-    cached = get_cached_response(cache_key, ttl=5)
-    if cached:
-        return cached
-    
-    analyses = trading_bot.get_market_analyses()
-    if os.getenv("DEBUG", "false").lower() == "true":
-        print(f"API: Returning {len(analyses)} market analyses")
+    async def load():
+        analyses = trading_bot.get_market_analyses()
+        if os.getenv("DEBUG", "false").lower() == "true":
+            print(f"API: Returning {len(analyses)} market analyses")
+        return {"analyses": analyses}
     
-    response = {"analyses": analyses}
-    set_cached_response(cache_key, response, ttl=5)
-    return response
+    return await response_cache.get_or_load("trading_analyses", load, ttl=5)
 
 
 @app.get("/api/trading/pnl-history")
 async def get_pnl_history(limit: int = 100):
     """Get P&L history for charting."""
     # Cache P&L history for 2 seconds
-    cache_key = f"pnl_history_{limit}"
-    cached = get_cached_response(cache_key, ttl=2)
-    if cached:
-        return cached
+    async def load():
+        history = trading_bot.get_pnl_history(limit=limit)
+        if os.getenv("DEBUG", "false").lower() == "true":
+            print(f"API: Returning {len(history)} P&L history entries")
+        return {"history": history}
     
-    history = trading_bot.get_pnl_history(limit=limit)
-    if os.getenv("DEBUG", "false").lower() == "true":
-        print(f"API: Returning {len(history)} P&L history entries")
-    
-    response = {"history": history}
-    set_cached_response(cache_key, response, ttl=2)
-    return response
+    return await response_cache.get_or_load(f"pnl_history_{limit}", load, ttl=2)
+
+
+def _trading_snapshot_body(snapshot=None):
+    """Return (version, JSON bytes) of the dashboard snapshot, serializing once per version."""
+    snapshot = snapshot or trading_bot.snapshot
+    if _snapshot_cache["version"] != snapshot.version:
+        _snapshot_cache["body"] = json.dumps(snapshot.to_dashboard()).encode()
+        _snapshot_cache["version"] = snapshot.version
+    return _snapshot_cache["version"], _snapshot_cache["body"]
+
+
+def _snapshot_message() -> str:
+    _, body = _trading_snapshot_body(trading_bot.current_snapshot())
+    return '{"type": "snapshot", "data": ' + body.decode() + '}'
+
+
+@app.get("/api/trading/snapshot")
+async def get_trading_snapshot(request: Request):
+    """
+    Stats, positions, recent trades and P&L history in one response.
+    The ETag changes only when bot state does; a matching If-None-Match gets 304.
+    """
+    version, body = _trading_snapshot_body()
+    etag = f'"{_snapshot_epoch}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-State-Version": str(version)}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.websocket("/api/trading/stream")
+async def stream_trading_updates(websocket: WebSocket):
+    """
+    WebSocket feed for the trading dashboard.
+    Sends one snapshot of stats, positions, trades and P&L history, then pushes
+    "trade", "position", "pnl" and "stats" deltas as the bot changes state.
+    Every message carries the bot's state version; deltas whose version is not
+    above the snapshot's are already reflected in it.
+    """
+    await websocket.accept()
+    # Subscribe before taking the snapshot so no event between the two is lost
+    queue = trading_bot.subscribe()
+    try:
+        await websocket.send_text(_snapshot_message())
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing idle connections and detects dead clients
+                await websocket.send_json({"type": "heartbeat", "version": trading_bot.state_version})
+                continue
+            if message is RESYNC:
+                await websocket.send_text(_snapshot_message())
+            else:
+                await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"Error in trading stream: {e}")
+    finally:
+        trading_bot.unsubscribe(queue)
+        try:
+            await websocket.close()
+        except:
+            pass
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Get hit-ratio metrics for the response caches."""
+    return {
+        "responses": response_cache.stats(),
+        "chat": insight_generator.response_cache.stats(),
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,357 @@
+"""
+Normalized market records for the trading bot.
+
+Markets arrive as Gamma or CLOB-shaped dicts with aliased ids, numbers as
+strings or floats under several field names, ISO end dates and prices spread
+across tokens, outcomes and market-level fields. Market.from_dict() resolves
+all of that once per fetched market into a slotted record, so strategy code
+reads typed attributes instead of re-parsing the dict on every pass.
+
+PriceExtractor is the one place prices are computed: once per fetched dict
+(timed, for cycle_metrics), plus CLOB API prices for markets whose dict
+carries none, memoized so at most one CLOB lookup per market is made per TTL.
+"""
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from resolution_index import UNDATED, EndDateIndex, end_date_value, parse_end_date
+
+# Market-level price fields, in the order they are tried
+_MARKET_PRICE_FIELDS = ('newestPrice', 'price', 'lastPrice', 'currentPrice')
+_OUTCOME_PRICE_FIELDS = ('price', 'newestPrice', 'lastPrice', 'currentPrice', 'yesPrice', 'noPrice')
+_FALLBACK_PRICE_FIELDS = _MARKET_PRICE_FIELDS + ('yesPrice',)
+
+Prices = Tuple[Optional[float], Optional[float]]
+
+
+def as_float(value, default: float = 0.0) -> float:
+    """Parse a numeric API field (number, numeric string, None or '') into a float."""
+    if not value:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _first_number(data: dict, *fields: str) -> float:
+    for name in fields:
+        value = data.get(name)
+        if value:
+            return as_float(value)
+    return 0.0
+
+
+def _valid_price(value) -> Optional[float]:
+    """A price strictly between 0 and 1, or None."""
+    if value is None:
+        return None
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if 0 < price < 1 else None
+
+
+def complete_prices(price_yes: Optional[float], price_no: Optional[float]) -> Prices:
+    """Derive a missing YES or NO price from the other side."""
+    if price_yes is not None and price_no is None:
+        price_no = 1.0 - price_yes
+    elif price_no is not None and price_yes is None:
+        price_yes = 1.0 - price_no
+    return price_yes, price_no
+
+
+def token_prices(tokens) -> Prices:
+    """YES and NO prices from a CLOB tokens list (either may be None)."""
+    price_yes = price_no = None
+    for token in tokens or ():
+        if not isinstance(token, dict):
+            continue
+        price = _valid_price(token.get('price'))
+        if price is None:
+            continue
+        outcome = str(token.get('outcome', '')).strip().upper()
+        if outcome == 'YES':
+            price_yes = price
+        elif outcome == 'NO':
+            price_no = price
+    return price_yes, price_no
+
+
+def token_ids(data: dict) -> Tuple[Optional[str], Optional[str]]:
+    """CLOB token ids of a market's YES and NO outcomes (either may be None).
+
+    CLOB dicts carry them in tokens; Gamma dicts in clobTokenIds, a JSON list
+    aligned with the outcomes list (Yes, No when outcomes are missing).
+    """
+    yes_id = no_id = None
+    tokens = data.get('tokens')
+    if isinstance(tokens, list):
+        for token in tokens:
+            if isinstance(token, dict) and token.get('token_id'):
+                outcome = str(token.get('outcome', '')).strip().upper()
+                if outcome == 'YES':
+                    yes_id = str(token['token_id'])
+                elif outcome == 'NO':
+                    no_id = str(token['token_id'])
+        if yes_id or no_id:
+            return yes_id, no_id
+
+    ids = data.get('clobTokenIds')
+    if not ids:
+        return None, None
+    try:
+        if isinstance(ids, str):
+            ids = json.loads(ids)
+        outcomes = data.get('outcomes') or ['Yes', 'No']
+        if isinstance(outcomes, str):
+            outcomes = json.loads(outcomes)
+    except (ValueError, TypeError):
+        return None, None
+    if not isinstance(ids, list) or not isinstance(outcomes, list):
+        return None, None
+    for outcome, token_id in zip(outcomes, ids):
+        name = str(outcome.get('outcome', '') if isinstance(outcome, dict) else outcome).strip().upper()
+        if name == 'YES':
+            yes_id = str(token_id)
+        elif name == 'NO':
+            no_id = str(token_id)
+    return yes_id, no_id
+
+
+def _market_level_price(data: dict) -> Optional[float]:
+    price = None
+    for name in _MARKET_PRICE_FIELDS:
+        if name in data:
+            try:
+                price = float(data[name])
+                if 0 < price < 1:
+                    break
+            except (ValueError, TypeError):
+                continue
+    return price
+
+
+def extract_prices(data: dict) -> Prices:
+    """YES and NO prices from a market dict without any network calls.
+
+    Tries the CLOB tokens array, then a Gamma outcomes array of dicts (which
+    takes precedence where it has a price), then market-level price fields.
+
+    Returns:
+        (price_yes, price_no), both None if no price could be found
+    """
+    price_yes, price_no = token_prices(data.get('tokens') if isinstance(data.get('tokens'), list) else None)
+
+    outcomes = data.get('outcomes')
+    if outcomes and len(outcomes) >= 2:
+        for outcome in outcomes:
+            if not isinstance(outcome, dict):
+                continue
+            name = str(outcome.get('outcome', outcome.get('title', outcome.get('name', '')))).upper()
+            price = None
+            for field in _OUTCOME_PRICE_FIELDS:
+                if field in outcome:
+                    try:
+                        price = float(outcome[field])
+                        if 0 < price < 1:
+                            break
+                    except (ValueError, TypeError):
+                        continue
+            if price is None:
+                price = _market_level_price(data)
+            if price is not None and 0 < price < 1:
+                if 'YES' in name:
+                    price_yes = price
+                elif 'NO' in name:
+                    price_no = price
+                # Unlabelled outcomes: first is Yes, second is No
+                elif price_yes is None:
+                    price_yes = price
+                elif price_no is None:
+                    price_no = price
+
+    if price_yes is None:
+        for name in _FALLBACK_PRICE_FIELDS:
+            if name in data:
+                try:
+                    price_yes = float(data[name])
+                    if 0 < price_yes < 1:
+                        break
+                except (ValueError, TypeError):
+                    continue
+
+    price_yes, price_no = complete_prices(price_yes, price_no)
+    if price_yes is None or price_no is None:
+        return None, None
+    return price_yes, price_no
+
+
+class PriceExtractor:
+    """Timed dict price extraction plus CLOB price lookups memoized per TTL."""
+
+    def __init__(self, clob_ttl: float = 5.0, max_markets: int = 100_000):
+        """
+        Args:
+            clob_ttl: Seconds a CLOB API price lookup (or failed lookup) is reused
+            max_markets: Cached CLOB lookups before the cache is cleared
+        """
+        self.clob_ttl = clob_ttl
+        self.max_markets = max_markets
+        # condition id -> (fetched at, prices)
+        self._clob: Dict[str, Tuple[float, Prices]] = {}
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.extracted = 0
+        self.extract_seconds = 0.0
+        self.clob_fetches = 0
+        self.clob_reused = 0
+        self.clob_seconds = 0.0
+
+    def extract(self, data: dict) -> Prices:
+        """Prices from a fetched market dict (see extract_prices)."""
+        started = time.perf_counter()
+        prices = extract_prices(data)
+        self.extracted += 1
+        self.extract_seconds += time.perf_counter() - started
+        return prices
+
+    def clob_prices(self, condition_id: str, now: float) -> Optional[Prices]:
+        """Cached CLOB prices for a condition, or None if missing or older than clob_ttl."""
+        cached = self._clob.get(condition_id)
+        if cached is None or now - cached[0] >= self.clob_ttl:
+            return None
+        self.clob_reused += 1
+        return cached[1]
+
+    def store_clob_prices(self, condition_id: str, prices: Prices, now: float, seconds: float):
+        """Record a CLOB lookup made at time now that took seconds."""
+        self.clob_fetches += 1
+        self.clob_seconds += seconds
+        if condition_id not in self._clob and len(self._clob) >= self.max_markets:
+            self._clob.clear()
+        self._clob[condition_id] = (now, prices)
+
+    def take_metrics(self) -> dict:
+        """Counts and time spent since the last call, for cycle_metrics."""
+        metrics = {
+            'extracted': self.extracted,
+            'extractMs': self.extract_seconds * 1000,
+            'clobFetches': self.clob_fetches,
+            'clobReused': self.clob_reused,
+            'clobMs': self.clob_seconds * 1000,
+        }
+        self._reset_counters()
+        return metrics
+
+
+def create_price_extractor_from_env() -> PriceExtractor:
+    """Create the price extractor using optional environment overrides."""
+    return PriceExtractor(clob_ttl=float(os.getenv("CLOB_PRICE_TTL", "5")))
+
+
+@dataclass(slots=True)
+class Market:
+    """One market, normalized from a Gamma or CLOB dict."""
+    id: str
+    question: str = ''
+    condition_id: Optional[str] = None
+    volume: float = 0.0
+    volume_24h: float = 0.0
+    liquidity: float = 0.0
+    # Raw end-date value and its epoch seconds (UNDATED, or None if unparseable)
+    end_date: Optional[str] = None
+    end_ts: Optional[float] = UNDATED
+    price_yes: Optional[float] = None
+    price_no: Optional[float] = None
+    yes_token_id: Optional[str] = None
+    no_token_id: Optional[str] = None
+    active: bool = True
+    closed: bool = False
+    accepting_orders: bool = True
+    description: str = ''
+    image: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict, end_dates: Optional[EndDateIndex] = None,
+                  prices: Optional[PriceExtractor] = None) -> Optional['Market']:
+        """Normalize a Gamma or CLOB market dict.
+
+        Args:
+            data: Market dict as returned by the Gamma API, CLOB API or get_markets()
+            end_dates: Index to parse the end date through (and register it in)
+            prices: Extractor to time the price extraction in
+
+        Returns:
+            The Market, or None if the dict has no usable id
+        """
+        market_id = data.get('id') or data.get('condition_id') or data.get('question_id')
+        if not market_id:
+            return None
+        market_id = str(market_id)
+
+        end_date = end_date_value(data)
+        if end_dates is not None:
+            end_ts = end_dates.end_timestamp(market_id, end_date)
+        else:
+            end_ts = parse_end_date(end_date) if end_date else UNDATED
+
+        volume = _first_number(data, 'volumeNum', 'volume')
+        price_yes, price_no = prices.extract(data) if prices is not None else extract_prices(data)
+        yes_token_id, no_token_id = token_ids(data)
+        return cls(
+            id=market_id,
+            question=str(data.get('question') or data.get('title') or data.get('name') or ''),
+            condition_id=data.get('condition_id') or data.get('conditionId'),
+            volume=volume,
+            volume_24h=_first_number(data, 'volume24hr', 'volume24h') or volume,
+            liquidity=_first_number(data, 'liquidityNum', 'liquidity'),
+            end_date=end_date,
+            end_ts=end_ts,
+            price_yes=price_yes,
+            price_no=price_no,
+            yes_token_id=yes_token_id,
+            no_token_id=no_token_id,
+            active=bool(data.get('active', True)),
+            closed=bool(data.get('closed', False)),
+            accepting_orders=bool(data.get('accepting_orders', True)),
+            description=str(data.get('description') or ''),
+            image=data.get('image') or data.get('icon') or data.get('imageUrl') or None,
+        )
+
+    @property
+    def has_prices(self) -> bool:
+        return self.price_yes is not None and self.price_no is not None
+
+    def set_token_prices(self, price_yes, price_no):
+        """Update prices from raw token prices (invalid sides derived from the other)."""
+        self.price_yes, self.price_no = complete_prices(_valid_price(price_yes), _valid_price(price_no))
+
+    def merge_token_prices(self, price_yes, price_no) -> bool:
+        """Like set_token_prices, but keeps the current prices if neither side is valid.
+
+        Returns:
+            True if the prices were updated
+        """
+        price_yes, price_no = complete_prices(_valid_price(price_yes), _valid_price(price_no))
+        if price_yes is None:
+            return False
+        self.price_yes, self.price_no = price_yes, price_no
+        return True
+
+
+def normalize_markets(markets: Iterable[dict], end_dates: Optional[EndDateIndex] = None,
+                      prices: Optional[PriceExtractor] = None) -> List[Market]:
+    """Normalize fetched market dicts, dropping those without an id."""
+    normalized = []
+    for data in markets:
+        if isinstance(data, dict):
+            market = Market.from_dict(data, end_dates, prices)
+            if market is not None:
+                normalized.append(market)
+    return normalized
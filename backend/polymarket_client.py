@@ -8,19 +8,17 @@ import json
 import asyncio
 import websockets
 from datetime import datetime
-try:
-    from py_clob_client.client import ClobClient
-    CLOB_AVAILABLE = True
-except ImportError:
-    CLOB_AVAILABLE = False
-    print("Warning: py-clob-client not installed. Price data may be less accurate.")
+from tick_recorder import TickRecorder
+from market import as_float
+from clob_adapter import get_clob_client
 
 
 class PolymarketClient:
     """Client for interacting with Polymarket API."""
     
-    def __init__(self, api_url: Optional[str] = None):
+    def __init__(self, api_url: Optional[str] = None, tick_recorder: Optional[TickRecorder] = None):
         self.api_url = api_url or os.getenv("POLYMARKET_API_URL", "https://gamma-api.polymarket.com")
+        self.tick_recorder = tick_recorder  # Records prices seen by poll_price_updates_stream
         # Optimize HTTP client with connection pooling and limits
         limits = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
         self.client = httpx.AsyncClient(
@@ -29,18 +27,8 @@ class PolymarketClient:
             http2=True  # Enable HTTP/2 for better performance
         )
         
-        # Initialize CLOB client for accurate price data
-        if CLOB_AVAILABLE:
-            try:
-                self.clob_client = ClobClient(
-                    host="https://clob.polymarket.com",
-                    chain_id=137
-                )
-            except Exception as e:
-                print(f"Warning: Could not initialize CLOB client: {e}")
-                self.clob_client = None
-        else:
-            self.clob_client = None
+        # Async CLOB adapter for accurate price data (None if py-clob-client is unavailable)
+        self.clob_client = get_clob_client()
     
     async def get_markets(self, limit: int = 20, offset: int = 0, use_clob: bool = False) -> List[Dict]:
         """Fetch current active markets from Polymarket.
@@ -229,7 +217,7 @@ class PolymarketClient:
             
             # Sort by volume (descending) - API should already sort, but ensure it
             filtered_markets.sort(
-                key=lambda x: float(x.get('volumeNum', 0) or x.get('volume', 0) or x.get('liquidityNum', 0) or 0), 
+                key=lambda x: as_float(x.get('volumeNum') or x.get('volume') or x.get('liquidityNum')), 
                 reverse=True
             )
             
@@ -632,7 +620,7 @@ class PolymarketClient:
                 continue  # Skip markets with zero matches
             
             # Bonus for volume (more popular markets are more likely to be what user wants)
-            volume = float(market.get('volumeNum', 0) or market.get('volume', 0) or 0)
+            volume = as_float(market.get('volumeNum') or market.get('volume'))
             if volume > 0:
                 # Higher volume = more relevant, but cap it
                 score += min(volume / 1000000, 5)  # Cap at 5 points, scales with volume
@@ -749,6 +737,11 @@ class PolymarketClient:
                         print(f"Error converting price for market {market_id}: {e}, price={current_price}")
                         continue
                     
+                    if self.tick_recorder:
+                        # Last trade price is the Yes price; the No side is not reported here
+                        self.tick_recorder.record(market_id, current_price_float, None,
+                                                  float(update.get("volume24hr") or 0))
+                    
                     # Check if price changed
                     previous_price = previous_prices.get(market_id)
                     
@@ -0,0 +1,154 @@
+"""
+Sliding-window-counter rate limiter with constant state per client.
+
+Each client keeps only the request counts of the current and previous fixed
+windows. The request rate over the last `window` seconds is estimated by
+weighting the previous window's count by how much of it still overlaps the
+sliding window. Clients that have been idle for longer than `idle_ttl` are
+evicted in least-recently-seen order, so memory is bounded by active clients
+rather than every address ever seen.
+
+UpstreamRateLimiter is the outbound counterpart: instead of rejecting, it makes
+callers wait, so concurrent requests to an upstream API stay within a request
+rate and a concurrency cap.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+from clock import Clock, SystemClock
+
+
+class _ClientWindow:
+    __slots__ = ('window_index', 'previous', 'current', 'last_seen')
+
+    def __init__(self, window_index: int, last_seen: float):
+        self.window_index = window_index
+        self.previous = 0
+        self.current = 0
+        self.last_seen = last_seen
+
+
+class SlidingWindowRateLimiter:
+    """Allows up to `limit` requests per client within any `window` seconds (approximately)."""
+
+    # Idle clients examined per request; keeps eviction O(1) amortized
+    EVICTIONS_PER_HIT = 4
+
+    def __init__(
+        self,
+        limit: int,
+        window: float = 60.0,
+        idle_ttl: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limit = limit
+        self.window = window
+        # After two idle windows a client's counts no longer affect its estimate
+        self.idle_ttl = idle_ttl if idle_ttl is not None else 2 * window
+        self._clock = clock
+        self._clients: "OrderedDict[Hashable, _ClientWindow]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def hit(self, key: Hashable) -> Tuple[bool, int]:
+        """Record a request for `key`.
+
+        Returns:
+            Tuple of (allowed, retry_after_seconds). Rejected requests are not counted.
+        """
+        now = self._clock()
+        window_index = int(now // self.window)
+
+        state = self._clients.get(key)
+        if state is None:
+            state = _ClientWindow(window_index, now)
+            self._clients[key] = state
+        else:
+            self._clients.move_to_end(key)
+            if window_index != state.window_index:
+                # Roll the windows forward; anything older than one window is dropped
+                state.previous = state.current if window_index == state.window_index + 1 else 0
+                state.current = 0
+                state.window_index = window_index
+        state.last_seen = now
+        self._evict_idle(now)
+
+        elapsed_fraction = (now - window_index * self.window) / self.window
+        estimated = state.previous * (1.0 - elapsed_fraction) + state.current
+        if estimated >= self.limit:
+            retry_after = max(1, math.ceil(self.window * (1.0 - elapsed_fraction)))
+            return False, retry_after
+
+        state.current += 1
+        return True, 0
+
+    def _evict_idle(self, now: float):
+        """Drop a few of the least recently seen clients if they have gone idle."""
+        clients = self._clients
+        cutoff = now - self.idle_ttl
+        for _ in range(self.EVICTIONS_PER_HIT):
+            if not clients:
+                return
+            key = next(iter(clients))
+            if clients[key].last_seen >= cutoff:
+                return
+            del clients[key]
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Limiter statistics for monitoring."""
+        return {
+            'trackedClients': len(self._clients),
+            'evictions': self.evictions,
+            'limit': self.limit,
+            'windowSeconds': self.window,
+        }
+
+
+class UpstreamRateLimiter:
+    """Token bucket (rate per second, burst) plus a cap on requests in flight, for outgoing calls.
+
+    Use as `async with limiter:` around each request. Waiting is done with the
+    given clock's sleep(), so loops on a VirtualClock are throttled in virtual time.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_concurrent: int = 4, clock: Optional[Clock] = None):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock or SystemClock()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._tokens = float(burst)
+        self._updated = self.clock.time()
+        self.waits = 0
+
+    async def acquire(self):
+        """Wait for a concurrency slot and a token."""
+        await self._semaphore.acquire()
+        try:
+            while True:
+                now = self.clock.time()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                self.waits += 1
+                await self.clock.sleep((1 - self._tokens) / self.rate)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self):
+        self._semaphore.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,242 @@
+"""
+Per-market refresh scheduling under a global request budget.
+
+The trading loop refreshes a whole page of markets at a fixed cadence, the
+scalping loop a page whenever long-tail markets on it come due; markets that
+need fresher prices than that, or that have dropped out of the pages, are
+refreshed one request at a time. RefreshScheduler decides
+which and when. Every tracked market has a priority tier whose base interval
+(open positions fastest, high-scoring candidates next, the long tail slowest)
+is scaled by the market's observed volatility: a market moving more than
+VOLATILITY_REFERENCE per base interval comes due sooner, a flat one later.
+Due markets are handed out in tier order from a token bucket, so refreshes
+stay within the configured rate however many markets are due.
+
+Any observed price counts as a refresh, so markets kept fresh by page
+fetches do not come due for individual requests.
+"""
+import heapq
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Priority tiers, fastest first
+POSITION = 0
+CANDIDATE = 1
+TAIL = 2
+TIER_NAMES = ('position', 'candidate', 'tail')
+
+# Expected price move over a tier's base interval at which a market keeps that interval
+VOLATILITY_REFERENCE = 0.005
+# Bounds on the volatility scaling of a base interval
+MIN_INTERVAL_FACTOR = 0.5
+MAX_INTERVAL_FACTOR = 4.0
+# Weight of the newest observation in the volatility average
+VOLATILITY_ALPHA = 0.3
+
+
+@dataclass(slots=True)
+class _Entry:
+    tier: int
+    due: float
+    refreshed_at: Optional[float] = None
+    price: Optional[float] = None
+    # Average absolute price change per sqrt(second), None until two observations
+    volatility: Optional[float] = None
+
+
+class RefreshScheduler:
+    """Tiered, volatility-adaptive per-market refresh intervals under a token-bucket budget."""
+
+    def __init__(self, intervals: Tuple[float, float, float] = (2.0, 10.0, 60.0), rate: float = 2.0,
+                 burst: int = 4, max_markets: int = 100_000):
+        """
+        Args:
+            intervals: Base refresh seconds for the position, candidate and tail tiers
+            rate: Individual market refreshes allowed per second
+            burst: Refreshes that may be handed out at once after an idle period
+            max_markets: Tracked markets before tracking is cleared
+        """
+        self.intervals = tuple(intervals)
+        self.rate = rate
+        self.burst = burst
+        self.max_markets = max_markets
+        self._entries: Dict[str, _Entry] = {}
+        # (due, tier, market id); entries rescheduled since are skipped when popped
+        self._heap: List[Tuple[float, int, str]] = []
+        # Markets currently above the tail tier
+        self._prioritized: Set[str] = set()
+        self._tokens = float(burst)
+        self._updated: Optional[float] = None
+        self._reset_counters()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _reset_counters(self):
+        self.refreshed = [0, 0, 0]
+        self.deferred = 0
+
+    def interval(self, market_id: str) -> float:
+        """Current refresh interval of a tracked market: its tier's base, scaled by volatility."""
+        entry = self._entries[market_id]
+        base = self.intervals[entry.tier]
+        if entry.volatility is None:
+            return base
+        expected_move = entry.volatility * math.sqrt(base)
+        factor = VOLATILITY_REFERENCE / expected_move if expected_move > 0 else MAX_INTERVAL_FACTOR
+        return base * min(MAX_INTERVAL_FACTOR, max(MIN_INTERVAL_FACTOR, factor))
+
+    def _schedule(self, market_id: str, entry: _Entry, due: float):
+        entry.due = due
+        heapq.heappush(self._heap, (due, entry.tier, market_id))
+        # Rebuild once superseded heap items outnumber live ones
+        if len(self._heap) > 4 * len(self._entries) + 1024:
+            self._heap = [(e.due, e.tier, m) for m, e in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _track(self, market_id: str, tier: int, now: float) -> _Entry:
+        if len(self._entries) >= self.max_markets:
+            self.clear()
+        entry = self._entries[market_id] = _Entry(tier, now)
+        if tier != TAIL:
+            self._prioritized.add(market_id)
+        return entry
+
+    def _set_tier(self, market_id: str, tier: int, now: float):
+        entry = self._entries.get(market_id)
+        if entry is None:
+            # Never refreshed: due immediately
+            self._schedule(market_id, self._track(market_id, tier, now), now)
+            return
+        if entry.tier == tier:
+            return
+        entry.tier = tier
+        if tier == TAIL:
+            self._prioritized.discard(market_id)
+        else:
+            self._prioritized.add(market_id)
+        since = entry.refreshed_at if entry.refreshed_at is not None else now
+        self._schedule(market_id, entry, since + self.interval(market_id))
+
+    def set_tiers(self, position_ids: Iterable[str], candidate_ids: Iterable[str], now: float):
+        """Assign the position and candidate tiers; previously prioritized markets drop to the tail.
+
+        Markets not tracked yet are due immediately.
+        """
+        positions = set(position_ids)
+        candidates = set(candidate_ids) - positions
+        for market_id in self._prioritized - positions - candidates:
+            self._set_tier(market_id, TAIL, now)
+        for market_id in positions:
+            self._set_tier(market_id, POSITION, now)
+        for market_id in candidates:
+            self._set_tier(market_id, CANDIDATE, now)
+
+    def observe(self, market_id: str, price: float, now: float):
+        """Record a fresh price (from any source) and reschedule the market's next refresh.
+
+        Untracked markets start in the tail tier.
+        """
+        entry = self._entries.get(market_id)
+        if entry is None:
+            entry = self._track(market_id, TAIL, now)
+        elif entry.price is not None and entry.refreshed_at is not None and now > entry.refreshed_at:
+            change = abs(price - entry.price) / math.sqrt(now - entry.refreshed_at)
+            if entry.volatility is None:
+                entry.volatility = change
+            else:
+                entry.volatility += VOLATILITY_ALPHA * (change - entry.volatility)
+        entry.price = price
+        entry.refreshed_at = now
+        self._schedule(market_id, entry, now + self.interval(market_id))
+
+    def take_due(self, now: float, limit: Optional[int] = None) -> List[str]:
+        """Hand out due markets, highest tier and most overdue first, within the budget.
+
+        Markets handed out are rescheduled one interval ahead, so a failed refresh
+        is retried later rather than on every call; due markets over budget stay due.
+        """
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        due = []
+        seen = set()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            item = heapq.heappop(heap)
+            entry = self._entries.get(item[2])
+            # Skip superseded items, and duplicates of a schedule pushed twice
+            if entry is not None and entry.due == item[0] and entry.tier == item[1] and item[2] not in seen:
+                seen.add(item[2])
+                due.append(item)
+        if not due:
+            return []
+
+        due.sort(key=lambda item: (item[1], item[0]))
+        budget = int(self._tokens)
+        if limit is not None:
+            budget = min(budget, limit)
+        taken, waiting = due[:budget], due[budget:]
+        for item in waiting:
+            heapq.heappush(heap, item)
+        self.deferred += len(waiting)
+        self._tokens -= len(taken)
+
+        market_ids = []
+        for _, tier, market_id in taken:
+            self.refreshed[tier] += 1
+            self._schedule(market_id, self._entries[market_id], now + self.interval(market_id))
+            market_ids.append(market_id)
+        return market_ids
+
+    def next_due(self, market_ids: Iterable[str], tier: int = TAIL) -> Optional[float]:
+        """Earliest next refresh among the tracked market_ids in the given tier, or None if there are none."""
+        due = None
+        for market_id in market_ids:
+            entry = self._entries.get(market_id)
+            if entry is not None and entry.tier == tier and (due is None or entry.due < due):
+                due = entry.due
+        return due
+
+    def retain(self, market_ids: Iterable[str]):
+        """Stop tracking markets not in market_ids."""
+        keep = set(market_ids)
+        for market_id in [m for m in self._entries if m not in keep]:
+            del self._entries[market_id]
+            self._prioritized.discard(market_id)
+
+    def clear(self):
+        self._entries.clear()
+        self._heap.clear()
+        self._prioritized.clear()
+
+    def take_metrics(self) -> dict:
+        """Tracked markets per tier, plus refreshes handed out and deferred since the last call."""
+        tracked = [0, 0, 0]
+        tracked[TAIL] = len(self._entries) - len(self._prioritized)
+        for market_id in self._prioritized:
+            tracked[self._entries[market_id].tier] += 1
+        metrics = {
+            'tracked': dict(zip(TIER_NAMES, tracked)),
+            'refreshed': dict(zip(TIER_NAMES, self.refreshed)),
+            'deferred': self.deferred,
+            'budget': self._tokens,
+        }
+        self._reset_counters()
+        return metrics
+
+
+def create_refresh_scheduler_from_env() -> RefreshScheduler:
+    """Create the refresh scheduler using optional environment overrides."""
+    return RefreshScheduler(
+        intervals=(
+            float(os.getenv("REFRESH_POSITION_INTERVAL", "2")),
+            float(os.getenv("REFRESH_CANDIDATE_INTERVAL", "10")),
+            float(os.getenv("REFRESH_TAIL_INTERVAL", "60")),
+        ),
+        rate=float(os.getenv("REFRESH_RATE_LIMIT", "2")),
+        burst=int(os.getenv("REFRESH_BURST", "4")),
+    )
@@ -0,0 +1,122 @@
+"""
+Parsed and indexed market end dates for resolution-window checks.
+
+Market end dates arrive as ISO strings under several field names. Each
+(market id, end-date string) pair is parsed once into epoch seconds; the
+market's timestamp is also kept in a sorted index so "which markets resolve
+between A and B" is a bisect range query instead of a parse of every market.
+"""
+import re
+from bisect import bisect_left, insort
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Field names that may hold a market's end date (CLOB first)
+END_DATE_FIELDS = (
+    'end_date_iso', 'endDate', 'end_date', 'resolutionDate', 'resolution_date',
+    'endsAt', 'ends_at', 'endDateISO8601',
+)
+
+# Phrases marking an undated market as short-term
+SHORT_TERM_INDICATORS = (
+    'this week', 'next week', 'today', 'tomorrow', 'in 7 days', 'in 14 days',
+    'january 2024', 'february 2024', 'march 2024', 'april 2024', 'may 2024', 'june 2024',
+)
+_YEAR = re.compile(r'\b(20\d{2})\b')
+
+# Returned by end_timestamp() for markets with no end date
+UNDATED = -1.0
+# Returned by end_timestamp() for end dates that cannot be parsed
+UNPARSEABLE = None
+
+
+def end_date_value(market: dict):
+    """The market's raw end-date value, or None."""
+    for name in END_DATE_FIELDS:
+        value = market.get(name)
+        if value:
+            return value
+    return None
+
+
+def parse_end_date(value) -> Optional[float]:
+    """Parse an ISO end date into epoch seconds; date-only values are local midnight.
+
+    Returns:
+        Epoch seconds, or None if the value is not a parseable string
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        if 'T' in value or value.endswith('Z'):
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        return datetime.strptime(value.split('T')[0], '%Y-%m-%d').timestamp()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=65536)
+def undated_question_is_short_term(question: str) -> bool:
+    """Classify an undated market from its question text (lowercased)."""
+    if any(indicator in question for indicator in SHORT_TERM_INDICATORS):
+        return True
+    # Questions naming years past 2024 are long-term
+    years = _YEAR.findall(question)
+    if years and max(int(y) for y in years) > 2024:
+        return False
+    # No date info: allow it
+    return True
+
+
+class EndDateIndex:
+    """Per-market end-date cache plus a sorted (timestamp, market id) index."""
+
+    def __init__(self, max_markets: int = 100_000):
+        self.max_markets = max_markets
+        # market id -> (end-date value, epoch seconds or None)
+        self._parsed: Dict[str, Tuple[object, Optional[float]]] = {}
+        self._sorted: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def end_timestamp(self, market_id: Optional[str], value) -> Optional[float]:
+        """Epoch end time for a market, parsing only when its end-date value changes.
+
+        Returns:
+            Epoch seconds, UNDATED if value is empty, or UNPARSEABLE (None)
+        """
+        if not value:
+            return UNDATED
+        if not market_id:
+            return parse_end_date(value)
+
+        cached = self._parsed.get(market_id)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+
+        if cached is not None and cached[1] is not None:
+            self._unindex(cached[1], market_id)
+        elif len(self._parsed) >= self.max_markets:
+            self.clear()
+        timestamp = parse_end_date(value)
+        self._parsed[market_id] = (value, timestamp)
+        if timestamp is not None:
+            insort(self._sorted, (timestamp, market_id))
+        return timestamp
+
+    def _unindex(self, timestamp: float, market_id: str):
+        position = bisect_left(self._sorted, (timestamp, market_id))
+        if position < len(self._sorted) and self._sorted[position] == (timestamp, market_id):
+            del self._sorted[position]
+
+    def between(self, start: float, end: float) -> List[str]:
+        """Ids of indexed markets whose end time is in [start, end)."""
+        low = bisect_left(self._sorted, (start, ''))
+        high = bisect_left(self._sorted, (end, ''))
+        return [market_id for _, market_id in self._sorted[low:high]]
+
+    def clear(self):
+        self._parsed.clear()
+        self._sorted.clear()
@@ -0,0 +1,218 @@
+"""
+Semantic response cache for chat insights.
+
+Near-identical questions about the same market share a single Claude completion.
+Entries are keyed by a normalized query, the model tier that answers it and a
+fingerprint of the market data the answer was built from, expire after a TTL, and are dropped early when any of the
+underlying market prices moves materially.
+"""
+import hashlib
+import json
+import os
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ttl_cache import TTLCache
+
+
+# Filler words only. Question words and modals (why, how, what, should, think, ...)
+# change the answer and select the model tier, so they stay in the normalized query.
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'will', 'be', 'is', 'are', 'was', 'were', 'have', 'has', 'had', 'do', 'does', 'did',
+    'i', 'me', 'my', 'you', 'your', 'it', 'this', 'that', 'there', 'please', 'tell', 'about',
+}
+
+_URL_RE = re.compile(r'https?://\S+')
+_WORD_RE = re.compile(r'\b\w+\b')
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase the query, strip URLs and filler words, and collapse whitespace.
+
+    URLs are removed because the market they point to is already captured by the
+    resolved market id in the cache key.
+    """
+    text = _URL_RE.sub(' ', (query or '').lower())
+    words = [w for w in _WORD_RE.findall(text) if w not in STOP_WORDS]
+    return ' '.join(words)
+
+
+def _market_id(market: Dict) -> Optional[str]:
+    return market.get('id') or market.get('condition_id') or market.get('conditionId') or market.get('slug')
+
+
+def _market_prices(market: Dict) -> List[float]:
+    """Extract the outcome prices of a market as floats (best effort)."""
+    prices = []
+    outcome_prices = market.get('outcomePrices')
+    if isinstance(outcome_prices, str):
+        try:
+            outcome_prices = json.loads(outcome_prices)
+        except (ValueError, TypeError):
+            outcome_prices = None
+    if isinstance(outcome_prices, list):
+        for price in outcome_prices:
+            try:
+                prices.append(float(price))
+            except (ValueError, TypeError):
+                continue
+    if not prices and isinstance(market.get('tokens'), list):
+        for token in market['tokens']:
+            if isinstance(token, dict) and token.get('price') is not None:
+                try:
+                    prices.append(float(token['price']))
+                except (ValueError, TypeError):
+                    continue
+    if not prices:
+        for price_field in ['lastTradePrice', 'newestPrice', 'price', 'yesPrice']:
+            if market.get(price_field) is not None:
+                try:
+                    prices.append(float(market[price_field]))
+                    break
+                except (ValueError, TypeError):
+                    continue
+    return prices
+
+
+def market_fingerprint(
+    market_details: Optional[Dict],
+    market_data: Optional[List[Dict]],
+) -> Tuple[str, Tuple[str, ...], Tuple[float, ...]]:
+    """Fingerprint the market data an answer is built from.
+
+    Returns:
+        Tuple of (fingerprint, resolved market ids, price vector). The fingerprint
+        covers the identity of the markets (ids, questions, end dates, outcomes) so
+        that a different market set never shares an entry. Prices are returned
+        separately so small moves reuse the entry and material moves invalidate it.
+    """
+    markets = []
+    if market_details:
+        markets.append(market_details)
+    if market_data:
+        markets.extend(market_data[:10])  # Same limit the prompt builder uses
+
+    market_ids = []
+    identity = []
+    prices: List[float] = []
+    for market in markets:
+        if not isinstance(market, dict):
+            continue
+        market_id = _market_id(market)
+        market_ids.append(str(market_id))
+        identity.append([
+            market_id,
+            market.get('question') or market.get('title') or market.get('name'),
+            market.get('endDate') or market.get('end_date_iso') or market.get('end_date'),
+            market.get('outcomes') if isinstance(market.get('outcomes'), str) else None,
+        ])
+        prices.extend(_market_prices(market))
+
+    digest = hashlib.sha1(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+    return digest, tuple(market_ids), tuple(prices)
+
+
+def _history_digest(conversation_history: Optional[List[Dict]], conversation_summary: Optional[str] = None) -> str:
+    """Digest of the conversation context that is included in the prompt."""
+    if not conversation_history and not conversation_summary:
+        return ''
+    turns = [(m.get('role', 'user'), m.get('content', '')) for m in (conversation_history or [])[-5:]]
+    return hashlib.sha1(json.dumps([conversation_summary, turns]).encode()).hexdigest()
+
+
+def _trades_digest(trades: Optional[List[Dict]]) -> str:
+    """Digest of the trades that are included in the prompt."""
+    if not trades:
+        return ''
+    # Same limit the prompt builder uses
+    return hashlib.sha1(json.dumps(trades[:10], sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SemanticResponseCache:
+    """Chat completion cache with TTL, price-move invalidation and single-flight.
+
+    Storage, LRU bounds and single-flight loading come from TTLCache; this class
+    adds query normalization and invalidation on material price moves.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_entries: int = 500,
+        price_move_threshold: float = 0.02,
+    ):
+        self.ttl = ttl
+        # Absolute probability move (0.02 = 2 points) that makes a cached answer stale
+        self.price_move_threshold = price_move_threshold
+        self._cache = TTLCache(max_entries=max_entries, name="chat")
+        self.invalidations = 0
+
+    def build_key(
+        self,
+        user_query: str,
+        market_details: Optional[Dict] = None,
+        market_data: Optional[List[Dict]] = None,
+        conversation_history: Optional[List[Dict]] = None,
+        language: str = 'en',
+        conversation_summary: Optional[str] = None,
+        tier: str = '',
+        trades: Optional[List[Dict]] = None,
+    ) -> Tuple[str, Tuple[float, ...]]:
+        """Build the cache key for a request.
+
+        Args:
+            tier: Model tier the request is routed to; answers from different tiers never share an entry
+
+        Returns:
+            Tuple of (key, price vector of the markets used)
+        """
+        fingerprint, market_ids, prices = market_fingerprint(market_details, market_data)
+        key = '|'.join([
+            tier,
+            normalize_query(user_query),
+            ','.join(market_ids),
+            fingerprint,
+            _trades_digest(trades),
+            _history_digest(conversation_history, conversation_summary),
+            language or 'en',
+        ])
+        return key, prices
+
+    def _is_material_move(self, cached: Tuple[float, ...], current: Tuple[float, ...]) -> bool:
+        if len(cached) != len(current):
+            return True
+        return any(abs(a - b) > self.price_move_threshold for a, b in zip(cached, current))
+
+    async def get_or_generate(
+        self,
+        key: str,
+        prices: Tuple[float, ...],
+        generate: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Return the cached response or generate it once for all concurrent callers."""
+        cached = self._cache.peek(key)
+        if cached is not None and self._is_material_move(cached[1], prices):
+            self._cache.invalidate(key)
+            self.invalidations += 1
+
+        async def load() -> Tuple[str, Tuple[float, ...]]:
+            return await generate(), prices
+
+        response, _ = await self._cache.get_or_load(key, load, ttl=self.ttl)
+        return response
+
+    def stats(self) -> dict:
+        """Cache statistics for monitoring."""
+        stats = self._cache.stats()
+        stats['priceInvalidations'] = self.invalidations
+        return stats
+
+
+def create_semantic_cache_from_env() -> SemanticResponseCache:
+    """Create the chat response cache using optional environment overrides."""
+    return SemanticResponseCache(
+        ttl=float(os.getenv("CHAT_CACHE_TTL", "300")),
+        max_entries=int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "500")),
+        price_move_threshold=float(os.getenv("CHAT_CACHE_PRICE_MOVE", "0.02")),
+    )
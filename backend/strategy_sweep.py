@@ -0,0 +1,295 @@
+"""
+Parallel parameter sweep of StrategyParams against recorded ticks.
+
+Each configuration is replayed through the Backtester in a process pool (all
+cores by default) and ranked by total return, maximum drawdown and Sharpe
+ratio. Workers open the daily tick segments themselves; the column files are
+memory-mapped read-only, so every worker shares the same page-cache pages
+instead of receiving a pickled copy of the ticks.
+
+The search space is a JSON object mapping StrategyParams field names to either
+a list of candidate values or a range {"min": x, "max": y, "steps": n}.
+Range values take the field's declared type (int fields are rounded).
+Grid search takes the product of all candidates (ranges expand to `steps`
+evenly spaced values); random search draws `--samples` configurations, picking
+from lists and sampling ranges uniformly.
+
+Usage (from the backend directory):
+    python strategy_sweep.py --space space.json --mode random --samples 200 --out sweep.json
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, List, Optional
+
+from backtester import Backtester, iter_segment_ticks, open_segments
+from tick_recorder import TickSegment
+from trading_bot import StrategyParams
+
+# Used when no --space file is given: exit thresholds and the volume normalizer
+DEFAULT_SPACE = {
+    'scalp_take_profit': [0.01, 0.02, 0.03],
+    'scalp_stop_loss': [0.005, 0.008, 0.012],
+    'context_swing_take_profit': [0.08, 0.10, 0.15],
+    'context_swing_stop_loss': [0.04, 0.06, 0.08],
+    'volume_full_factor': [25000.0, 50000.0, 100000.0],
+}
+
+SECONDS_PER_YEAR = 365 * 86400
+
+_FIELD_TYPES = {f.name: f.type for f in fields(StrategyParams)}
+
+
+@dataclass
+class SweepResult:
+    """Performance of one configuration."""
+    overrides: dict
+    total_return_pct: float
+    max_drawdown_pct: float
+    sharpe: float
+    trades: int
+    win_rate: float
+    final_net_worth: float
+    elapsed_seconds: float
+    rank: float = 0.0  # Mean of the return, drawdown and Sharpe ranks (lower is better)
+
+
+def _as_field_type(name: str, value: float):
+    """A value sampled from a range, converted to the StrategyParams field's type."""
+    if _FIELD_TYPES.get(name) is int:
+        return int(round(value))
+    return value
+
+
+def _candidates(name: str, spec) -> list:
+    if isinstance(spec, dict):
+        steps = int(spec.get('steps', 5))
+        low, high = float(spec['min']), float(spec['max'])
+        if steps < 2:
+            return [_as_field_type(name, low)]
+        values = [_as_field_type(name, low + (high - low) * i / (steps - 1)) for i in range(steps)]
+        # Rounding int fields can repeat a value
+        return list(dict.fromkeys(values))
+    if isinstance(spec, list) and spec:
+        return spec
+    raise ValueError(f"Search space for {name} must be a non-empty list or a {{min, max}} range")
+
+
+def _validate_space(space: Dict[str, object]):
+    valid = {f.name for f in fields(StrategyParams)}
+    unknown = sorted(set(space) - valid)
+    if unknown:
+        raise ValueError(f"Unknown StrategyParams fields: {', '.join(unknown)} (valid: {', '.join(sorted(valid))})")
+
+
+def grid_configs(space: Dict[str, object]) -> List[dict]:
+    """Every combination of the candidate values in space."""
+    _validate_space(space)
+    names = list(space)
+    values = [_candidates(name, space[name]) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def random_configs(space: Dict[str, object], samples: int, seed: Optional[int] = None) -> List[dict]:
+    """`samples` distinct random configurations drawn from space."""
+    _validate_space(space)
+    rng = random.Random(seed)
+    configs, seen = [], set()
+    # Small discrete spaces may have fewer distinct configurations than requested
+    for _ in range(samples * 20):
+        if len(configs) >= samples:
+            break
+        config = {}
+        for name, spec in space.items():
+            if isinstance(spec, dict):
+                config[name] = _as_field_type(name, rng.uniform(float(spec['min']), float(spec['max'])))
+            else:
+                config[name] = rng.choice(_candidates(name, spec))
+        key = json.dumps(config, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+
+def equity_metrics(equity: List[dict], initial_balance: float, interval_seconds: float):
+    """Total return %, maximum drawdown % and annualized Sharpe ratio of an equity curve.
+
+    Args:
+        equity: Points in the get_pnl_history() shape, oldest first
+        initial_balance: Net worth before the first point
+        interval_seconds: Spacing of the points, used to annualize Sharpe
+
+    Returns:
+        Tuple of (total_return_pct, max_drawdown_pct, sharpe)
+    """
+    curve = [initial_balance] + [point['netWorth'] for point in equity]
+    total_return = (curve[-1] - initial_balance) / initial_balance * 100
+
+    peak, max_drawdown = curve[0], 0.0
+    for value in curve:
+        peak = max(peak, value)
+        if peak > 0:
+            max_drawdown = max(max_drawdown, (peak - value) / peak * 100)
+
+    returns = [b / a - 1 for a, b in zip(curve, curve[1:]) if a > 0]
+    sharpe = 0.0
+    if len(returns) > 1:
+        mean = sum(returns) / len(returns)
+        std = math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1))
+        if std > 0:
+            sharpe = mean / std * math.sqrt(SECONDS_PER_YEAR / interval_seconds)
+    return total_return, max_drawdown, sharpe
+
+
+def rank_results(results: List[SweepResult]) -> List[SweepResult]:
+    """Rank by the mean of each result's position in return, drawdown and Sharpe order."""
+    orders = (
+        sorted(results, key=lambda r: -r.total_return_pct),
+        sorted(results, key=lambda r: r.max_drawdown_pct),
+        sorted(results, key=lambda r: -r.sharpe),
+    )
+    positions: Dict[int, List[int]] = {id(r): [] for r in results}
+    for order in orders:
+        for position, result in enumerate(order, 1):
+            positions[id(result)].append(position)
+    for result in results:
+        result.rank = sum(positions[id(result)]) / len(orders)
+    return sorted(results, key=lambda r: (r.rank, -r.sharpe))
+
+
+# Per-worker state, set up once by _init_worker
+_worker_segments: List[TickSegment] = []
+_worker_backtest_options: dict = {}
+
+
+def _init_worker(ticks_dir: str, start_day: Optional[str], end_day: Optional[str], backtest_options: dict):
+    global _worker_segments, _worker_backtest_options
+    _worker_segments = open_segments(ticks_dir, start_day, end_day)
+    _worker_backtest_options = backtest_options
+
+
+def _evaluate(overrides: dict) -> SweepResult:
+    # JSON lists stand in for the tuple-typed band fields
+    params = StrategyParams(**{k: tuple(v) if isinstance(v, list) else v for k, v in overrides.items()})
+    backtester = Backtester(params=params, **_worker_backtest_options)
+    result = backtester.run(iter_segment_ticks(_worker_segments))
+    total_return, max_drawdown, sharpe = equity_metrics(
+        result.equity, backtester.initial_balance, backtester.equity_interval
+    )
+    return SweepResult(
+        overrides=overrides,
+        total_return_pct=total_return,
+        max_drawdown_pct=max_drawdown,
+        sharpe=sharpe,
+        trades=len(result.trades),
+        win_rate=result.stats['winRate'],
+        final_net_worth=result.stats['netWorth'],
+        elapsed_seconds=result.elapsed_seconds,
+    )
+
+
+def run_sweep(
+    configs: List[dict],
+    ticks_dir: str,
+    start_day: Optional[str] = None,
+    end_day: Optional[str] = None,
+    workers: Optional[int] = None,
+    **backtest_options,
+) -> List[SweepResult]:
+    """Evaluate every configuration in a process pool and return them ranked.
+
+    Args:
+        configs: StrategyParams overrides, one dict per configuration
+        ticks_dir: TickRecorder data directory
+        start_day: First day to replay (YYYY-MM-DD), or None for the oldest
+        end_day: Last day to replay (YYYY-MM-DD), or None for the newest
+        workers: Process count (defaults to all cores)
+        **backtest_options: Passed to Backtester (intervals, market_limit, metadata, ...)
+
+    Returns:
+        Results ordered best first
+    """
+    results: List[SweepResult] = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(ticks_dir, start_day, end_day, backtest_options),
+    ) as pool:
+        futures = [pool.submit(_evaluate, config) for config in configs]
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"Sweep: configuration failed: {e}")
+                continue
+            print(f"  [{len(results)}/{len(configs)}] {time.perf_counter() - started:.0f}s")
+    return rank_results(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks-dir", default=os.getenv("TICK_DATA_DIR", os.path.join("data", "ticks")))
+    parser.add_argument("--start", help="First day to replay (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last day to replay (YYYY-MM-DD)")
+    parser.add_argument("--space", help="JSON search space file (defaults to exit thresholds)")
+    parser.add_argument("--mode", choices=("grid", "random"), default="grid")
+    parser.add_argument("--samples", type=int, default=100, help="Configurations for random search")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--metadata", help="JSON file mapping market id -> question/endDate/liquidityNum")
+    parser.add_argument("--trading-interval", type=float, default=5.0)
+    parser.add_argument("--scalping-interval", type=float, default=3.5)
+    parser.add_argument("--position-interval", type=float, default=2.0)
+    parser.add_argument("--market-limit", type=int, default=200)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--out", help="Write all ranked results as JSON to this file")
+    args = parser.parse_args()
+
+    space = DEFAULT_SPACE
+    if args.space:
+        with open(args.space, "r", encoding="utf-8") as f:
+            space = json.load(f)
+    metadata = None
+    if args.metadata:
+        with open(args.metadata, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+
+    if args.mode == "grid":
+        configs = grid_configs(space)
+    else:
+        configs = random_configs(space, args.samples, args.seed)
+    print(f"Sweeping {len(configs)} configurations ({args.mode}) over {', '.join(space)}")
+
+    results = run_sweep(
+        configs,
+        args.ticks_dir,
+        args.start,
+        args.end,
+        workers=args.workers,
+        metadata=metadata,
+        trading_interval=args.trading_interval,
+        scalping_interval=args.scalping_interval,
+        position_interval=args.position_interval,
+        market_limit=args.market_limit,
+    )
+
+    print(f"\n{'rank':>6} {'return %':>9} {'drawdown %':>11} {'sharpe':>8} {'trades':>7}  overrides")
+    for result in results[:args.top]:
+        print(f"{result.rank:6.1f} {result.total_return_pct:9.2f} {result.max_drawdown_pct:11.2f} "
+              f"{result.sharpe:8.2f} {result.trades:7d}  {json.dumps(result.overrides)}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+        print(f"\nWrote {len(results)} results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Sweeping int-typed StrategyParams fields over {min, max, steps} ranges."""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from strategy_sweep import grid_configs, random_configs, run_sweep  # noqa: E402
+from tick_recorder import TickRecorder  # noqa: E402
+
+INT_SPACE = {'max_scalps_per_cycle': {'min': 2, 'max': 6, 'steps': 2}}
+
+
+def test_grid_range_of_int_field_yields_ints():
+    configs = grid_configs({'max_scalps_per_cycle': {'min': 2, 'max': 6, 'steps': 4}})
+    values = [c['max_scalps_per_cycle'] for c in configs]
+    assert values == [2, 3, 5, 6]
+    assert all(type(v) is int for v in values)
+
+
+def test_random_range_of_int_field_yields_ints():
+    space = {'max_scalps_per_cycle': {'min': 2, 'max': 6}, 'scalp_take_profit': {'min': 0.01, 'max': 0.03}}
+    configs = random_configs(space, samples=10, seed=1)
+    assert configs
+    for config in configs:
+        assert type(config['max_scalps_per_cycle']) is int and 2 <= config['max_scalps_per_cycle'] <= 6
+        assert type(config['scalp_take_profit']) is float
+
+
+def test_sweep_over_int_field_runs_every_configuration(tmp_path, capsys):
+    recorder = TickRecorder(str(tmp_path))
+    start = time.time() - 2 * 86400
+    start -= start % 86400
+    for second in range(600):
+        for i in range(5):
+            price = 0.3 + 0.05 * i + 0.0001 * (second % 50)
+            recorder.record(f"m{i}", price, 1 - price, 100000.0, start + second)
+    recorder.close()
+
+    configs = grid_configs(INT_SPACE)
+    results = run_sweep(configs, str(tmp_path), workers=1)
+
+    assert "configuration failed" not in capsys.readouterr().out
+    assert sorted(r.overrides['max_scalps_per_cycle'] for r in results) == [2, 6]
@@ -0,0 +1,67 @@
+"""Running the bot's trading, scalping and position update loops on a VirtualClock."""
+import asyncio
+import contextlib
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.bench_virtual_day import FakePolymarketClient  # noqa: E402
+from clock import VirtualClock  # noqa: E402
+from trading_bot import TradingBot  # noqa: E402
+
+START = 1_790_000_000.0
+
+
+class FlatPolymarketClient(FakePolymarketClient):
+    """Serves the fake markets without moving their prices, so scalps hit neither target nor stop."""
+
+    async def get_markets(self, limit: int = 100, offset: int = 0, use_clob: bool = False):
+        self.fetches += 1
+        return [dict(m) for m in self.markets[offset:offset + limit]]
+
+
+def run_loops(client, hours: float, seed: int = 1) -> TradingBot:
+    """Start the bot's live loops against client and fast-forward them by hours of virtual time."""
+    async def run():
+        clock = VirtualClock(start=START)
+        bot = TradingBot(clock=clock, seed=seed)
+        bot.claude_client = None
+        bot.clob_client = None
+        bot._clob_initialized = True
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            bot.start(client)
+            await clock.run_for(hours * 3600)
+            bot.stop()
+            await clock.run_for(1)
+        assert clock.time() == START + hours * 3600 + 1
+        return bot
+
+    return asyncio.run(run())
+
+
+def test_runs_with_the_same_seed_are_identical():
+    first = run_loops(FakePolymarketClient(5, seed=1), hours=1, seed=1)
+    second = run_loops(FakePolymarketClient(5, seed=1), hours=1, seed=1)
+
+    trades = [first._trade_to_dict(t) for t in first.trades]
+    assert trades
+    assert trades == [second._trade_to_dict(t) for t in second.trades]
+    assert first._compute_stats() == second._compute_stats()
+
+
+def test_scalp_times_out_after_two_virtual_hours():
+    bot = run_loops(FlatPolymarketClient(2, seed=1), hours=2.2)
+    hold = bot.params.scalp_max_hold_seconds
+
+    timeouts = [t for t in bot.trades if t.action == 'SELL' and t.reason.startswith('Scalp timeout')]
+    assert timeouts
+    for sell in timeouts:
+        buy = min((t for t in bot.trades
+                   if t.action == 'BUY' and t.trade_type == 'scalp' and t.market_id == sell.market_id),
+                  key=lambda t: t.timestamp)
+        held = (sell.timestamp - buy.timestamp).total_seconds()
+        # Closed by the first trading cycle past the limit, on virtual time
+        assert hold < held < hold + 60
+        assert sell.timestamp <= datetime.fromtimestamp(START + 2.2 * 3600)
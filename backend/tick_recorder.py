@@ -0,0 +1,371 @@
+"""
+Columnar recorder for every market price the bot observes.
+
+Ticks are (timestamp, market_id, price_yes, price_no, volume) rows stored in one
+segment directory per UTC day. Each column is its own memory-mapped file of
+fixed-width values, so readers get zero-copy typed memoryviews over a column
+without parsing. Market ids are dictionary-encoded into a per-segment
+markets.txt; the market column stores indexes into it.
+
+record() only appends a tuple to an in-memory buffer. A background thread
+copies buffered rows into the mapped files, so recording never blocks the
+event loop on disk I/O. With retention_days set, segments that many days older
+than the day being written are deleted whenever a new day's segment is opened.
+"""
+import math
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Column name -> array/struct type code
+COLUMNS = (
+    ('ts', 'd'),          # Unix timestamp (seconds)
+    ('market', 'I'),      # Index into the segment's markets.txt
+    ('price_yes', 'f'),   # NaN when unknown
+    ('price_no', 'f'),    # NaN when unknown
+    ('volume', 'd'),
+)
+META_FILE = "rows.meta"
+MARKETS_FILE = "markets.txt"
+_COUNT = struct.Struct("<Q")
+
+
+def _day_bounds(ts: float) -> Tuple[str, float, float]:
+    """Return (YYYY-MM-DD, start, end) of the UTC day containing ts."""
+    start = ts - ts % 86400
+    return datetime.fromtimestamp(start, tz=timezone.utc).strftime("%Y-%m-%d"), start, start + 86400
+
+
+def _price(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+class _SegmentWriter:
+    """Appends rows to one day's column files, growing them by doubling."""
+
+    def __init__(self, path: str, initial_capacity: int):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self.market_ids: List[str] = []
+        self.market_index: Dict[str, int] = {}
+        markets_path = os.path.join(path, MARKETS_FILE)
+        if os.path.exists(markets_path):
+            with open(markets_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._remember(line.rstrip("\n"))
+        self._markets_file = open(markets_path, "a", encoding="utf-8")
+
+        meta_path = os.path.join(path, META_FILE)
+        if not os.path.exists(meta_path):
+            with open(meta_path, "wb") as f:
+                f.write(_COUNT.pack(0))
+        self._meta_file = open(meta_path, "r+b")
+        self._meta = mmap.mmap(self._meta_file.fileno(), _COUNT.size)
+        self.count = _COUNT.unpack_from(self._meta)[0]
+
+        self.capacity = max(initial_capacity, self.count)
+        self._files = {}
+        self._maps = {}
+        for name, code in COLUMNS:
+            f = open(os.path.join(path, f"{name}.{code}"), "a+b")
+            size = self.capacity * array(code).itemsize
+            if os.fstat(f.fileno()).st_size < size:
+                f.truncate(size)
+            self._files[name] = f
+            self._maps[name] = mmap.mmap(f.fileno(), size)
+
+    def _remember(self, market_id: str) -> int:
+        index = len(self.market_ids)
+        self.market_ids.append(market_id)
+        self.market_index[market_id] = index
+        return index
+
+    def encode_market(self, market_id: str) -> int:
+        index = self.market_index.get(market_id)
+        if index is None:
+            index = self._remember(market_id)
+            self._markets_file.write(market_id + "\n")
+        return index
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, code in COLUMNS:
+            self._maps[name].close()
+            size = capacity * array(code).itemsize
+            self._files[name].truncate(size)
+            self._maps[name] = mmap.mmap(self._files[name].fileno(), size)
+        self.capacity = capacity
+
+    def append(self, columns: Dict[str, array]):
+        """Write equal-length typed columns after the current last row."""
+        n = len(columns['ts'])
+        if self.count + n > self.capacity:
+            self._grow(self.count + n)
+        start, end = self.count, self.count + n
+        for name, code in COLUMNS:
+            with memoryview(self._maps[name]) as raw, raw.cast(code) as column:
+                column[start:end] = columns[name]
+        self._markets_file.flush()
+        # Publish the new row count last, so readers never see unwritten rows
+        self.count = end
+        _COUNT.pack_into(self._meta, 0, end)
+
+    def close(self):
+        for m in self._maps.values():
+            m.flush()
+            m.close()
+        for f in self._files.values():
+            f.close()
+        self._meta.close()
+        self._meta_file.close()
+        self._markets_file.close()
+
+
+class TickSegment:
+    """Read-only, zero-copy view of one day's ticks.
+
+    Each column attribute (ts, market, price_yes, price_no, volume) is a typed
+    memoryview over the mapped file, sliced to the rows written so far.
+    Call close() (or use as a context manager) to release the mappings.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE), "rb") as f:
+            self.count = _COUNT.unpack(f.read(_COUNT.size))[0]
+        with open(os.path.join(path, MARKETS_FILE), "r", encoding="utf-8") as f:
+            self.market_ids = [line.rstrip("\n") for line in f]
+
+        self._maps = []
+        self._views = []
+        for name, code in COLUMNS:
+            with open(os.path.join(path, f"{name}.{code}"), "rb") as f:
+                length = self.count * array(code).itemsize
+                if length:
+                    m = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+                    self._maps.append(m)
+                    raw = memoryview(m)
+                    self._views.append(raw)
+                    view = raw.cast(code)
+                else:
+                    view = memoryview(array(code))
+            self._views.append(view)
+            setattr(self, name, view)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def iter_market(self, market_id: str) -> Iterator[Tuple[float, float, float, float]]:
+        """Yield (ts, price_yes, price_no, volume) for one market in recording order."""
+        try:
+            index = self.market_ids.index(market_id)
+        except ValueError:
+            return
+        ts, market, yes, no, volume = self.ts, self.market, self.price_yes, self.price_no, self.volume
+        for row in range(self.count):
+            if market[row] == index:
+                yield ts[row], yes[row], no[row], volume[row]
+
+    def close(self):
+        # Release typed views before the raw views they were cast from
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        for m in self._maps:
+            m.close()
+        self._maps = []
+
+
+class TickRecorder:
+    """Buffers ticks in memory and writes them to daily columnar segments."""
+
+    def __init__(
+        self,
+        data_dir: str,
+        flush_interval: float = 0.5,
+        segment_capacity: int = 1 << 16,
+        max_pending: int = 1_000_000,
+        retention_days: Optional[int] = None,
+    ):
+        """
+        Args:
+            data_dir: Directory holding one segment directory per UTC day
+            flush_interval: Seconds between background flushes
+            segment_capacity: Initial rows per column file (files grow by doubling)
+            max_pending: Buffered ticks before new ticks are dropped
+            retention_days: Days of segments to keep, including the current one (None keeps all)
+        """
+        self.data_dir = data_dir
+        self.flush_interval = flush_interval
+        self.segment_capacity = segment_capacity
+        self.max_pending = max_pending
+        self.retention_days = retention_days
+        os.makedirs(data_dir, exist_ok=True)
+
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._segment: Optional[_SegmentWriter] = None
+        self._segment_day: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self.pruned = 0
+
+    def start(self):
+        """Start the background flush thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="tick-recorder", daemon=True)
+            self._thread.start()
+
+    def record(self, market_id: str, price_yes: Optional[float], price_no: Optional[float],
+               volume: float = 0.0, timestamp: Optional[float] = None):
+        """Buffer one tick. Never blocks on I/O; drops ticks if the writer falls far behind."""
+        if not market_id:
+            return
+        row = (time.time() if timestamp is None else timestamp, market_id,
+               _price(price_yes), _price(price_no), float(volume or 0.0))
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending.append(row)
+        self.recorded += 1
+
+    def flush(self):
+        """Write all buffered ticks to their segments."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+        with self._write_lock:
+            try:
+                # Group consecutive rows by UTC day so a batch spanning midnight rotates once
+                start = 0
+                while start < len(rows):
+                    day, day_start, day_end = _day_bounds(rows[start][0])
+                    end = start + 1
+                    while end < len(rows) and day_start <= rows[end][0] < day_end:
+                        end += 1
+                    self._write_rows(day, rows[start:end])
+                    start = end
+            except Exception as e:
+                self.write_errors += 1
+                print(f"TickRecorder: Failed to write {len(rows)} ticks: {e}")
+
+    def _write_rows(self, day: str, rows: List[tuple]):
+        if day != self._segment_day:
+            if self._segment is not None:
+                self._segment.close()
+            self._segment = _SegmentWriter(os.path.join(self.data_dir, day), self.segment_capacity)
+            self._segment_day = day
+            if self.retention_days:
+                self.prune(day)
+        segment = self._segment
+        ts, market_ids, price_yes, price_no, volume = zip(*rows)
+        encode = segment.encode_market
+        segment.append({
+            'ts': array('d', ts),
+            'market': array('I', [encode(market_id) for market_id in market_ids]),
+            'price_yes': array('f', price_yes),
+            'price_no': array('f', price_no),
+            'volume': array('d', volume),
+        })
+        self.written += len(rows)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def close(self):
+        """Flush remaining ticks, stop the thread and unmap the open segment."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._write_lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+                self._segment_day = None
+
+    def days(self) -> List[str]:
+        """Days (YYYY-MM-DD) that have a segment, oldest first."""
+        return sorted(
+            name for name in os.listdir(self.data_dir)
+            if os.path.exists(os.path.join(self.data_dir, name, META_FILE))
+        )
+
+    def prune(self, current_day: str):
+        """Delete segments older than retention_days before current_day (YYYY-MM-DD)."""
+        oldest = datetime.strptime(current_day, "%Y-%m-%d") - timedelta(days=self.retention_days - 1)
+        cutoff = oldest.strftime("%Y-%m-%d")
+        for day in self.days():
+            if day >= cutoff:
+                break
+            try:
+                shutil.rmtree(os.path.join(self.data_dir, day))
+                self.pruned += 1
+            except OSError as e:
+                print(f"TickRecorder: Failed to prune segment {day}: {e}")
+
+    def open_segment(self, day: str) -> TickSegment:
+        """Open a zero-copy reader for one day's ticks (rows flushed so far)."""
+        return TickSegment(os.path.join(self.data_dir, day))
+
+    def stats(self) -> dict:
+        """Recorder statistics for monitoring."""
+        return {
+            'dataDir': self.data_dir,
+            'recorded': self.recorded,
+            'written': self.written,
+            'pending': len(self._pending),
+            'dropped': self.dropped,
+            'writeErrors': self.write_errors,
+            'pruned': self.pruned,
+            'retentionDays': self.retention_days,
+            'segmentDay': self._segment_day,
+        }
+
+
+# Global recorder shared by the trading bot and the Polymarket client
+_tick_recorder: Optional[TickRecorder] = None
+_tick_recorder_initialized = False
+
+
+def get_tick_recorder() -> Optional[TickRecorder]:
+    """Get the global recorder configured by TICK_DATA_DIR, or None if TICK_RECORDER=false.
+
+    TICK_RETENTION_DAYS limits how many days of segments are kept (0 keeps all).
+    """
+    global _tick_recorder, _tick_recorder_initialized
+    if not _tick_recorder_initialized:
+        _tick_recorder_initialized = True
+        if os.getenv("TICK_RECORDER", "true").lower() != "false":
+            _tick_recorder = TickRecorder(
+                os.getenv("TICK_DATA_DIR", os.path.join("data", "ticks")),
+                retention_days=int(os.getenv("TICK_RETENTION_DAYS", "14")) or None,
+            )
+            _tick_recorder.start()
+    return _tick_recorder
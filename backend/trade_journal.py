@@ -0,0 +1,216 @@
+"""
+Write-ahead journal for the paper-trading bot's state.
+
+Trade, position and P&L events are appended to a JSON-lines journal and the
+full state is periodically compacted into a snapshot file, so a restart
+restores the portfolio by loading one snapshot and replaying a short tail.
+
+Records are handed to a background writer thread through a queue; the thread
+writes them in batches and fsyncs once per batch, so journaling never blocks
+the event loop.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+
+# Queue item telling the writer thread to exit
+_STOP = object()
+
+
+def _encode(obj: Any):
+    """json.dumps default for dataclasses and datetimes."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class _SnapshotRequest:
+    __slots__ = ('seq', 'state')
+
+    def __init__(self, seq: int, state: dict):
+        self.seq = seq
+        self.state = state
+
+
+class TradeJournal:
+    """Append-only event journal with periodic compacted snapshots.
+
+    Every record carries a sequence number. A snapshot stores the sequence number
+    of the last record it includes, so records left in the journal by a crash
+    between writing the snapshot and truncating the journal are skipped on replay.
+    """
+
+    def __init__(self, state_dir: str, flush_interval: float = 0.2, max_batch: int = 1000):
+        self.state_dir = state_dir
+        self.journal_path = os.path.join(state_dir, JOURNAL_FILE)
+        self.snapshot_path = os.path.join(state_dir, SNAPSHOT_FILE)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        os.makedirs(state_dir, exist_ok=True)
+
+        self._seq = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+        self.records_since_snapshot = 0
+        self.last_snapshot_time = time.monotonic()
+        self.written = 0
+        self.batches = 0
+        self.snapshots = 0
+        self.write_errors = 0
+
+    def load(self) -> Tuple[Optional[dict], List[dict]]:
+        """Read the last snapshot and the journal records written after it.
+
+        Must be called before start(). A torn final line (crash mid-write) is ignored.
+
+        Returns:
+            Tuple of (snapshot state or None, records in append order)
+        """
+        state = None
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            state = snapshot.get("state")
+            snapshot_seq = snapshot.get("seq", 0)
+
+        records = []
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if record.get("seq", 0) > snapshot_seq:
+                        records.append(record)
+
+        self._seq = max([snapshot_seq] + [r["seq"] for r in records])
+        self.records_since_snapshot = len(records)
+        return state, records
+
+    def start(self):
+        """Open the journal for appending and start the writer thread."""
+        if self._thread is not None:
+            return
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="trade-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, event_type: str, data: dict):
+        """Queue one event for the writer thread (non-blocking).
+
+        `data` must not be mutated afterwards; it is serialized on the writer thread.
+        """
+        self._seq += 1
+        self.records_since_snapshot += 1
+        self._queue.put({"seq": self._seq, "type": event_type, "data": data})
+
+    def write_snapshot(self, state: dict):
+        """Queue a compacted snapshot of the full state and truncate the journal behind it.
+
+        `state` must reflect every record appended so far and must not be mutated afterwards.
+        """
+        self.records_since_snapshot = 0
+        self.last_snapshot_time = time.monotonic()
+        self._queue.put(_SnapshotRequest(self._seq, state))
+
+    def close(self, timeout: float = 5.0):
+        """Flush pending records and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, _SnapshotRequest):
+                    # Records queued before the snapshot are part of it; write them first
+                    self._write_lines(lines)
+                    lines = []
+                    self._write_snapshot(item)
+                else:
+                    lines.append(json.dumps(item, default=_encode))
+            self._write_lines(lines)
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_lines(self, lines: List[str]):
+        if not lines:
+            return
+        try:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.written += len(lines)
+            self.batches += 1
+        except Exception as e:
+            self.write_errors += 1
+            print(f"TradeJournal: Failed to write {len(lines)} records: {e}")
+
+    def _write_snapshot(self, request: _SnapshotRequest):
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"seq": request.seq, "savedAt": datetime.now().isoformat(), "state": request.state},
+                          f, default=_encode)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # Everything up to request.seq is now in the snapshot
+            self._file.close()
+            self._file = open(self.journal_path, "w", encoding="utf-8")
+            self.snapshots += 1
+        except Exception as e:
+            self.write_errors += 1
+            print(f"TradeJournal: Failed to write snapshot: {e}")
+
+    def stats(self) -> dict:
+        """Journal statistics for monitoring."""
+        return {
+            'stateDir': self.state_dir,
+            'seq': self._seq,
+            'pending': self._queue.qsize(),
+            'recordsWritten': self.written,
+            'batches': self.batches,
+            'snapshots': self.snapshots,
+            'recordsSinceSnapshot': self.records_since_snapshot,
+            'writeErrors': self.write_errors,
+        }
+
+
+def create_journal_from_env() -> Optional[TradeJournal]:
+    """Create the journal configured by TRADING_STATE_DIR, or None if TRADING_JOURNAL=false."""
+    if os.getenv("TRADING_JOURNAL", "true").lower() == "false":
+        return None
+    return TradeJournal(os.getenv("TRADING_STATE_DIR", os.path.join("data", "state")))
@@ -3,13 +3,23 @@ Autonomous trading bot for Polymarket that runs continuously.
 Uses Anthropic Claude AI as the primary decision maker for trade execution.
 """
 import asyncio
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 import random
 import math
 import os
 import json
+import re
+import time
+from trade_journal import TradeJournal, create_journal_from_env
+from tick_recorder import TickRecorder, get_tick_recorder
+from clock import Clock, SystemClock
+from clob_adapter import get_clob_client
+from rate_limiter import UpstreamRateLimiter
+from resolution_index import UNDATED, EndDateIndex, undated_question_is_short_term
+from market import Market, complete_prices, create_price_extractor_from_env, normalize_markets, token_prices
+from refresh_scheduler import create_refresh_scheduler_from_env
 try:
     import anthropic
     ANTHROPIC_AVAILABLE = True
@@ -17,6 +27,62 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
     print("Warning: anthropic package not installed. Trading bot will use algorithmic strategies as fallback.")
 
+# Pending events kept per dashboard subscriber before it is asked to resync
+SUBSCRIBER_QUEUE_SIZE = 256
+# Queued in place of events a slow subscriber missed; it should reload a snapshot
+RESYNC = None
+
+# Markets qualify for trading when they resolve this many whole days from now (1-4 weeks)
+RESOLUTION_WINDOW_DAYS = (7, 28)
+
+# Joke/celebrity markets the bot never trades, matched anywhere in the lowercased question
+UNREALISTIC_PATTERNS = (
+    # Celebrity names that shouldn't be in serious political markets
+    'mrbeast', 'mr beast', 'lebon james', 'lebron', 'kanye', 'kanye west',
+    'elon musk', 'elon', 'trump', 'donald trump',  # Trump in unrealistic contexts
+    'taylor swift', 'kardashian', 'justin bieber', 'cristiano ronaldo',
+    'messi', 'tom brady', 'serena williams',
+    
+    # Joke indicators
+    'meme', 'joke', 'troll', 'satire', 'parody',
+    'will i', 'will you', 'will we',  # Personal questions
+    'will my', 'will your', 'will our',
+    
+    # Unrealistic political combinations (regular expressions)
+    'celebrity.*president', 'celebrity.*nomination', 'youtuber.*president',
+    'athlete.*president', 'musician.*president',
+)
+POLITICAL_KEYWORDS = ('president', 'presidential', 'nomination', 'election', 'senate', 'congress', 'governor')
+# Celebrities that shouldn't be in political markets
+POLITICAL_CELEBRITY_BLOCKLIST = (
+    'mrbeast', 'mr beast', 'lebron', 'kanye', 'elon musk',
+    'taylor swift', 'kardashian', 'justin bieber', 'cristiano',
+    'messi', 'tom brady', 'serena', 'oprah', 'dwayne johnson',
+    'the rock', 'mark cuban', 'bill gates', 'warren buffett',
+)
+# Each list compiled once into a single alternation, so a question is scanned in one pass per list.
+# Patterns are lowercase and matched against lowercased questions; IGNORECASE would be ~8x slower.
+_UNREALISTIC_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in UNREALISTIC_PATTERNS))
+_POLITICAL_RE = re.compile('|'.join(map(re.escape, POLITICAL_KEYWORDS)))
+_POLITICAL_CELEBRITY_RE = re.compile('|'.join(map(re.escape, POLITICAL_CELEBRITY_BLOCKLIST)))
+# Memoized filter verdicts kept before the cache is reset
+REALISTIC_CACHE_SIZE = 100_000
+# Markets whose last analysis is kept for reuse while their inputs are unchanged
+ANALYSIS_CACHE_SIZE = 100_000
+
+# Keywords searched by _fetch_markets_expanded to discover short-term markets
+DISCOVERY_KEYWORDS = ("2024", "2025", "election", "president", "crypto", "bitcoin", "ethereum", "sports")
+
+# Fetched market batches waiting for the trading stage; the fetch stage waits while the queue is full
+MARKET_BATCH_QUEUE_SIZE = 1
+# The scalping page is refetched when a long-tail market on it comes due within this many
+# seconds (the longest wait between scalping cycles); otherwise its latest copies are scanned
+SCALPING_PAGE_LOOKAHEAD = 5.0
+
+# Compact the trading journal into a snapshot after this many records or seconds
+JOURNAL_SNAPSHOT_RECORDS = 5000
+JOURNAL_SNAPSHOT_SECONDS = 300
+
 
 @dataclass
 class TradingPosition:
@@ -71,22 +137,128 @@ class MarketAnalysis:
     context_score: float = 0.0  # Context-based trading signal strength (trend, momentum, sentiment)
 
 
+@dataclass(frozen=True)
+class StrategyParams:
+    """Tunable strategy thresholds. Defaults are the live bot's values.
+    
+    Percentages are fractions of the entry price (0.02 = +2%). Mean-reversion
+    bands are (low, high) ranges of the YES price, mirrored around 0.5.
+    """
+    # Market analysis
+    volume_full_factor: float = 50000.0  # 24h volume that earns the full volume factor
+    arbitrage_max_price_sum: float = 0.98  # YES + NO below this is an arbitrage (fee buffer)
+    arbitrage_min_profit_pct: float = 0.5  # Minimum arbitrage profit, in percent
+    mean_reversion_mild_band: Tuple[float, float] = (0.25, 0.45)
+    mean_reversion_mild_score: float = 12.0
+    mean_reversion_moderate_band: Tuple[float, float] = (0.2, 0.3)
+    mean_reversion_moderate_score: float = 18.0
+    mean_reversion_strong_edge: float = 0.2  # YES below this (or above 1 - this)
+    mean_reversion_strong_score: float = 25.0
+    
+    # Entries
+    scalp_min_volume_score: float = 10.0
+    scalp_min_score: float = 5.0
+    max_scalps_per_cycle: int = 5
+    fallback_min_score: float = 5.0  # Algorithmic fallback when Claude is unavailable
+    refresh_candidate_min_score: float = 10.0  # |score| that puts a market in the refresh candidate tier
+    
+    # Exits
+    scalp_take_profit: float = 0.02
+    scalp_stop_loss: float = 0.008
+    scalp_max_hold_seconds: float = 7200.0
+    arbitrage_take_profit: float = 0.03
+    context_swing_take_profit: float = 0.10
+    context_swing_stop_loss: float = 0.06
+    momentum_take_profit: float = 0.08
+    momentum_stop_loss: float = 0.04
+    mean_reversion_exit_ratio: float = 0.7  # Exit once distance from 0.5 shrinks below this share
+    mean_reversion_take_profit: float = 0.10
+    mean_reversion_stop_loss: float = 0.05
+    volume_breakout_take_profit: float = 0.07
+    volume_breakout_stop_loss: float = 0.03
+    default_take_profit: float = 0.12
+    default_stop_loss: float = 0.06
+
+
+def _pct(fraction: float) -> str:
+    """Format a fraction for exit reasons: 0.02 -> '2%', 0.008 -> '0.8%'."""
+    return f"{fraction * 100:g}%"
+
+
+@dataclass(frozen=True)
+class BotSnapshot:
+    """Immutable, already-serialized view of bot state for API readers.
+    
+    Published by reference swap at the end of each mutation batch, so readers get
+    a consistent view without locks. The dicts inside are never mutated after
+    publication; callers must not modify them either.
+    """
+    version: int  # state_version at publication (analyses are not versioned)
+    stats: dict
+    positions: Tuple[dict, ...]
+    trades: Tuple[dict, ...]  # Newest first
+    pnl_history: Tuple[dict, ...]  # Oldest first
+    analyses: Tuple[dict, ...]
+    
+    def to_dashboard(self, trade_limit: int = 100, pnl_limit: int = 100) -> dict:
+        """Stats, positions, recent trades and P&L tail stamped with the version."""
+        return {
+            'version': self.version,
+            'stats': self.stats,
+            'positions': self.positions,
+            'trades': self.trades[:trade_limit],
+            'pnlHistory': self.pnl_history[-pnl_limit:],
+        }
+
+
 class TradingBot:
     """Autonomous trading bot that simulates trading on Polymarket."""
     
-    def __init__(self, initial_balance: float = 2000.0):
+    def __init__(self, initial_balance: float = 2000.0, journal: Optional[TradeJournal] = None,
+                 tick_recorder: Optional[TickRecorder] = None, params: Optional[StrategyParams] = None,
+                 clock: Optional[Clock] = None, seed: Optional[int] = None):
+        self.params: StrategyParams = params or StrategyParams()
         self.balance: float = initial_balance
         self.initial_balance: float = initial_balance
         self.positions: Dict[str, TradingPosition] = {}  # key: market_id-outcome
         self.trades: List[SimulatedTrade] = []
+        # Running sum of profit over self.trades; recount after trimming the list
+        self.realized_pnl: float = 0.0
         self.market_analyses: Dict[str, MarketAnalysis] = {}
         self.price_history: Dict[str, List[Tuple[datetime, float]]] = {}  # Track price history
+        # market id -> (input fingerprint, analysis) of the last analyze_market() call
+        self._analysis_cache: Dict[str, Tuple[tuple, MarketAnalysis]] = {}
+        self.analyses_computed = 0
+        self.analyses_reused = 0
         self.pnl_history: List[Tuple[datetime, float]] = []  # Track P&L over time for charting
         self.is_running: bool = True
+        # Time source and sleeps for loops and strategy timing; a VirtualClock fast-forwards them
+        self.clock: Clock = clock or SystemClock()
+        # Scalping jitter and trade ids; seed it for reproducible simulations
+        self._rng = random.Random(seed)
+        self.tick_recorder: Optional[TickRecorder] = tick_recorder  # Records every observed price
         self._task: Optional[asyncio.Task] = None
         self._position_update_task: Optional[asyncio.Task] = None
         self._scalping_task: Optional[asyncio.Task] = None
         
+        # State-change feed for dashboard streams. Every emitted event bumps
+        # state_version and is serialized once, however many subscribers listen.
+        self.state_version: int = 0
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._last_stats: Optional[dict] = None
+        
+        # Serialized trades by id, reused across snapshots (trades never change once recorded)
+        self._trade_dicts: Dict[str, dict] = {}
+        self._pnl_dicts: List[dict] = []
+        self.snapshot: BotSnapshot = BotSnapshot(self.state_version, self._compute_stats(), (), (), (), ())
+        
+        # Durable state: restore from the journal, then journal every change
+        self.journal: Optional[TradeJournal] = journal
+        # Clock time of the last journal snapshot (or startup), for the snapshot interval
+        self._journal_snapshot_at = self.clock.time()
+        if self.journal:
+            self._restore_from_journal()
+        
         # Initialize Anthropic Claude client for AI-powered trading decisions
         self.claude_client = None
         if ANTHROPIC_AVAILABLE:
@@ -102,35 +274,55 @@ class TradingBot:
         else:
             print("TradingBot: Anthropic package not available - using algorithmic strategies")
         
-        # Initialize CLOB client for fetching markets (public methods only)
+        # Market data client, set by start()
+        self.polymarket_client = None
+        
+        # Async CLOB adapter for fetching markets (public methods only), set on first trading cycle
         self.clob_client = None
         self._clob_initialized = False
         
+        # Question -> _is_realistic_market verdict
+        self._realistic_questions: Dict[str, bool] = {}
+        
+        # Parsed end dates, indexed for resolution-window range queries
+        self.end_dates = EndDateIndex()
+        
+        # Outcome price extraction (timed) and memoized CLOB price lookups
+        self.prices = create_price_extractor_from_env()
+        
+        # Limit on the bot's Polymarket requests: trading and scalping page fetches and per-market refreshes
+        self.upstream_limiter = UpstreamRateLimiter(
+            rate=float(os.getenv("POLYMARKET_RATE_LIMIT", "4")),
+            burst=int(os.getenv("POLYMARKET_MAX_CONCURRENCY", "4")),
+            max_concurrent=int(os.getenv("POLYMARKET_MAX_CONCURRENCY", "4")),
+            clock=self.clock,
+        )
+        # Per-market refresh cadence by priority and volatility, within a request budget
+        self.refresh = create_refresh_scheduler_from_env()
+        # Most recently fetched copy of each market the refresh scheduler tracks, from any source
+        self._latest_markets: Dict[str, Market] = {}
+        # Market ids of the last fetched scalping page, in page order
+        self._scalping_market_ids: List[str] = []
+        
+        # Seconds the expanded market discovery may take before late results are dropped
+        self.discovery_deadline = float(os.getenv("MARKET_DISCOVERY_DEADLINE", "5"))
+        
+        # Timings of the most recent trading/scalping/positions pass, price work, pipeline and refreshes, keyed by stage
+        self.cycle_metrics: Dict[str, dict] = {}
+        # Running totals for the fetch/trade pipeline of the trading loop
+        self._pipeline_stats = {'fetchBlockedSeconds': 0.0}
+        
     async def _initialize_clob_client(self):
-        """Initialize CLOB client for public data extraction (no private key needed)."""
+        """Attach the shared async CLOB adapter for public data extraction (no private key needed)."""
         if self._clob_initialized:
             return
-            
-        try:
-            from py_clob_client.client import ClobClient
-            
-            host = "https://clob.polymarket.com"
-            chain_id = 137  # Polygon mainnet
-            
-            # Initialize client for public methods only (no private key needed)
-            self.clob_client = ClobClient(
-                host=host,
-                chain_id=chain_id
-            )
-            
-            self._clob_initialized = True
+        
+        self.clob_client = get_clob_client()
+        self._clob_initialized = True
+        if self.clob_client:
             print("TradingBot: CLOB client initialized successfully (public methods only)")
-        except ImportError:
-            print("TradingBot: py-clob-client not installed - install with: pip install py-clob-client")
-        except Exception as e:
-            print(f"TradingBot: Failed to initialize CLOB client: {e}")
-            import traceback
-            traceback.print_exc()
+        else:
+            print("TradingBot: CLOB client unavailable - using Gamma API markets")
         
     def start(self, polymarket_client):
         """Start the trading bot in the background."""
@@ -148,6 +340,9 @@ class TradingBot:
     def stop(self):
         """Stop the trading bot."""
         self.is_running = False
+        if self.journal:
+            self.journal.write_snapshot(self._journal_state())
+            self.journal.close()
         if self._task and not self._task.done():
             self._task.cancel()
         if hasattr(self, '_position_update_task') and self._position_update_task and not self._position_update_task.done():
@@ -155,264 +350,362 @@ class TradingBot:
         if hasattr(self, '_scalping_task') and self._scalping_task and not self._scalping_task.done():
             self._scalping_task.cancel()
     
-    def _is_market_in_resolution_window(self, market: dict) -> bool:
-        """Check if market resolves in 1-4 weeks (7-28 days)."""
+    def subscribe(self) -> asyncio.Queue:
+        """Register a listener for state-change events.
+        
+        Returns:
+            Queue receiving JSON-encoded events ({"type", "version", "data"}), or
+            RESYNC if the listener fell behind and should reload a full snapshot
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a listener registered with subscribe()."""
+        self._subscribers.discard(queue)
+    
+    def _journal_event(self, event_type: str, data: dict):
+        if self.journal:
+            self.journal.append(event_type, data)
+    
+    def _journal_state(self) -> dict:
+        """Full state for a journal snapshot.
+        
+        Containers are copied here; trades are immutable once recorded, so the
+        writer thread can serialize them later.
+        """
+        return {
+            'balance': self.balance,
+            'initialBalance': self.initial_balance,
+            'positions': {key: asdict(p) for key, p in self.positions.items()},
+            'trades': list(self.trades),
+            'pnlHistory': list(self.pnl_history),
+            'priceHistory': {market_id: list(points) for market_id, points in self.price_history.items()},
+        }
+    
+    def _maybe_snapshot_journal(self):
+        """Compact the journal once enough records or time have accumulated."""
+        if not self.journal:
+            return
+        now = self.clock.time()
+        if (self.journal.records_since_snapshot >= JOURNAL_SNAPSHOT_RECORDS or
+                now - self._journal_snapshot_at >= JOURNAL_SNAPSHOT_SECONDS):
+            self.journal.write_snapshot(self._journal_state())
+            self._journal_snapshot_at = now
+    
+    def _restore_from_journal(self):
+        """Load the last journal snapshot, replay the records after it and start journaling."""
+        started = time.perf_counter()
         try:
-            # Try different possible field names for end date (including CLOB format)
-            end_date_str = (
-                market.get('end_date_iso') or  # CLOB format
-                market.get('endDate') or 
-                market.get('end_date') or 
-                market.get('resolutionDate') or
-                market.get('resolution_date') or
-                market.get('endsAt') or
-                market.get('ends_at') or
-                market.get('endDateISO8601')
-            )
-            
-            if not end_date_str:
-                # If no end date, check if it's a short-term market based on question
-                question = (market.get('question') or market.get('title') or '').lower()
-                # Look for time indicators like "this week", "next week", dates, etc.
-                short_term_indicators = ['this week', 'next week', 'today', 'tomorrow', 
-                                        'in 7 days', 'in 14 days', 'january 2024', 'february 2024',
-                                        'march 2024', 'april 2024', 'may 2024', 'june 2024']
-                # If it mentions 2025+ or "2028", likely long-term - filter out
-                if any(indicator in question for indicator in short_term_indicators):
-                    return True
-                # If question mentions years far in future (2025+), filter out
-                import re
-                years = re.findall(r'\b(20\d{2})\b', question)
-                if years:
-                    max_year = max([int(y) for y in years])
-                    if max_year > 2024:
-                        return False
-                # Default: if no date info, allow it but prefer markets with explicit dates
-                return True
-            
-            # Parse the end date
-            if isinstance(end_date_str, str):
-                # Try ISO format
-                if 'T' in end_date_str or end_date_str.endswith('Z'):
-                    end_date = datetime.fromisoformat(end_date_str.replace('Z', '+00:00'))
-                else:
-                    end_date = datetime.strptime(end_date_str.split('T')[0], '%Y-%m-%d')
-            else:
-                return True  # If we can't parse, allow it
-            
-            now = datetime.now(end_date.tzinfo) if end_date.tzinfo else datetime.now()
-            days_until_resolution = (end_date - now).days
-            
-            # Only include markets resolving in 7-28 days (1-4 weeks) - expanded range
-            # This is more flexible and allows more trading opportunities
-            return 7 <= days_until_resolution <= 28
-            
+            state, records = self.journal.load()
+            if state:
+                self.balance = state['balance']
+                self.initial_balance = state.get('initialBalance', self.initial_balance)
+                self.positions = {key: self._position_from_dict(p) for key, p in state['positions'].items()}
+                self.trades = [self._trade_from_dict(t) for t in state['trades']]
+                self.pnl_history = [(datetime.fromisoformat(t), pnl) for t, pnl in state['pnlHistory']]
+                self.price_history = {
+                    market_id: [(datetime.fromisoformat(t), price) for t, price in points]
+                    for market_id, points in state['priceHistory'].items()
+                }
+            for record in records:
+                self._apply_journal_record(record['type'], record['data'])
         except Exception as e:
-            print(f"Error checking market resolution date: {e}")
-            # On error, default to allowing the market
-            return True
-    
-    def _is_realistic_market(self, market: dict) -> bool:
-        """Filter out joke/unrealistic markets."""
-        question = (market.get('question') or market.get('title') or market.get('name') or '').lower()
-        
-        # List of celebrity names and joke indicators
-        unrealistic_patterns = [
-            # Celebrity names that shouldn't be in serious political markets
-            'mrbeast', 'mr beast', 'lebon james', 'lebron', 'kanye', 'kanye west',
-            'elon musk', 'elon', 'trump', 'donald trump',  # Trump in unrealistic contexts
-            'taylor swift', 'kardashian', 'justin bieber', 'cristiano ronaldo',
-            'messi', 'tom brady', 'serena williams',
-            
-            # Joke indicators
-            'meme', 'joke', 'troll', 'satire', 'parody',
-            'will i', 'will you', 'will we',  # Personal questions
-            'will my', 'will your', 'will our',
-            
-            # Unrealistic political combinations
-            'celebrity.*president', 'celebrity.*nomination', 'youtuber.*president',
-            'athlete.*president', 'musician.*president',
-        ]
-        
-        # Check for unrealistic patterns
-        import re
-        for pattern in unrealistic_patterns:
-            if re.search(pattern, question, re.IGNORECASE):
-                # But allow if it's a "No" bet on something unrealistic (that's actually smart)
-                # We'll filter these out entirely to avoid confusion
-                print(f"Filtered out unrealistic market: {market.get('question', 'Unknown')[:80]}")
-                return False
-        
-        # Additional checks for political markets with celebrities
-        political_keywords = ['president', 'presidential', 'nomination', 'election', 'senate', 'congress', 'governor']
-        has_political = any(keyword in question for keyword in political_keywords)
-        
-        if has_political:
-            # Blocklist of celebrities that shouldn't be in political markets
-            celebrity_blocklist = [
-                'mrbeast', 'mr beast', 'lebron', 'kanye', 'elon musk', 
-                'taylor swift', 'kardashian', 'justin bieber', 'cristiano',
-                'messi', 'tom brady', 'serena', 'oprah', 'dwayne johnson',
-                'the rock', 'mark cuban', 'bill gates', 'warren buffett'
-            ]
-            for celebrity in celebrity_blocklist:
-                if celebrity in question:
-                    print(f"Filtered out celebrity political market: {market.get('question', 'Unknown')[:80]}")
-                    return False
+            # Leave the files untouched for inspection rather than overwrite them
+            print(f"TradingBot: Failed to restore trading journal from {self.journal.state_dir}: {e}")
+            self.journal = None
+            return
         
-        return True
+        if len(self.trades) > 1000:
+            self.trades = self.trades[:1000]
+        self.realized_pnl = self._sum_realized_pnl()
+        self._pnl_dicts = [self._pnl_point_to_dict(t, pnl) for t, pnl in self.pnl_history]
+        self._publish_snapshot(analyses_changed=True)
+        self.journal.start()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"TradingBot: Restored {len(self.positions)} positions, {len(self.trades)} trades "
+              f"(balance ${self.balance:.2f}) from journal in {elapsed_ms:.1f}ms ({len(records)} records replayed)")
     
-    async def _get_outcome_prices(self, market: dict, polymarket_client=None) -> Tuple[Optional[float], Optional[float]]:
-        """Extract Yes and No prices from market data, prioritizing CLOB API tokens."""
-        market_id = market.get('id') or market.get('condition_id') or market.get('question_id')
-        price_yes = None
-        price_no = None
-        
-        # 1. Try CLOB API tokens array first (most accurate)
-        if market.get('tokens') and isinstance(market.get('tokens'), list):
-            for token in market['tokens']:
-                if isinstance(token, dict):
-                    outcome = str(token.get('outcome', '')).upper()
-                    price = token.get('price')
-                    if price is not None:
-                        try:
-                            price_float = float(price)
-                            if 0 < price_float < 1:
-                                if outcome in ['YES', 'YES ']:
-                                    price_yes = price_float
-                                elif outcome in ['NO', 'NO ']:
-                                    price_no = price_float
-                        except (ValueError, TypeError):
-                            continue
-        
-        # 2. Try CLOB API via client if we have condition_id
-        if (price_yes is None or price_no is None) and polymarket_client and hasattr(polymarket_client, 'clob_client') and polymarket_client.clob_client:
-            condition_id = market.get('condition_id') or market.get('conditionId')
-            if condition_id:
-                try:
-                    # Check if get_market is async or sync
-                    import inspect
-                    clob_client = polymarket_client.clob_client
-                    get_market_method = getattr(clob_client, 'get_market', None)
-                    if get_market_method:
-                        if inspect.iscoroutinefunction(get_market_method):
-                            clob_market = await get_market_method(condition_id)
-                        else:
-                            # Sync method - run in thread
-                            clob_market = await asyncio.to_thread(get_market_method, condition_id)
-                        
-                        # Handle different response formats
-                        if clob_market:
-                            tokens = None
-                            if isinstance(clob_market, dict):
-                                tokens = clob_market.get('tokens') or clob_market.get('data', {}).get('tokens')
-                            elif hasattr(clob_market, 'tokens'):
-                                tokens = clob_market.tokens
-                            
-                            if tokens:
-                                for token in tokens:
-                                    if isinstance(token, dict):
-                                        outcome = str(token.get('outcome', '')).strip().upper()
-                                        price = token.get('price')
-                                        if price is not None:
-                                            try:
-                                                price_float = float(price)
-                                                if 0 < price_float < 1:
-                                                    if outcome in ['YES', 'YES ']:
-                                                        price_yes = price_float
-                                                    elif outcome in ['NO', 'NO ']:
-                                                        price_no = price_float
-                                            except (ValueError, TypeError):
-                                                continue
-                except Exception as e:
-                    print(f"Warning: CLOB API price fetch failed for market {market_id}: {e}")
-                    import traceback
-                    traceback.print_exc()
+    def _apply_journal_record(self, event_type: str, data: dict):
+        if event_type == 'open':
+            self.positions[data['key']] = self._position_from_dict(data['position'])
+            self.trades.insert(0, self._trade_from_dict(data['trade']))
+            self.balance = data['balance']
+        elif event_type == 'close':
+            self.positions.pop(data['key'], None)
+            self.trades.insert(0, self._trade_from_dict(data['trade']))
+            self.balance = data['balance']
+        elif event_type == 'position':
+            position = self.positions.get(data['key'])
+            if position:
+                position.current_price = data['currentPrice']
+                position.unrealized_pnl = data['unrealizedPnl']
+        elif event_type == 'pnl':
+            self.pnl_history.append((datetime.fromisoformat(data['timestamp']), data['pnl']))
+            if len(self.pnl_history) > 200:
+                self.pnl_history = self.pnl_history[-200:]
+    
+    @staticmethod
+    def _position_from_dict(data: dict) -> TradingPosition:
+        return TradingPosition(**{**data, 'entry_time': datetime.fromisoformat(data['entry_time'])})
+    
+    @staticmethod
+    def _trade_from_dict(data: dict) -> SimulatedTrade:
+        return SimulatedTrade(**{**data, 'timestamp': datetime.fromisoformat(data['timestamp'])})
+    
+    def _emit(self, event_type: str, data):
+        """Bump the state version and push one event to every subscriber."""
+        self.state_version += 1
+        if not self._subscribers:
+            return
+        message = json.dumps({'type': event_type, 'version': self.state_version, 'data': data})
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Drop the backlog rather than buffer without bound; the reader
+                # catches up from a fresh snapshot instead of replaying every delta
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+    
+    def _emit_stats(self):
+        """Emit a stats event if the dashboard figures changed."""
+        if not self._subscribers:
+            # Nobody is listening; published snapshots compute stats on their own
+            self._last_stats = None
+            self.state_version += 1
+            return
+        stats = self._compute_stats()
+        if stats != self._last_stats:
+            self._last_stats = stats
+            self._emit('stats', stats)
+    
+    def get_dashboard_snapshot(self, trade_limit: int = 100, pnl_limit: int = 100) -> dict:
+        """Stats, positions, recent trades and P&L tail from the published snapshot."""
+        return self.snapshot.to_dashboard(trade_limit, pnl_limit)
+    
+    def current_snapshot(self) -> BotSnapshot:
+        """Snapshot that includes every emitted event, publishing early mid-batch if needed.
+        
+        Stream subscribers need this so no delta falls between their snapshot and
+        their first event; plain API readers use the last published snapshot.
+        """
+        self._publish_snapshot()
+        return self.snapshot
+    
+    def _publish_snapshot(self, analyses_changed: bool = False):
+        """Build a new BotSnapshot and swap it in; called at the end of each mutation batch.
+        
+        Args:
+            analyses_changed: Rebuild market analyses too (they do not bump state_version)
+        """
+        previous = self.snapshot
+        if not analyses_changed and previous.version == self.state_version:
+            return
         
-        # 3. Fallback to outcomes array (Gamma API format)
-        outcomes = market.get('outcomes', [])
+        trade_dicts = {}
+        trades = []
+        for t in self.trades:
+            trade_dict = self._trade_dicts.get(t.id)
+            if trade_dict is None:
+                trade_dict = self._trade_to_dict(t)
+            trade_dicts[t.id] = trade_dict
+            trades.append(trade_dict)
+        self._trade_dicts = trade_dicts
+        
+        analyses = previous.analyses
+        if analyses_changed:
+            analyses = tuple(self._analysis_to_dict(a) for a in self.market_analyses.values())
+        
+        # A single attribute assignment, so readers see either the old or the new snapshot
+        self.snapshot = BotSnapshot(
+            version=self.state_version,
+            stats=self._compute_stats(),
+            positions=tuple(self._position_to_dict(p) for p in self.positions.values()),
+            trades=tuple(trades),
+            pnl_history=tuple(self._pnl_dicts),
+            analyses=analyses,
+        )
+    
+    def _normalize(self, markets: List[dict]) -> List[Market]:
+        """Normalize fetched market dicts into Market records, indexing their end dates."""
+        return normalize_markets(markets, self.end_dates, self.prices)
+    
+    def _is_market_in_resolution_window(self, market: Market) -> bool:
+        """Check if market resolves in 1-4 weeks (7-28 days)."""
+        end_timestamp = market.end_ts
+        if end_timestamp == UNDATED:
+            # If no end date, check if it's a short-term market based on question
+            return undated_question_is_short_term(market.question.lower())
+        if end_timestamp is None:
+            return True  # If we can't parse, allow it
+        
+        days_until_resolution = math.floor((end_timestamp - self.clock.time()) / 86400)
+        min_days, max_days = RESOLUTION_WINDOW_DAYS
+        return min_days <= days_until_resolution <= max_days
+    
+    def _resolution_window_ids(self, markets: List[Market]) -> Set[str]:
+        """Ids of the markets that resolve in the window, via a range query on the end-date index."""
+        now = self.clock.time()
+        min_days, max_days = RESOLUTION_WINDOW_DAYS
+        # Whole days in [min_days, max_days] <=> end time in [now + min_days, now + max_days + 1) days
+        window_ids = set(self.end_dates.between(now + min_days * 86400, now + (max_days + 1) * 86400))
+        for market in markets:
+            if (market.end_ts is None or market.end_ts == UNDATED) and self._is_market_in_resolution_window(market):
+                window_ids.add(market.id)
+        return window_ids
+    
+    def _is_realistic_market(self, market: Market) -> bool:
+        """Filter out joke/unrealistic markets (memoized per question)."""
+        realistic = self._realistic_questions.get(market.question)
+        if realistic is None:
+            realistic = self._classify_question(market.question.lower())
+            if len(self._realistic_questions) >= REALISTIC_CACHE_SIZE:
+                self._realistic_questions.clear()
+            self._realistic_questions[market.question] = realistic
+        return realistic
+    
+    @staticmethod
+    def _classify_question(question: str) -> bool:
+        """Classify a lowercased question; logs each rejected question once."""
+        if _UNREALISTIC_RE.search(question):
+            # A "No" bet on something unrealistic could be smart, but we filter
+            # these out entirely to avoid confusion
+            print(f"Filtered out unrealistic market: {question[:80]}")
+            return False
+        
+        # Additional check for political markets with celebrities
+        if _POLITICAL_RE.search(question) and _POLITICAL_CELEBRITY_RE.search(question):
+            print(f"Filtered out celebrity political market: {question[:80]}")
+            return False
         
-        if outcomes and len(outcomes) >= 2:
-            # Try to get prices from outcomes array
-            for outcome in outcomes:
-                if not isinstance(outcome, dict):
-                    continue
-                
-                outcome_name = str(outcome.get('outcome', outcome.get('title', outcome.get('name', '')))).upper()
-                
-                # Try multiple price field names
-                price = None
-                for price_field in ['price', 'newestPrice', 'lastPrice', 'currentPrice', 'yesPrice', 'noPrice']:
-                    if price_field in outcome:
-                        try:
-                            price = float(outcome[price_field])
-                            if 0 < price < 1:
-                                break
-                        except (ValueError, TypeError):
-                            continue
-                
-                # If no price found in outcome, try market-level fields
-                if price is None:
-                    for price_field in ['newestPrice', 'price', 'lastPrice', 'currentPrice']:
-                        if price_field in market:
-                            try:
-                                price = float(market[price_field])
-                                if 0 < price < 1:
-                                    break
-                            except (ValueError, TypeError):
-                                continue
-                
-                if price is not None and 0 < price < 1:
-                    if 'YES' in outcome_name or outcome_name == 'YES':
-                        price_yes = price
-                    elif 'NO' in outcome_name or outcome_name == 'NO':
-                        price_no = price
-                    # If we can't determine which outcome, use order (first = Yes, second = No)
-                    elif price_yes is None:
-                        price_yes = price
-                    elif price_no is None:
-                        price_no = price
-        
-        # Fallback: use main market price fields
-        if price_yes is None:
-            for price_field in ['newestPrice', 'price', 'lastPrice', 'currentPrice', 'yesPrice']:
-                if price_field in market:
-                    try:
-                        price_yes = float(market[price_field])
-                        if 0 < price_yes < 1:
-                            break
-                    except (ValueError, TypeError):
-                        continue
+        return True
+    
+    async def _get_outcome_prices(self, market: Market, polymarket_client=None) -> Tuple[Optional[float], Optional[float]]:
+        """Yes and No prices for a market: its normalized prices, else the CLOB API via condition_id."""
+        if market.has_prices:
+            return market.price_yes, market.price_no
         
-        # Calculate No price from Yes price if we have it
-        if price_yes is not None and price_no is None:
-            price_no = 1.0 - price_yes
-        elif price_no is not None and price_yes is None:
-            price_yes = 1.0 - price_no
+        price_yes = price_no = None
+        if market.condition_id:
+            price_yes, price_no = await self._clob_outcome_prices(market.condition_id, polymarket_client)
         
-        # Final fallback: if we still don't have prices, return None to skip this market
         if price_yes is None or price_no is None:
             # Log warning but don't use default 0.5 - skip this market instead
-            print(f"Warning: Could not extract prices for market {market.get('id', 'unknown')}. Skipping.")
+            print(f"Warning: Could not extract prices for market {market.id}. Skipping.")
             return None, None
         
         return price_yes, price_no
     
-    async def analyze_market(self, market: dict) -> MarketAnalysis:
-        """Analyze a market with realistic trading strategies."""
-        # Handle both CLOB (condition_id) and Gamma (id) formats
-        market_id = market.get('id') or market.get('condition_id') or market.get('question_id') or ''
-        volume = float(market.get('volumeNum', market.get('volume', 0)))
-        liquidity = float(market.get('liquidityNum', market.get('liquidity', 0)))
-        volume_24h = float(market.get('volume24h', volume))
+    async def _clob_outcome_prices(self, condition_id: str, polymarket_client) -> Tuple[Optional[float], Optional[float]]:
+        """Yes and No prices from the CLOB API, reused for the extractor's CLOB TTL.
         
-        # Debug: Log volume data to see if it's being preserved
-        if volume > 0 or liquidity > 0:
-            print(f"  Analyzing market {market_id[:20]}...: volume={volume:.0f}, liquidity={liquidity:.0f}, volume_24h={volume_24h:.0f}")
+        Returns:
+            (price_yes, price_no), both None if there is no CLOB client or no price
+        """
+        if not polymarket_client or not getattr(polymarket_client, 'clob_client', None):
+            return None, None
+        cached = self.prices.clob_prices(condition_id, self.clock.time())
+        if cached is not None:
+            return cached
+        
+        started = time.perf_counter()
+        price_yes = price_no = None
+        try:
+            clob_market = await polymarket_client.clob_client.get_market(condition_id)
+            
+            # Handle different response formats
+            tokens = None
+            if isinstance(clob_market, dict):
+                tokens = clob_market.get('tokens') or clob_market.get('data', {}).get('tokens')
+            elif hasattr(clob_market, 'tokens'):
+                tokens = clob_market.tokens
+            price_yes, price_no = complete_prices(*token_prices(tokens))
+        except Exception as e:
+            print(f"Warning: CLOB API price fetch failed for condition {condition_id}: {e!r}")
+            import traceback
+            traceback.print_exc()
+        
+        # Failed lookups are cached too, so a dead market is not re-queried every loop
+        self.prices.store_clob_prices(condition_id, (price_yes, price_no), self.clock.time(),
+                                      time.perf_counter() - started)
+        return price_yes, price_no
+    
+    def _record_price(self, market_id: str, price_yes: float, price_no: float, volume_24h: float):
+        """Record an observed price in the tick recorder and the market's price history."""
+        if self.tick_recorder:
+            self.tick_recorder.record(market_id, price_yes, price_no, volume_24h, timestamp=self.clock.time())
+        
+        # Track price history for momentum calculation
+        if market_id not in self.price_history:
+            self.price_history[market_id] = []
+        
+        current_time = self.clock.now()
+        self.price_history[market_id].append((current_time, price_yes))
+        # Keep only last 20 price points
+        self.price_history[market_id] = self.price_history[market_id][-20:]
+    
+    def _history_settled(self, market_id: str, price_yes: float) -> bool:
+        """True if the momentum/trend window already holds only this price, so recording it again changes no signal."""
+        history = self.price_history.get(market_id)
+        return history is not None and len(history) >= 5 and all(p == price_yes for _, p in history[-5:])
+    
+    def _reuse_analysis(self, market_id: str, fingerprint: tuple) -> Optional[MarketAnalysis]:
+        """The market's previous analysis if its inputs are unchanged and its price signals are flat."""
+        cached = self._analysis_cache.get(market_id)
+        if cached is None or cached[0] != fingerprint:
+            return None
+        price_yes, price_no, _, _, volume_24h, _ = fingerprint
+        if price_yes is not None:
+            if not self._history_settled(market_id, price_yes):
+                return None
+            self._record_price(market_id, price_yes, price_no, volume_24h)
+        self.analyses_reused += 1
+        return cached[1]
+    
+    def _cache_analysis(self, fingerprint: tuple, analysis: MarketAnalysis) -> MarketAnalysis:
+        self.analyses_computed += 1
+        if analysis.market_id not in self._analysis_cache and len(self._analysis_cache) >= ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.clear()
+        self._analysis_cache[analysis.market_id] = (fingerprint, analysis)
+        return analysis
+    
+    def _analysis_counts(self, since: Optional[dict] = None) -> dict:
+        """Analyses computed and reused so far, or since an earlier result, with the reuse (skip) rate."""
+        computed, reused = self.analyses_computed, self.analyses_reused
+        if since is not None:
+            computed -= since['computed']
+            reused -= since['reused']
+        total = computed + reused
+        return {'computed': computed, 'reused': reused, 'skipRate': reused / total if total else 0.0}
+    
+    async def analyze_market(self, market: Market) -> MarketAnalysis:
+        """Analyze a market with realistic trading strategies.
+        
+        A market whose prices, volume and liquidity (and the strategy params) match
+        its previous analysis, and whose recent price history is flat at that price,
+        would score identically: the previous analysis is returned, with only the
+        price observation recorded again.
+        """
+        market_id = market.id
+        volume = market.volume
+        liquidity = market.liquidity
+        volume_24h = market.volume_24h
         
         # Get Yes/No prices
         price_yes, price_no = await self._get_outcome_prices(market, self.polymarket_client)
         
+        fingerprint = (price_yes, price_no, volume, liquidity, volume_24h, self.params)
+        reused = self._reuse_analysis(market_id, fingerprint)
+        if reused is not None:
+            return reused
+        
+        # Debug: Log volume data to see if it's being preserved
+        if volume > 0 or liquidity > 0:
+            print(f"  Analyzing market {market_id[:20]}...: volume={volume:.0f}, liquidity={liquidity:.0f}, volume_24h={volume_24h:.0f}")
+        
         # Skip if we couldn't get prices
         if price_yes is None or price_no is None:
             # Still return analysis but with default prices and a base score
@@ -421,12 +714,12 @@ class TradingBot:
             price_yes = 0.5
             price_no = 0.5
             # Calculate a minimal score based on volume/liquidity only
-            volume_factor = min(1.0, volume_24h / 50000) if volume_24h > 0 else 0.3
+            volume_factor = min(1.0, volume_24h / self.params.volume_full_factor) if volume_24h > 0 else 0.3
             liquidity_score = min(20, liquidity / 1000) if liquidity > 0 else 10
             base_score = 5
             minimal_score = base_score + (volume_factor * 30) + liquidity_score
             
-            return MarketAnalysis(
+            return self._cache_analysis(fingerprint, MarketAnalysis(
                 market_id=market_id,
                 volume=volume,
                 liquidity=liquidity,
@@ -442,16 +735,9 @@ class TradingBot:
                 liquidity_depth=liquidity,
                 volume_score=(volume_factor * 50) + (liquidity_score * 1.5),
                 context_score=minimal_score
-            )
+            ))
         
-        # Track price history for momentum calculation
-        if market_id not in self.price_history:
-            self.price_history[market_id] = []
-        
-        current_time = datetime.now()
-        self.price_history[market_id].append((current_time, price_yes))
-        # Keep only last 20 price points
-        self.price_history[market_id] = self.price_history[market_id][-20:]
+        self._record_price(market_id, price_yes, price_no, volume_24h)
         
         # Calculate momentum from price history
         momentum = 0.0
@@ -471,12 +757,13 @@ class TradingBot:
             trend = (avg_short - avg_medium) * 10  # Amplify for signal
         
         # Arbitrage detection: Check if Yes + No != 1.0 (with tolerance for fees)
+        params = self.params
         arbitrage_opportunity = None
         price_sum = price_yes + price_no
-        if price_sum < 0.98:  # Arbitrage exists if sum < 0.98 (2% fee buffer)
+        if price_sum < params.arbitrage_max_price_sum:  # Arbitrage exists if sum < 0.98 (2% fee buffer)
             # We can buy both outcomes for less than $1, guaranteed profit
             arbitrage_profit = (1.0 - price_sum) * 100  # Percentage profit
-            if arbitrage_profit > 0.5:  # Only if profit > 0.5%
+            if arbitrage_profit > params.arbitrage_min_profit_pct:  # Only if profit > 0.5%
                 arbitrage_opportunity = arbitrage_profit
         
         # Calculate spread (bid-ask difference)
@@ -494,7 +781,7 @@ class TradingBot:
         # Handle zero volume (CLOB API doesn't provide volume data)
         # When volume is 0, use a default volume_factor to still allow trading
         if volume_24h > 0:
-            volume_factor = min(1.0, volume_24h / 50000)  # Normalize: $50k = full factor
+            volume_factor = min(1.0, volume_24h / params.volume_full_factor)  # Normalize: $50k = full factor
         else:
             # CLOB API: no volume data, but still allow trading based on price signals
             volume_factor = 0.3  # Default to 30% to allow some volume-based scoring
@@ -534,12 +821,15 @@ class TradingBot:
             
             # Mean reversion: Give score based on price position (always give some score)
             mean_reversion_score = 0
-            if 0.25 < price_yes < 0.45 or 0.55 < price_yes < 0.75:
-                mean_reversion_score = 12  # Mild reversion opportunity
-            elif 0.2 < price_yes < 0.3 or 0.7 < price_yes < 0.8:
-                mean_reversion_score = 18  # Moderate reversion opportunity
-            elif price_yes < 0.2 or price_yes > 0.8:
-                mean_reversion_score = 25  # Strong reversion opportunity
+            mild_low, mild_high = params.mean_reversion_mild_band
+            moderate_low, moderate_high = params.mean_reversion_moderate_band
+            strong_edge = params.mean_reversion_strong_edge
+            if mild_low < price_yes < mild_high or 1 - mild_high < price_yes < 1 - mild_low:
+                mean_reversion_score = params.mean_reversion_mild_score  # Mild reversion opportunity
+            elif moderate_low < price_yes < moderate_high or 1 - moderate_high < price_yes < 1 - moderate_low:
+                mean_reversion_score = params.mean_reversion_moderate_score  # Moderate reversion opportunity
+            elif price_yes < strong_edge or price_yes > 1 - strong_edge:
+                mean_reversion_score = params.mean_reversion_strong_score  # Strong reversion opportunity
             else:
                 # Price is around 0.5 - still give some score based on distance from 0.5
                 mean_reversion_score = abs(price_yes - 0.5) * 30  # Up to 15 points
@@ -582,7 +872,7 @@ class TradingBot:
             # For context_score, keep it positive
             context_score_value = abs(context_score_value)
         
-        return MarketAnalysis(
+        return self._cache_analysis(fingerprint, MarketAnalysis(
             market_id=market_id,
             volume=volume,
             liquidity=liquidity,
@@ -598,238 +888,147 @@ class TradingBot:
             liquidity_depth=liquidity,
             volume_score=volume_score_value,
             context_score=context_score_value
-        )
+        ))
     
-    async def _enrich_markets_with_clob_prices(self, markets: List[dict], polymarket_client) -> List[dict]:
+    async def _enrich_markets_with_clob_prices(self, markets: List[Market], polymarket_client) -> List[Market]:
         """Enrich Gamma API markets with accurate prices from CLOB API.
-        Keeps Gamma volume/liquidity data but uses CLOB for accurate prices."""
-        if not polymarket_client or not hasattr(polymarket_client, 'clob_client') or not polymarket_client.clob_client:
+        Keeps Gamma volume/liquidity data but uses CLOB for accurate prices.
+        
+        All YES/NO token ids are priced in bulk: one midpoints request, then one
+        best-bid request for tokens without a midpoint (empty books), merged back
+        by token id. Markets without token ids or CLOB prices are left as-is.
+        """
+        clob_client = getattr(polymarket_client, 'clob_client', None) if polymarket_client else None
+        if not clob_client:
             # No CLOB client available, return markets as-is
             return markets
         
-        enriched_markets = []
-        enriched_count = 0
+        token_ids = [t for m in markets for t in (m.yes_token_id, m.no_token_id) if t]
+        if not token_ids:
+            return markets
         
-        # Process markets in batches to avoid overwhelming the API
-        batch_size = 20
-        for i in range(0, len(markets), batch_size):
-            batch = markets[i:i + batch_size]
-            
-            # Process batch concurrently
-            tasks = []
-            for market in batch:
-                tasks.append(self._enrich_single_market(market, polymarket_client))
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for market, result in zip(batch, results):
-                if isinstance(result, Exception):
-                    # If enrichment failed, keep original market with Gamma prices
-                    print(f"Warning: Could not enrich market {market.get('id')} with CLOB prices: {result}")
-                    enriched_markets.append(market)
-                else:
-                    enriched_markets.append(result)
-                    if result.get('_clob_enriched'):
-                        enriched_count += 1
-            
-            # Small delay between batches to avoid rate limiting
-            if i + batch_size < len(markets):
-                await asyncio.sleep(0.5)
+        started = time.perf_counter()
+        requests = 1
+        try:
+            prices = dict(await clob_client.get_midpoints(token_ids))
+            missing = [t for t in token_ids if prices.get(t) is None]
+            if missing:
+                requests += 1
+                for token_id, quote in (await clob_client.get_prices(missing, side="BUY")).items():
+                    prices[token_id] = quote.get("BUY") if isinstance(quote, dict) else quote
+        except Exception as e:
+            print(f"Warning: Bulk CLOB price fetch failed, keeping Gamma prices: {e!r}")
+            return markets
         
+        enriched_count = 0
+        for market in markets:
+            if market.merge_token_prices(prices.get(market.yes_token_id), prices.get(market.no_token_id)):
+                enriched_count += 1
+        
+        self.cycle_metrics['enrichment'] = {
+            'markets': len(markets),
+            'tokens': len(token_ids),
+            'enriched': enriched_count,
+            'requests': requests,
+            'totalMs': (time.perf_counter() - started) * 1000,
+        }
         print(f"Enriched {enriched_count}/{len(markets)} markets with CLOB prices")
-        return enriched_markets
+        return markets
     
-    async def _enrich_single_market(self, market: dict, polymarket_client) -> dict:
-        """Enrich a single market with CLOB API prices."""
-        condition_id = market.get('condition_id') or market.get('conditionId')
-        market_id = market.get('id')
-        
-        # Try to get condition_id from market ID if not present
-        if not condition_id and market_id:
-            # Some Gamma API markets use market_id as condition_id
-            condition_id = market_id
-        
-        # If we have condition_id, fetch prices from CLOB
-        if condition_id and polymarket_client.clob_client:
-            try:
-                clob_market = await polymarket_client.clob_client.get_market(condition_id)
-                if clob_market:
-                    # Handle different CLOB response formats
-                    tokens = None
-                    if isinstance(clob_market, dict):
-                        tokens = clob_market.get('tokens') or clob_market.get('data', {}).get('tokens')
-                    elif hasattr(clob_market, 'tokens'):
-                        tokens = clob_market.tokens
-                    
-                    if tokens:
-                        # Update market with CLOB prices while EXPLICITLY preserving Gamma volume data
-                        market = market.copy()  # Don't modify original
-                        
-                        # EXPLICITLY preserve volume/liquidity fields from Gamma API
-                        preserved_volume = market.get('volumeNum', market.get('volume', 0))
-                        preserved_liquidity = market.get('liquidityNum', market.get('liquidity', 0))
-                        preserved_volume_24h = market.get('volume24h', preserved_volume)
-                        
-                        # Update tokens array (don't overwrite, append if needed)
-                        if 'tokens' not in market:
-                            market['tokens'] = []
-                        else:
-                            # Keep existing tokens if any, but we'll add CLOB tokens
-                            market['tokens'] = market.get('tokens', [])
-                        
-                        for token in tokens:
-                            if isinstance(token, dict):
-                                outcome = token.get('outcome', '')
-                                price = token.get('price')
-                                
-                                if price is not None:
-                                    try:
-                                        price_float = float(price)
-                                        if 0 < price_float < 1:
-                                            # Check if token already exists
-                                            existing_token = next((t for t in market['tokens'] if isinstance(t, dict) and t.get('outcome', '').upper() == outcome.upper()), None)
-                                            if not existing_token:
-                                                market['tokens'].append({
-                                                    'outcome': outcome,
-                                                    'price': price_float
-                                                })
-                                            
-                                            # Update direct price fields for compatibility
-                                            if outcome.upper() in ['YES', 'YES ']:
-                                                market['newestPrice'] = price_float
-                                                market['price'] = price_float
-                                                market['yesPrice'] = price_float
-                                            elif outcome.upper() in ['NO', 'NO ']:
-                                                market['noPrice'] = price_float
-                                    except (ValueError, TypeError):
-                                        continue
-                        
-                        # RESTORE volume/liquidity fields to ensure they're preserved
-                        market['volumeNum'] = preserved_volume
-                        market['volume'] = preserved_volume
-                        market['liquidityNum'] = preserved_liquidity
-                        market['liquidity'] = preserved_liquidity
-                        market['volume24h'] = preserved_volume_24h
-                        
-                        market['_clob_enriched'] = True
-                        return market
-            except Exception as e:
-                # If CLOB fetch fails, keep Gamma prices
-                pass
-        
-        # If enrichment failed, return original market (with volume data intact)
-        market['_clob_enriched'] = False
-        return market
+    async def _discovery_fetch(self, source: str, fetch) -> Tuple[str, List[Market]]:
+        """Run one discovery request and normalize its markets."""
+        try:
+            return source, self._normalize(await fetch())
+        except Exception as e:
+            print(f"Error fetching {source} markets: {e}")
+            return source, []
     
-    async def _fetch_markets_expanded(self, polymarket_client) -> List[dict]:
+    def _accept_discovered(self, source: str, market: Market, window_ids: Set[str]) -> bool:
+        """Whether a market found by a discovery source qualifies for the expanded list."""
+        if source == 'trending':
+            return market.id in window_ids
+        # Only include short-term markets
+        if not self._is_market_in_resolution_window(market):
+            return False
+        if source == 'liquidity':
+            # Allow CLOB markets (liquidity == 0) or high liquidity markets
+            return market.liquidity > 2000 or market.liquidity == 0
+        # Keyword search: reasonable volume or liquidity OR volume/liquidity is 0 (CLOB API)
+        return market.volume > 500 or market.liquidity > 800 or (market.volume == 0 and market.liquidity == 0)
+    
+    async def _fetch_markets_expanded(self, polymarket_client) -> List[Market]:
         """Fetch markets using multiple strategies, prioritizing trending and short-term markets.
-        Uses Gamma API for volume data, then enriches with CLOB API for accurate prices."""
-        all_markets = {}
-        market_ids_seen = set()
+        
+        The trending and high-liquidity pages and the keyword searches are issued
+        concurrently. Results are deduplicated by market id as they arrive; whatever
+        has not arrived by discovery_deadline is dropped.
+        
+        Not called by the bot's loops, so its requests do not go through upstream_limiter.
+        """
+        all_markets: Dict[str, Market] = {}
         
         try:
+            print(f"Discovering markets from Gamma API ({2 + len(DISCOVERY_KEYWORDS)} concurrent requests)...")
             # Strategy 1: Trending markets (high volume, recent activity) - PRIORITY
-            # Use Gamma API - it has BOTH volume AND prices
-            print("Fetching trending markets from Gamma API...")
-            volume_markets = await polymarket_client.get_markets(limit=300, offset=0, use_clob=False)
-            
-            # Separate markets by resolution window
-            short_term_markets = []
-            other_markets = []
-            
-            for market in volume_markets:
-                market_id = market.get('id')
-                if market_id and market_id not in market_ids_seen:
-                    if self._is_market_in_resolution_window(market):
-                        short_term_markets.append(market)
-                    else:
-                        other_markets.append(market)
-                    market_ids_seen.add(market_id)
-            
-            # Prioritize short-term markets - add them first
-            for market in short_term_markets:
-                all_markets[market.get('id')] = market
-            
-            print(f"Found {len(short_term_markets)} short-term markets (1-2 weeks), {len(other_markets)} long-term markets")
-            
-            # Strategy 2: High liquidity markets - ONLY short-term
-            print("Fetching high liquidity short-term markets from Gamma API...")
-            try:
-                # Fetch with higher offset to get different markets
-                liquidity_markets = await polymarket_client.get_markets(limit=150, offset=100, use_clob=False)
-                short_term_count = 0
-                for market in liquidity_markets:
-                    market_id = market.get('id')
-                    if market_id and market_id not in market_ids_seen:
-                        # Only include if it's in resolution window
-                        if self._is_market_in_resolution_window(market):
-                            liquidity = float(market.get('liquidityNum', market.get('liquidity', 0)))
-                            # Allow CLOB markets (liquidity == 0) or high liquidity markets
-                            if liquidity > 2000 or liquidity == 0:
-                                all_markets[market_id] = market
-                                market_ids_seen.add(market_id)
-                                short_term_count += 1
-                print(f"Found {short_term_count} additional short-term liquidity markets")
-            except Exception as e:
-                print(f"Error fetching liquidity markets: {e}")
-            
-            # Strategy 3: Search for trending keywords to find active markets
-            trending_searches = [
-                "2024", "2025", "election", "president", "crypto", "bitcoin", "ethereum",
-                "sports", "nfl", "nba", "soccer", "football", "basketball",
-                "politics", "economy", "stock", "market", "tech", "AI"
+            # Strategy 2: High liquidity markets (higher offset to get different markets) - ONLY short-term
+            # Strategy 3: Search for trending keywords to find active markets - ONLY short-term
+            requests = [
+                self._discovery_fetch('trending', lambda: polymarket_client.get_markets(limit=300, offset=0, use_clob=False)),
+                self._discovery_fetch('liquidity', lambda: polymarket_client.get_markets(limit=150, offset=100, use_clob=False)),
+            ] + [
+                self._discovery_fetch(f"search '{keyword}'",
+                                      lambda keyword=keyword: polymarket_client.search_markets(keyword, limit=30))
+                for keyword in DISCOVERY_KEYWORDS
             ]
-            
-            print(f"Searching for short-term markets by trending keywords...")
-            for keyword in trending_searches[:8]:  # Limit to avoid too many requests
-                try:
-                    searched_markets = await polymarket_client.search_markets(keyword, limit=30)
-                    short_term_count = 0
-                    for market in searched_markets:
-                        market_id = market.get('id')
-                        if market_id and market_id not in market_ids_seen:
-                            # Only include short-term markets
-                            if self._is_market_in_resolution_window(market):
-                                volume = float(market.get('volumeNum', market.get('volume', 0)))
-                                liquidity = float(market.get('liquidityNum', market.get('liquidity', 0)))
-                                # Include if it has reasonable volume or liquidity OR if volume/liquidity is 0 (CLOB API)
-                                if volume > 500 or liquidity > 800 or (volume == 0 and liquidity == 0):
-                                    all_markets[market_id] = market
-                                    market_ids_seen.add(market_id)
-                                    short_term_count += 1
-                    if short_term_count > 0:
-                        print(f"Found {short_term_count} short-term markets for '{keyword}'")
-                    await asyncio.sleep(0.5)  # Rate limiting between searches
-                except Exception as e:
-                    print(f"Error searching for '{keyword}': {e}")
-                    continue
+            pending = {asyncio.ensure_future(request) for request in requests}
+            deadline = asyncio.ensure_future(self.clock.sleep(self.discovery_deadline))
+            try:
+                while pending:
+                    done, _ = await asyncio.wait(pending | {deadline}, return_when=asyncio.FIRST_COMPLETED)
+                    if deadline in done:
+                        print(f"Market discovery deadline reached; dropping {len(pending)} pending requests")
+                        break
+                    for task in done:
+                        pending.discard(task)
+                        source, markets = task.result()
+                        window_ids = self._resolution_window_ids(markets) if source == 'trending' else set()
+                        added = 0
+                        for market in markets:
+                            if market.id not in all_markets and self._accept_discovered(source, market, window_ids):
+                                all_markets[market.id] = market
+                                added += 1
+                        if added:
+                            print(f"Found {added} short-term markets from {source}")
+            finally:
+                for task in pending:
+                    task.cancel()
+                deadline.cancel()
             
             print(f"Total unique markets found: {len(all_markets)}")
             
             # Convert to list and sort by combined score (volume + liquidity)
             # Prioritize trending markets (high volume/activity)
             markets_list = list(all_markets.values())
+            window_ids = self._resolution_window_ids(markets_list)
             markets_list.sort(
                 key=lambda x: (
                     # Prioritize by volume (trending indicator)
-                    float(x.get('volumeNum', 0) or x.get('volume', 0) or 0) * 1.5 +  # Volume weighted more
-                    float(x.get('liquidityNum', 0) or x.get('liquidity', 0) or 0) * 0.5 +
+                    x.volume * 1.5 +  # Volume weighted more
+                    x.liquidity * 0.5 +
                     # Bonus for markets resolving soon (within 10 days)
-                    (10 if self._is_market_in_resolution_window(x) else 0) * 1000
+                    (10 if x.id in window_ids else 0) * 1000
                 ),
                 reverse=True
             )
             
             # Log summary
-            short_term_count = sum(1 for m in markets_list if self._is_market_in_resolution_window(m))
+            short_term_count = sum(1 for m in markets_list if m.id in window_ids)
             print(f"Total markets after filtering: {len(markets_list)} ({short_term_count} short-term 1-2 weeks)")
             
             # Gamma API already has both volume and prices - no need to enrich
             if markets_list:
                 sample_market = markets_list[0]
-                sample_volume = float(sample_market.get('volumeNum', sample_market.get('volume', 0)))
-                sample_liquidity = float(sample_market.get('liquidityNum', sample_market.get('liquidity', 0)))
-                print(f"  Sample market: volume={sample_volume:.0f}, liquidity={sample_liquidity:.0f}")
+                print(f"  Sample market: volume={sample_market.volume:.0f}, liquidity={sample_market.liquidity:.0f}")
             
             return markets_list
             
@@ -838,157 +1037,136 @@ class TradingBot:
             import traceback
             traceback.print_exc()
             # Fallback to basic fetch (Gamma API has everything)
-            return await polymarket_client.get_markets(limit=100, offset=0, use_clob=False)
+            return self._normalize(await polymarket_client.get_markets(limit=100, offset=0, use_clob=False))
     
     async def _trading_loop(self, polymarket_client):
-        """Main trading loop that runs continuously."""
+        """Main trading loop: a market fetch stage feeding the trading stage.
+        
+        The stages run concurrently, joined by a bounded queue, so the next batch
+        of markets is fetched and priced while the current one is analyzed and
+        traded. While the queue is full the fetch stage waits instead of fetching,
+        so a batch is at most one trading cycle old when it is picked up.
+        """
         debug_mode = os.getenv("DEBUG", "false").lower() == "true"
         if debug_mode:
             print("=" * 60)
             print("TRADING LOOP STARTED")
             print("=" * 60)
-        cycle_count = 0
-        while self.is_running:
+        batches: asyncio.Queue = asyncio.Queue(maxsize=MARKET_BATCH_QUEUE_SIZE)
+        slots = asyncio.Semaphore(MARKET_BATCH_QUEUE_SIZE)
+        fetcher = asyncio.create_task(self._market_fetch_stage(polymarket_client, batches, slots))
+        try:
+            await self._trading_stage(batches, slots)
+        finally:
+            fetcher.cancel()
+    
+    async def _fetch_trading_markets(self, polymarket_client, cycle_count: int) -> List[Market]:
+        """Fetch, normalize and price one batch of markets for the trading stage."""
+        # Initialize CLOB client if not already done
+        if not self._clob_initialized:
+            await self._initialize_clob_client()
+        
+        # Fetch markets from CLOB API
+        markets = []
+        debug_mode = os.getenv("DEBUG", "false").lower() == "true"
+        if self.clob_client:
             try:
-                cycle_count += 1
-                
-                # Initialize CLOB client if not already done
-                if not self._clob_initialized:
-                    await self._initialize_clob_client()
+                if debug_mode:
+                    print(f"Fetching markets from CLOB API (cycle {cycle_count})...")
+                async with self.upstream_limiter:
+                    clob_response = await self.clob_client.get_markets()
                 
-                # Fetch markets from CLOB API
-                markets = []
-                debug_mode = os.getenv("DEBUG", "false").lower() == "true"
-                if self.clob_client:
-                    try:
-                        if debug_mode:
-                            print(f"Fetching markets from CLOB API (cycle {cycle_count})...")
-                        clob_response = await self.clob_client.get_markets()
-                        
-                        if hasattr(clob_response, 'data') and isinstance(clob_response.data, list):
-                            markets = clob_response.data
-                        elif isinstance(clob_response, dict) and 'data' in clob_response:
-                            markets = clob_response['data']
-                        elif isinstance(clob_response, list):
-                            markets = clob_response
-                        else:
-                            if debug_mode:
-                                print(f"Unexpected CLOB response format: {type(clob_response)}, falling back to Gamma API")
-                            markets = await polymarket_client.get_markets(limit=200, offset=0, use_clob=False)
-                    except Exception as e:
-                        if debug_mode:
-                            print(f"Error fetching from CLOB API: {e}, falling back to Gamma API")
-                            import traceback
-                            traceback.print_exc()
-                        markets = await polymarket_client.get_markets(limit=200, offset=0, use_clob=False)
+                if hasattr(clob_response, 'data') and isinstance(clob_response.data, list):
+                    markets = clob_response.data
+                elif isinstance(clob_response, dict) and 'data' in clob_response:
+                    markets = clob_response['data']
+                elif isinstance(clob_response, list):
+                    markets = clob_response
                 else:
-                    markets = await polymarket_client.get_markets(limit=200, offset=0, use_clob=False)
-                
-                if not markets:
                     if debug_mode:
-                        print("WARNING: No markets fetched from Polymarket API")
-                    await asyncio.sleep(10)
-                    continue
-                
+                        print(f"Unexpected CLOB response format: {type(clob_response)}, falling back to Gamma API")
+                    async with self.upstream_limiter:
+                        markets = await polymarket_client.get_markets(limit=200, offset=0, use_clob=False)
+            except Exception as e:
                 if debug_mode:
-                    print(f"Fetched {len(markets)} markets from Polymarket")
-                    print(f"Analyzing {len(markets)} markets for trading opportunities...")
-                
-                # Analyze all fetched markets, prioritizing short-term trending markets
-                analyzed_count = 0
-                short_term_analyzed = 0
-                
-                for market in markets:
-                    try:
-                        # Filter out unrealistic/joke markets
-                        if not self._is_realistic_market(market):
-                            continue
-                        
-                        # CRITICAL: Only analyze markets that resolve in 1-2 weeks
-                        # TEMPORARILY RELAXED: Allow markets up to 4 weeks for testing
-                        resolution_ok = self._is_market_in_resolution_window(market)
-                        # Also allow markets resolving in 2-4 weeks for more opportunities
-                        if not resolution_ok:
-                            # Check if market resolves in 2-4 weeks as fallback
-                            try:
-                                end_date_str = market.get('end_date_iso') or market.get('endDate') or market.get('end_date') or market.get('endDateISO8601')
-                                if end_date_str:
-                                    # Reject markets clearly in 2026+ (over a year away)
-                                    end_date_str_lower = str(end_date_str).lower()
-                                    if '2026' in end_date_str_lower or '2027' in end_date_str_lower or '2028' in end_date_str_lower:
-                                        resolution_ok = False
-                                    else:
-                                        if 'T' in str(end_date_str) or str(end_date_str).endswith('Z'):
-                                            end_date = datetime.fromisoformat(str(end_date_str).replace('Z', '+00:00'))
-                                        else:
-                                            end_date = datetime.strptime(str(end_date_str).split('T')[0], '%Y-%m-%d')
-                                        now = datetime.now(end_date.tzinfo) if end_date.tzinfo else datetime.now()
-                                        days_until_resolution = (end_date - now).days
-                                        if 7 <= days_until_resolution <= 28:  # 1-4 weeks
-                                            resolution_ok = True
-                                        elif days_until_resolution > 365:  # Over a year
-                                            resolution_ok = False
-                            except Exception as e:
-                                # On error, be conservative and skip
-                                resolution_ok = False
-                        
-                        if not resolution_ok:
-                            continue  # Skip long-term markets
-                        
-                        # Filter: only analyze markets with minimum volume/liquidity (very relaxed)
-                        # NOTE: After enrichment, markets should have Gamma volume data + CLOB prices
-                        volume = float(market.get('volumeNum', market.get('volume', 0)))
-                        liquidity = float(market.get('liquidityNum', market.get('liquidity', 0)))
-                        
-                        # Debug: Log first few markets being analyzed
-                        if analyzed_count < 3:
-                            print(f"  Market {market.get('id', 'unknown')[:30]}: volume={volume:.0f}, liquidity={liquidity:.0f}")
-                        
-                        # Include if volume > 100 or liquidity > 200 OR if volume is 0 (fallback for markets without volume)
-                        # After enrichment, most markets should have volume from Gamma API
-                        if volume > 100 or liquidity > 200 or (volume == 0 and liquidity == 0):
-                            analysis = await self.analyze_market(market)
-                            # Use market_id from analysis or fallback to market's ID
-                            analysis_market_id = analysis.market_id or market_id
-                            self.market_analyses[analysis_market_id] = analysis
-                            analyzed_count += 1
-                            short_term_analyzed += 1
-                            
-                            # Debug: Log analysis results for first few
-                            if analyzed_count <= 3:
-                                print(f"    Analysis result: score={analysis.score:.2f}, volume_score={analysis.volume_score:.2f}, context_score={analysis.context_score:.2f}")
-                            
-                            # Limit analysis to prevent memory issues, prioritize trending (already sorted)
-                            if analyzed_count >= 150:  # Analyze up to 150 markets
-                                break
-                    except Exception as e:
-                        print(f"Error analyzing market {market.get('id')}: {e}")
+                    print(f"Error fetching from CLOB API: {e}, falling back to Gamma API")
+                    import traceback
+                    traceback.print_exc()
+                async with self.upstream_limiter:
+                    markets = await polymarket_client.get_markets(limit=200, offset=0, use_clob=False)
+        else:
+            async with self.upstream_limiter:
+                markets = await polymarket_client.get_markets(limit=200, offset=0, use_clob=False)
+        markets = self._normalize(markets)
+        # Price Gamma markets in bulk rather than one CLOB lookup per market during analysis
+        await self._enrich_markets_with_clob_prices([m for m in markets if not m.has_prices], polymarket_client)
+        self._observe_refreshed(markets)
+        return markets
+    
+    async def _market_fetch_stage(self, polymarket_client, batches: asyncio.Queue, slots: asyncio.Semaphore):
+        """Producer: fetch a batch of markets at most every 5 seconds and queue it for trading.
+        
+        A queue slot is reserved before fetching, so no batch is fetched (and then
+        left to go stale) while the queue is full.
+        """
+        debug_mode = os.getenv("DEBUG", "false").lower() == "true"
+        cycle_count = 0
+        while self.is_running:
+            try:
+                # Held back while the trading stage has not yet taken the queued batch
+                wait_started = self.clock.time()
+                await slots.acquire()
+                self._pipeline_stats['fetchBlockedSeconds'] += self.clock.time() - wait_started
+                queued = False
+                try:
+                    cycle_count += 1
+                    started = self.clock.time()
+                    markets = await self._fetch_trading_markets(polymarket_client, cycle_count)
+                    fetch_seconds = self.clock.time() - started
+                    
+                    if not markets:
+                        if debug_mode:
+                            print("WARNING: No markets fetched from Polymarket API")
+                        await self.clock.sleep(10)
                         continue
+                    
+                    if debug_mode:
+                        print(f"Fetched {len(markets)} markets from Polymarket")
+                    batches.put_nowait((cycle_count, markets, self.clock.time(), fetch_seconds))
+                    queued = True
+                finally:
+                    if not queued:
+                        slots.release()
                 
-                print(f"Analyzed {short_term_analyzed} short-term markets (1-2 week resolution)")
-                print(f"Total analyzed: {analyzed_count} markets")
-                print(f"Current balance: ${self.balance:.2f}, Active positions: {len(self.positions)}")
+                # Start fetches at most every 5 seconds
+                await self.clock.sleep(max(0.0, 5 - (self.clock.time() - started)))
                 
-                # Update existing positions (check all markets for position updates)
-                await self._update_positions(markets, polymarket_client)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Error in market fetch stage: {e}")
+                import traceback
+                traceback.print_exc()
+                await self.clock.sleep(10)
+    
+    async def _trading_stage(self, batches: asyncio.Queue, slots: asyncio.Semaphore):
+        """Consumer: run a trading cycle on each fetched batch of markets."""
+        debug_mode = os.getenv("DEBUG", "false").lower() == "true"
+        while self.is_running:
+            try:
+                wait_started = self.clock.time()
+                cycle_count, markets, fetched_at, fetch_seconds = await batches.get()
+                slots.release()
+                started = self.clock.time()
                 
-                # Find trading opportunities from analyzed markets
-                print(f"Executing trades on {len(self.market_analyses)} analyzed markets...")
-                if len(self.market_analyses) == 0:
-                    print("WARNING: No markets have been analyzed! Cannot execute trades.")
-                else:
-                    print(f"Market analyses available: {list(self.market_analyses.keys())[:5]}...")  # Show first 5
-                await self._execute_trades(markets)
+                if debug_mode:
+                    print(f"Analyzing {len(markets)} markets for trading opportunities...")
                 
-                # Cleanup: Remove old analyses for markets we're no longer tracking
-                if len(self.market_analyses) > 200:
-                    # Keep only the most recent 200 analyses
-                    market_ids_in_list = {m.get('id') for m in markets if m.get('id')}
-                    analyses_to_keep = {
-                        k: v for k, v in self.market_analyses.items()
-                        if k in market_ids_in_list
-                    }
-                    self.market_analyses = analyses_to_keep
+                await self._run_trading_cycle(markets)
+                
+                self._prune_analyses(markets)
+                self._update_refresh_tiers()
+                self._retain_refresh_state(markets)
                 
                 # Periodic cleanup every 20 cycles
                 if cycle_count % 20 == 0:
@@ -997,9 +1175,23 @@ class TradingBot:
                 # Keep only last 500 trades to prevent memory issues
                 if len(self.trades) > 500:
                     self.trades = self.trades[-500:]
+                    self.realized_pnl = self._sum_realized_pnl()
+                
+                self._update_pnl_history()
+                self._publish_snapshot(analyses_changed=True)
+                self._maybe_snapshot_journal()
                 
-                # Wait before next iteration
-                await asyncio.sleep(5)  # Check every 5 seconds
+                self.cycle_metrics['pipeline'] = {
+                    'cycle': cycle_count,
+                    'fetchSeconds': fetch_seconds,
+                    # Loop-clock seconds the trading stage idled waiting for a batch
+                    'waitSeconds': started - wait_started,
+                    # Loop-clock seconds between the batch being queued and traded on
+                    'batchAgeSeconds': started - fetched_at,
+                    'cycleSeconds': self.clock.time() - started,
+                    # Cumulative loop-clock seconds the fetch stage was held back by a full queue
+                    'fetchBlockedSeconds': self._pipeline_stats['fetchBlockedSeconds'],
+                }
                 
             except asyncio.CancelledError:
                 break
@@ -1007,12 +1199,218 @@ class TradingBot:
                 print(f"Error in trading loop: {e}")
                 import traceback
                 traceback.print_exc()
-                await asyncio.sleep(10)
+                await self.clock.sleep(10)
     
-    async def _update_positions(self, markets: List[dict] = None, polymarket_client = None):
+    async def _run_trading_cycle(self, markets: List[Market]):
+        """One trading-loop pass over fetched markets: analyze, reprice positions, trade.
+        
+        Performs no network fetches of its own, so the backtester can drive it with replayed markets.
+        """
+        started = time.perf_counter()
+        counts = self._analysis_counts()
+        analyzed = await self._analyze_markets(markets)
+        analyzed_at = time.perf_counter()
+        reused = self._analysis_counts(since=counts)
+        
+        # Update existing positions (check all markets for position updates)
+        await self._update_positions(markets)
+        positions_at = time.perf_counter()
+        
+        # Find trading opportunities from analyzed markets
+        print(f"Executing trades on {len(self.market_analyses)} analyzed markets...")
+        if len(self.market_analyses) == 0:
+            print("WARNING: No markets have been analyzed! Cannot execute trades.")
+        else:
+            print(f"Market analyses available: {list(self.market_analyses.keys())[:5]}...")  # Show first 5
+        await self._execute_trades(markets)
+        finished = time.perf_counter()
+        
+        self.cycle_metrics['trading'] = {
+            'markets': len(markets),
+            'analyzed': analyzed,
+            **reused,
+            'analyzeMs': (analyzed_at - started) * 1000,
+            'positionsMs': (positions_at - analyzed_at) * 1000,
+            'tradesMs': (finished - positions_at) * 1000,
+            'totalMs': (finished - started) * 1000,
+        }
+        # Price extraction and CLOB lookups across all loops since the previous trading cycle
+        self.cycle_metrics['prices'] = self.prices.take_metrics()
+    
+    def _prune_analyses(self, markets: List[Market]):
+        """Remove old analyses for markets we're no longer tracking."""
+        if len(self.market_analyses) > 200:
+            # Keep only analyses for markets in the current list
+            market_ids_in_list = {m.id for m in markets}
+            analyses_to_keep = {
+                k: v for k, v in self.market_analyses.items()
+                if k in market_ids_in_list
+            }
+            self.market_analyses = analyses_to_keep
+    
+    async def _analyze_markets(self, markets: List[Market]) -> int:
+        """Analyze realistic, short-term markets into self.market_analyses.
+        
+        Returns:
+            Number of markets analyzed
+        """
+        # Analyze all fetched markets, prioritizing short-term trending markets
+        analyzed_count = 0
+        short_term_analyzed = 0
+        
+        for market in markets:
+            try:
+                # Filter out unrealistic/joke markets
+                if not self._is_realistic_market(market):
+                    continue
+                
+                # CRITICAL: Only analyze markets that resolve in 1-4 weeks
+                # (checked lazily: the loop stops after 150 analyses)
+                if not self._is_market_in_resolution_window(market):
+                    continue  # Skip long-term markets
+                
+                # Filter: only analyze markets with minimum volume/liquidity (very relaxed)
+                # NOTE: After enrichment, markets should have Gamma volume data + CLOB prices
+                volume = market.volume
+                liquidity = market.liquidity
+                
+                # Debug: Log first few markets being analyzed
+                if analyzed_count < 3:
+                    print(f"  Market {market.id[:30]}: volume={volume:.0f}, liquidity={liquidity:.0f}")
+                
+                # Include if volume > 100 or liquidity > 200 OR if volume is 0 (fallback for markets without volume)
+                # After enrichment, most markets should have volume from Gamma API
+                if volume > 100 or liquidity > 200 or (volume == 0 and liquidity == 0):
+                    analysis = await self.analyze_market(market)
+                    self.market_analyses[market.id] = analysis
+                    analyzed_count += 1
+                    short_term_analyzed += 1
+                    
+                    # Debug: Log analysis results for first few
+                    if analyzed_count <= 3:
+                        print(f"    Analysis result: score={analysis.score:.2f}, volume_score={analysis.volume_score:.2f}, context_score={analysis.context_score:.2f}")
+                    
+                    # Limit analysis to prevent memory issues, prioritize trending (already sorted)
+                    if analyzed_count >= 150:  # Analyze up to 150 markets
+                        break
+            except Exception as e:
+                print(f"Error analyzing market {market.id}: {e}")
+                continue
+        
+        print(f"Analyzed {short_term_analyzed} short-term markets (1-2 week resolution)")
+        print(f"Total analyzed: {analyzed_count} markets")
+        print(f"Current balance: ${self.balance:.2f}, Active positions: {len(self.positions)}")
+        return analyzed_count
+    
+    async def _run_scalping_cycle(self, markets: List[Market]):
+        """One scalping pass: open small positions on high-volume markets with strong scores."""
+        started = time.perf_counter()
+        counts = self._analysis_counts()
+        # Filter for high-volume, realistic, short-term markets
+        scalp_opportunities = []
+        
+        for market in markets[:50]:  # Check top 50 high-volume markets
+            try:
+                # Quick filters
+                if not self._is_realistic_market(market):
+                    continue
+                
+                if not self._is_market_in_resolution_window(market):
+                    continue
+                
+                volume = market.volume
+                liquidity = market.liquidity
+                
+                # Scalping requires reasonable volume (relaxed)
+                # Allow CLOB markets (volume == 0) since they have accurate prices
+                if (volume > 0 and volume < 500) or (liquidity > 0 and liquidity < 300):
+                    continue
+                # If volume is 0, it's from CLOB API - allow it for scalping
+                
+                # Quick analysis for scalping
+                analysis = await self.analyze_market(market)
+                
+                # Scalping criteria: Much more relaxed thresholds
+                if (analysis.volume_score > self.params.scalp_min_volume_score
+                        and abs(analysis.score) > self.params.scalp_min_score):
+                    market_title = market.question or 'Unknown'
+                    
+                    # Check if we already have a position
+                    direction = 'Yes' if analysis.score > 0 else 'No'
+                    position_key = f"{analysis.market_id}-{direction}"
+                    
+                    if position_key not in self.positions:
+                        scalp_opportunities.append({
+                            'market': market,
+                            'analysis': analysis,
+                            'outcome': direction,
+                            'priority': analysis.volume_score
+                        })
+            except Exception as e:
+                continue
+        
+        # Sort by volume score (highest first)
+        scalp_opportunities.sort(key=lambda x: x['priority'], reverse=True)
+        
+        # Execute up to 3-5 scalping trades per cycle (small positions)
+        max_scalps = min(self.params.max_scalps_per_cycle, len(scalp_opportunities))
+        
+        for opp in scalp_opportunities[:max_scalps]:
+            if self.balance < 0.5:  # Need minimum balance
+                break
+            
+            market = opp['market']
+            analysis = opp['analysis']
+            outcome = opp['outcome']
+            market_title = market.question or 'Unknown'
+            
+            # Scalp position size: 1-2% of portfolio
+            position_pct = 0.015  # 1.5% base for scalps
+            if abs(analysis.score) > 20:
+                position_pct = 0.02  # 2% for high confidence
+            elif abs(analysis.score) > 10:
+                position_pct = 0.015  # 1.5% for medium confidence
+            else:
+                position_pct = 0.01  # 1% for low confidence
+            
+            position_size = self.balance * position_pct
+            position_size = max(0.10, min(position_size, self.balance * 0.02))  # 1-2% of portfolio
+            
+            if position_size > self.balance:
+                continue
+            
+            price_yes, price_no = await self._get_outcome_prices(market, self.polymarket_client)
+            if price_yes is None or price_no is None:
+                continue
+            
+            price = price_yes if outcome in ['Yes', 'YES', 'yes'] else price_no
+            
+            # Only allow prices between $0.10 and $0.99
+            if price < 0.10 or price > 0.99:
+                continue
+            
+            # Calculate remaining profit margin
+            max_profit_per_share = 1.0 - price if outcome in ['Yes', 'YES', 'yes'] else price
+            if max_profit_per_share <= 0:
+                continue  # No profit potential
+            
+            # Execute scalp trade
+            reason = f"Volume Scalp: {outcome} @ {price:.3f} (Vol: {analysis.volume:.0f}, Margin: {max_profit_per_share:.3f})"
+            await self._open_position(market, analysis, outcome, market_title, price,
+                                    position_size, 'volume_scalp', reason, 'scalp')
+        
+        self.cycle_metrics['scalping'] = {
+            'markets': len(markets),
+            'opportunities': len(scalp_opportunities),
+            **self._analysis_counts(since=counts),
+            'totalMs': (time.perf_counter() - started) * 1000,
+        }
+    
+    async def _update_positions(self, markets: List[Market] = None, polymarket_client = None):
         """Update current prices and P&L for open positions."""
         if not self.positions:
             return
+        started = time.perf_counter()
         
         # If markets not provided, fetch them
         if markets is None and polymarket_client:
@@ -1024,6 +1422,7 @@ class TradingBot:
                     market_data = await polymarket_client.get_market_by_id(market_id)
                     if market_data:
                         markets.append(market_data)
+                markets = self._normalize(markets)
             except Exception as e:
                 print(f"Error fetching markets for position update: {e}")
                 return
@@ -1031,8 +1430,10 @@ class TradingBot:
         if not markets:
             return
         
+        changed = False
+        markets_by_id = {m.id: m for m in markets}
         for position_key, position in list(self.positions.items()):
-            market = next((m for m in markets if m.get('id') == position.market_id), None)
+            market = markets_by_id.get(position.market_id)
             if market:
                 price_yes, price_no = await self._get_outcome_prices(market, self.polymarket_client)
                 
@@ -1040,12 +1441,19 @@ class TradingBot:
                 if price_yes is None or price_no is None:
                     continue
                 
+                if self.tick_recorder:
+                    self.tick_recorder.record(position.market_id, price_yes, price_no, market.volume_24h,
+                                              timestamp=self.clock.time())
+                
                 # Determine current price based on outcome
                 if position.outcome in ['Yes', 'YES', 'yes']:
                     current_price = price_yes
                 else:
                     current_price = price_no
                 
+                if current_price == position.current_price:
+                    continue
+                
                 position.current_price = current_price
                 
                 # Calculate unrealized P&L
@@ -1055,167 +1463,157 @@ class TradingBot:
                 position.unrealized_pnl = current_value - position.size
                 
                 self.positions[position_key] = position
+                self._journal_event('position', {'key': position_key, 'currentPrice': current_price,
+                                                 'unrealizedPnl': position.unrealized_pnl})
+                self._emit('position', {'key': position_key, 'position': self._position_to_dict(position)})
+                changed = True
+        
+        if changed:
+            self._emit_stats()
+        
+        self.cycle_metrics['positions'] = {
+            'positions': len(self.positions),
+            'markets': len(markets),
+            'totalMs': (time.perf_counter() - started) * 1000,
+        }
+    
+    def _observe_refreshed(self, markets: List[Market]):
+        """Count freshly fetched prices as refreshes, so those markets are not re-requested early."""
+        now = self.clock.time()
+        for market in markets:
+            self._latest_markets[market.id] = market
+            if market.price_yes is not None:
+                self.refresh.observe(market.id, market.price_yes, now)
+    
+    def _update_refresh_tiers(self):
+        """Put open positions' markets, then high-scoring analyzed markets, ahead of the tail."""
+        min_score = self.params.refresh_candidate_min_score
+        self.refresh.set_tiers(
+            {p.market_id for p in self.positions.values()},
+            [market_id for market_id, a in self.market_analyses.items() if abs(a.score) >= min_score],
+            self.clock.time(),
+        )
+    
+    def _refresh_market_ids(self, markets: List[Market]) -> Set[str]:
+        """Markets worth keeping refresh state for: the latest batch, the scalping page, analyses and positions."""
+        market_ids = {m.id for m in markets}
+        market_ids.update(self._scalping_market_ids)
+        market_ids.update(self.market_analyses)
+        market_ids.update(p.market_id for p in self.positions.values())
+        return market_ids
+    
+    def _retain_refresh_state(self, markets: List[Market]):
+        """Drop refresh scheduling and latest market copies for markets no longer worth tracking."""
+        market_ids = self._refresh_market_ids(markets)
+        self.refresh.retain(market_ids)
+        for market_id in [m for m in self._latest_markets if m not in market_ids]:
+            del self._latest_markets[market_id]
+    
+    async def _refresh_markets(self, market_ids: List[str], polymarket_client) -> List[Market]:
+        """Fetch individual markets under the shared upstream limiter and record their prices."""
+        async def fetch(market_id: str):
+            async with self.upstream_limiter:
+                return await polymarket_client.get_market_by_id(market_id)
+        
+        results = await asyncio.gather(*(fetch(market_id) for market_id in market_ids), return_exceptions=True)
+        markets = self._normalize([r for r in results if isinstance(r, dict)])
+        await self._enrich_markets_with_clob_prices([m for m in markets if not m.has_prices], polymarket_client)
+        self._observe_refreshed(markets)
+        return markets
     
     async def _position_update_loop(self, polymarket_client):
-        """Separate loop that updates position prices every 2 seconds for real-time updates."""
+        """Refresh the markets the refresh scheduler finds due, every second.
+        
+        Open positions come due fastest and are repriced from the refreshed markets.
+        Refreshed markets are not re-analyzed here: that would add a price history
+        point per refresh and shrink the momentum/trend windows of exactly these
+        markets to a few seconds. Analyses stay on the trading-cycle cadence.
+        """
         while self.is_running:
             try:
-                if self.positions:
-                    await self._update_positions(polymarket_client=polymarket_client)
-                    # Update P&L history after position updates
-                    self._update_pnl_history()
-                await asyncio.sleep(2)  # Update every 2 seconds
+                self._update_refresh_tiers()
+                market_ids = self.refresh.take_due(self.clock.time())
+                if market_ids:
+                    markets = await self._refresh_markets(market_ids, polymarket_client)
+                    if markets and self.positions:
+                        await self._update_positions(markets)
+                        # Update P&L history after position updates
+                        self._update_pnl_history()
+                    self._publish_snapshot()
+                self.cycle_metrics['refresh'] = self.refresh.take_metrics()
+                await self.clock.sleep(1)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 print(f"Error in position update loop: {e}")
-                await asyncio.sleep(5)
+                await self.clock.sleep(5)
+    
+    async def _scalping_markets(self, polymarket_client) -> Tuple[List[Market], bool]:
+        """The scalping page of high-volume markets, and whether it was refetched.
+        
+        The page is refetched (under the upstream limiter) only when a long-tail
+        market on it would come due for a refresh before the next scalping cycle,
+        or the latest copy of a market on it was dropped. Otherwise the latest
+        copies of its markets are returned: page fetches, trading batches and
+        per-market refreshes keep those as fresh as the refresh scheduler asks for.
+        """
+        page = self._scalping_market_ids
+        if page and all(market_id in self._latest_markets for market_id in page):
+            due = self.refresh.next_due(page)
+            if due is None or due > self.clock.time() + SCALPING_PAGE_LOOKAHEAD:
+                return [self._latest_markets[market_id] for market_id in page], False
+        
+        # Fetch high-volume markets for scalping (Gamma API has everything)
+        async with self.upstream_limiter:
+            markets = self._normalize(await polymarket_client.get_markets(limit=100, offset=0, use_clob=False))
+        if markets:
+            await self._enrich_markets_with_clob_prices([m for m in markets if not m.has_prices], polymarket_client)
+            self._observe_refreshed(markets)
+        self._scalping_market_ids = [m.id for m in markets]
+        return markets, True
     
     async def _scalping_loop(self, polymarket_client):
-        """Separate high-frequency loop for volume scalping trades (every 2-5 seconds)."""
-        import random
+        """Separate high-frequency loop for volume scalping trades (every 2-5 seconds).
         
+        Each cycle scans the scalping page; the page itself is only refetched when
+        its markets are due (see _scalping_markets).
+        """
         while self.is_running:
             try:
-                # Fetch high-volume markets for scalping (Gamma API has everything)
-                markets = await polymarket_client.get_markets(limit=100, offset=0, use_clob=False)
+                markets, fetched = await self._scalping_markets(polymarket_client)
                 
                 if not markets:
-                    await asyncio.sleep(3)
+                    await self.clock.sleep(3)
                     continue
                 
-                # Filter for high-volume, realistic, short-term markets
-                scalp_opportunities = []
-                
-                for market in markets[:50]:  # Check top 50 high-volume markets
-                    try:
-                        # Quick filters
-                        if not self._is_realistic_market(market):
-                            continue
-                        
-                        if not self._is_market_in_resolution_window(market):
-                            continue
-                        
-                        volume = float(market.get('volumeNum', market.get('volume', 0)))
-                        liquidity = float(market.get('liquidityNum', market.get('liquidity', 0)))
-                        
-                        # Scalping requires reasonable volume (relaxed)
-                        # Allow CLOB markets (volume == 0) since they have accurate prices
-                        if (volume > 0 and volume < 500) or (liquidity > 0 and liquidity < 300):
-                            continue
-                        # If volume is 0, it's from CLOB API - allow it for scalping
-                        
-                        # Quick analysis for scalping
-                        analysis = await self.analyze_market(market)
-                        
-                        # Scalping criteria: Much more relaxed thresholds
-                        if analysis.volume_score > 10 and abs(analysis.score) > 5:
-                            market_title = market.get('question') or market.get('title') or market.get('name') or 'Unknown'
-                            
-                            # Check if we already have a position
-                            direction = 'Yes' if analysis.score > 0 else 'No'
-                            position_key = f"{analysis.market_id}-{direction}"
-                            
-                            if position_key not in self.positions:
-                                scalp_opportunities.append({
-                                    'market': market,
-                                    'analysis': analysis,
-                                    'outcome': direction,
-                                    'priority': analysis.volume_score
-                                })
-                    except Exception as e:
-                        continue
+                await self._run_scalping_cycle(markets)
+                self.cycle_metrics['scalping']['pageFetched'] = fetched
                 
-                # Sort by volume score (highest first)
-                scalp_opportunities.sort(key=lambda x: x['priority'], reverse=True)
-                
-                # Execute up to 3-5 scalping trades per cycle (small positions)
-                max_scalps = min(5, len(scalp_opportunities))
-                
-                for opp in scalp_opportunities[:max_scalps]:
-                    if self.balance < 0.5:  # Need minimum balance
-                        break
-                    
-                    market = opp['market']
-                    analysis = opp['analysis']
-                    outcome = opp['outcome']
-                    market_title = market.get('question') or market.get('title') or market.get('name') or 'Unknown'
-                    
-                    # Scalp position size: 1-2% of portfolio
-                    position_pct = 0.015  # 1.5% base for scalps
-                    if abs(analysis.score) > 20:
-                        position_pct = 0.02  # 2% for high confidence
-                    elif abs(analysis.score) > 10:
-                        position_pct = 0.015  # 1.5% for medium confidence
-                    else:
-                        position_pct = 0.01  # 1% for low confidence
-                    
-                    position_size = self.balance * position_pct
-                    position_size = max(0.10, min(position_size, self.balance * 0.02))  # 1-2% of portfolio
-                    
-                    if position_size > self.balance:
-                        continue
-                    
-                    price_yes, price_no = await self._get_outcome_prices(market, self.polymarket_client)
-                    if price_yes is None or price_no is None:
-                        continue
-                    
-                    price = price_yes if outcome in ['Yes', 'YES', 'yes'] else price_no
-                    
-                    # Only allow prices between $0.10 and $0.99
-                    if price < 0.10 or price > 0.99:
-                        continue
-                    
-                    # Calculate remaining profit margin
-                    max_profit_per_share = 1.0 - price if outcome in ['Yes', 'YES', 'yes'] else price
-                    if max_profit_per_share <= 0:
-                        continue  # No profit potential
-                    
-                    # Execute scalp trade
-                    reason = f"Volume Scalp: {outcome} @ {price:.3f} (Vol: {analysis.volume:.0f}, Margin: {max_profit_per_share:.3f})"
-                    await self._open_position(market, analysis, outcome, market_title, price,
-                                            position_size, 'volume_scalp', reason, 'scalp')
+                self._publish_snapshot()
                 
                 # Wait 2-5 seconds before next scalping cycle (randomized to avoid patterns)
-                wait_time = 2 + random.random() * 3  # 2-5 seconds
-                await asyncio.sleep(wait_time)
+                wait_time = 2 + self._rng.random() * 3  # 2-5 seconds
+                await self.clock.sleep(wait_time)
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 print(f"Error in scalping loop: {e}")
-                await asyncio.sleep(3)
+                await self.clock.sleep(3)
     
-    async def _get_claude_trading_decision(self, market: dict, analysis: MarketAnalysis) -> Optional[Dict]:
+    async def _get_claude_trading_decision(self, market: Market, analysis: MarketAnalysis) -> Optional[Dict]:
         """Use Claude AI to analyze market and make trading decision."""
         if not self.claude_client:
             return None
         
         try:
-            # Prepare market data for Claude - handle both CLOB and Gamma API formats
-            market_title = market.get('question') or market.get('title') or market.get('name', 'Unknown')
-            description = market.get('description', '')
-            
-            # Extract prices from CLOB tokens if available
-            price_yes = analysis.price_yes
-            price_no = analysis.price_no
+            market_title = market.question or 'Unknown'
+            description = market.description
             
-            # Try to get prices from CLOB tokens directly
-            if market.get('tokens') and isinstance(market.get('tokens'), list):
-                for token in market['tokens']:
-                    if isinstance(token, dict):
-                        outcome = str(token.get('outcome', '')).strip().upper()
-                        price = token.get('price')
-                        if price is not None:
-                            try:
-                                price_float = float(price)
-                                if 0 < price_float < 1:
-                                    if outcome in ['YES', 'YES ']:
-                                        price_yes = price_float
-                                    elif outcome in ['NO', 'NO ']:
-                                        price_no = price_float
-                            except (ValueError, TypeError):
-                                continue
+            # Prefer current market prices over the analysis snapshot
+            price_yes, price_no = await self._get_outcome_prices(market, self.polymarket_client)
+            if price_yes is None or price_no is None:
+                price_yes, price_no = analysis.price_yes, analysis.price_no
             
             volume = analysis.volume
             liquidity = analysis.liquidity
@@ -1224,16 +1622,15 @@ class TradingBot:
             sentiment = analysis.sentiment
             score = analysis.score
             
-            # Get market metadata from CLOB format
-            end_date = market.get('end_date_iso') or market.get('endDate') or market.get('endDateISO8601', 'Unknown')
-            active = market.get('active', True)
-            closed = market.get('closed', False)
-            accepting_orders = market.get('accepting_orders', True)
+            end_date = market.end_date or 'Unknown'
+            active = market.active
+            closed = market.closed
+            accepting_orders = market.accepting_orders
             
             # Get price history for context
             price_history_str = "No price history yet"
-            if market.get('id') in self.price_history:
-                history = self.price_history[market.get('id')]
+            if market.id in self.price_history:
+                history = self.price_history[market.id]
                 if len(history) > 0:
                     recent_prices = [f"{p[1]:.3f}" for p in history[-5:]]
                     price_history_str = ", ".join(recent_prices)
@@ -1248,7 +1645,7 @@ MARKET INFORMATION:
 - Title: {market_title}
 - Description: {description[:200] if description else 'N/A'}
 - Market ID: {analysis.market_id}
-- Condition ID: {market.get('condition_id', 'N/A')}
+- Condition ID: {market.condition_id or 'N/A'}
 - Current Yes Price: ${price_yes:.4f}
 - Current No Price: ${price_no:.4f}
 - End Date: {end_date}
@@ -1334,39 +1731,34 @@ Respond ONLY with valid JSON, no other text."""
             traceback.print_exc()
             return None
     
-    async def _execute_trades(self, markets: List[dict]):
+    async def _execute_trades(self, markets: List[Market]):
         """Execute trades based on Claude AI decisions."""
         opportunities = []
         
         # Collect all trading opportunities from analyzed markets
-        # Handle both CLOB (condition_id) and Gamma (id) formats
         analyzed_market_ids = set(self.market_analyses.keys())
         print(f"_execute_trades: Analyzed market IDs: {list(analyzed_market_ids)[:5]}...")
         
         tradeable_markets = []
         for m in markets:
-            market_id = m.get('id') or m.get('condition_id') or m.get('question_id')
-            if market_id and market_id in analyzed_market_ids:
+            if m.id in analyzed_market_ids:
                 tradeable_markets.append(m)
-            elif market_id:
+            elif len(tradeable_markets) < 3:
                 # Debug: Check why market is not in analyzed set
-                if len(tradeable_markets) < 3:
-                    print(f"  Market {market_id[:20]}... not in analyzed set (has {market_id})")
+                print(f"  Market {m.id[:20]}... not in analyzed set (has {m.id})")
         
         print(f"_execute_trades: {len(analyzed_market_ids)} analyzed markets, {len(tradeable_markets)} tradeable markets")
         if len(tradeable_markets) == 0 and len(markets) > 0:
             print(f"  WARNING: No tradeable markets found! Sample market IDs from fetched markets:")
             for m in markets[:3]:
-                print(f"    - id: {m.get('id')}, condition_id: {m.get('condition_id')}, question_id: {m.get('question_id')}")
+                print(f"    - id: {m.id}, condition_id: {m.condition_id}")
         
         # If Claude is available, use AI for decisions
         if self.claude_client:
             print(f"Using Claude AI for trading decisions... ({len(tradeable_markets)} tradeable markets)")
             claude_opportunities = 0
             for market in tradeable_markets[:15]:  # Limit to 15 markets per cycle to avoid rate limits
-                market_id = market.get('id') or market.get('condition_id') or market.get('question_id')
-                if not market_id:
-                    continue
+                market_id = market.id
                 
                 # Filter checks
                 if not self._is_realistic_market(market):
@@ -1376,11 +1768,7 @@ Respond ONLY with valid JSON, no other text."""
                     continue
                 
                 # Check if market is active and accepting orders (CLOB format)
-                if not market.get('active', True):
-                    continue
-                if market.get('closed', False):
-                    continue
-                if not market.get('accepting_orders', True):
+                if not market.active or market.closed or not market.accepting_orders:
                     continue
                 
                 analysis = self.market_analyses.get(market_id)
@@ -1405,16 +1793,14 @@ Respond ONLY with valid JSON, no other text."""
                     })
                 
                 # Small delay to avoid rate limiting
-                await asyncio.sleep(0.3)
+                await self.clock.sleep(0.3)
             
             print(f"Claude AI found {claude_opportunities} trading opportunities out of {len(tradeable_markets[:15])} markets analyzed")
         else:
             # Fallback to algorithmic strategies if Claude not available
             print("Claude not available - using algorithmic strategies as fallback")
             for market in tradeable_markets:
-                market_id = market.get('id')
-                if not market_id:
-                    continue
+                market_id = market.id
                 
                 # Double-check: Don't trade on unrealistic markets
                 if not self._is_realistic_market(market):
@@ -1428,7 +1814,7 @@ Respond ONLY with valid JSON, no other text."""
                 if not analysis:
                     continue
                 
-                market_title = market.get('question') or market.get('title') or market.get('name') or 'Unknown Market'
+                market_title = market.question or 'Unknown Market'
                 
                 # Strategy 1: Arbitrage (highest priority)
                 if analysis.arbitrage_opportunity:
@@ -1442,7 +1828,7 @@ Respond ONLY with valid JSON, no other text."""
                     })
                 
                 # Strategy 2: Catch-all for algorithmic fallback
-                elif analysis.score > 5:
+                elif analysis.score > self.params.fallback_min_score:
                     direction = 'Yes' if analysis.price_yes > 0.5 else 'No'
                     opportunities.append({
                         'market': market,
@@ -1459,7 +1845,7 @@ Respond ONLY with valid JSON, no other text."""
         
         print(f"Found {len(opportunities)} trading opportunities")
         if opportunities:
-            print(f"Top opportunity: {opportunities[0]['strategy']} on {opportunities[0]['market'].get('question', 'Unknown')[:60]}")
+            print(f"Top opportunity: {opportunities[0]['strategy']} on {opportunities[0]['market'].question[:60]}")
             # Debug: Show top 5 opportunities
             for i, opp in enumerate(opportunities[:5], 1):
                 print(f"  Opp {i}: {opp['strategy']} - score={opp['analysis'].score:.2f}, priority={opp['priority']:.1f}, outcome={opp['outcome']}")
@@ -1491,7 +1877,7 @@ Respond ONLY with valid JSON, no other text."""
                 print(f"  Attempting to execute opportunity {i+1}/{min(len(swing_opportunities), max_swings_per_cycle)}: {opp['strategy']}")
                 await self._execute_opportunity(opp)
                 trades_executed += 1
-                print(f"  ✓ SUCCESS: Executed trade {trades_executed}: {opp['strategy']} on {opp['market'].get('question', 'Unknown')[:50]}")
+                print(f"  ✓ SUCCESS: Executed trade {trades_executed}: {opp['strategy']} on {opp['market'].question[:50]}")
             except Exception as e:
                 print(f"  ✗ ERROR executing opportunity {i+1}: {e}")
                 import traceback
@@ -1510,7 +1896,7 @@ Respond ONLY with valid JSON, no other text."""
         analysis = opportunity['analysis']
         strategy = opportunity['strategy']
         outcome_str = opportunity['outcome']
-        market_title = market.get('question') or market.get('title') or market.get('name') or 'Unknown Market'
+        market_title = market.question or 'Unknown Market'
         
         print(f"  [_execute_opportunity] Strategy: {strategy}, Outcome: {outcome_str}, Market: {market_title[:50]}")
         print(f"  [_execute_opportunity] Balance: ${self.balance:.2f}, Analysis score: {analysis.score:.2f}, Price Yes: {analysis.price_yes:.3f}, Price No: {analysis.price_no:.3f}")
@@ -1571,7 +1957,8 @@ Respond ONLY with valid JSON, no other text."""
             # Skip if we couldn't extract prices
             if price_yes is None or price_no is None:
                 print(f"  -> ✗ SKIPPING: Could not extract prices (Yes: {price_yes}, No: {price_no})")
-                print(f"     Market data keys: {list(market.keys())[:10]}")
+                print(f"     Market {market.id[:30]}: condition_id={market.condition_id}, "
+                      f"tokens=({market.yes_token_id}, {market.no_token_id})")
                 print(f"     Using analysis prices as fallback: Yes={analysis.price_yes:.3f}, No={analysis.price_no:.3f}")
                 # FALLBACK: Use analysis prices
                 price_yes = analysis.price_yes
@@ -1677,10 +2064,11 @@ Respond ONLY with valid JSON, no other text."""
                                             min_size, strategy, reason + " (min size)", trade_type)
                     print(f"  -> SUCCESS: Position opened with minimum size!")
     
-    async def _check_exit_conditions(self, markets: List[dict]):
+    async def _check_exit_conditions(self, markets: List[Market]):
         """Check all open positions for exit conditions."""
+        markets_by_id = {m.id: m for m in markets}
         for position_key, position in list(self.positions.items()):
-            market = next((m for m in markets if m.get('id') == position.market_id), None)
+            market = markets_by_id.get(position.market_id)
             if not market:
                 continue
             
@@ -1702,22 +2090,23 @@ Respond ONLY with valid JSON, no other text."""
             profit_abs = (current_price - position.entry_price) * position.size
             
             # Exit conditions based on strategy and trade type
+            params = self.params
             should_exit = False
             exit_reason = ""
             
             # Scalping trades: Quick in/out with small profit targets
             if position.trade_type == 'scalp':
                 # Scalps: Take profit at 1-3%, stop loss at 0.5-1%
-                if profit_pct > 0.02:  # Take profit at 2%
+                if profit_pct > params.scalp_take_profit:  # Take profit at 2%
                     should_exit = True
-                    exit_reason = "Scalp profit target: +2%"
-                elif profit_pct < -0.008:  # Stop loss at 0.8%
+                    exit_reason = f"Scalp profit target: +{_pct(params.scalp_take_profit)}"
+                elif profit_pct < -params.scalp_stop_loss:  # Stop loss at 0.8%
                     should_exit = True
-                    exit_reason = "Scalp stop loss: -0.8%"
+                    exit_reason = f"Scalp stop loss: -{_pct(params.scalp_stop_loss)}"
                 # Also exit if held too long (>2 hours for scalps)
-                elif (datetime.now() - position.entry_time).total_seconds() > 7200:
+                elif (self.clock.now() - position.entry_time).total_seconds() > params.scalp_max_hold_seconds:
                     should_exit = True
-                    exit_reason = "Scalp timeout: 2 hours"
+                    exit_reason = f"Scalp timeout: {params.scalp_max_hold_seconds / 3600:g} hours"
             
             elif position.strategy == 'arbitrage':
                 # Exit arbitrage when sum approaches 1.0 (market corrects)
@@ -1725,25 +2114,25 @@ Respond ONLY with valid JSON, no other text."""
                     should_exit = True
                     exit_reason = "Arbitrage closed: Market corrected"
                 # Or if we've made 3%+ profit
-                elif profit_pct > 0.03:
+                elif profit_pct > params.arbitrage_take_profit:
                     should_exit = True
                     exit_reason = "Take profit: Arbitrage profit target met"
             
             elif position.strategy == 'context_swing':
                 # Context swing trades: Higher profit targets, wider stops
-                if profit_pct > 0.10:  # Take profit at 10%
+                if profit_pct > params.context_swing_take_profit:  # Take profit at 10%
                     should_exit = True
-                    exit_reason = "Context swing profit: +10%"
-                elif profit_pct < -0.06:  # Stop loss at 6%
+                    exit_reason = f"Context swing profit: +{_pct(params.context_swing_take_profit)}"
+                elif profit_pct < -params.context_swing_stop_loss:  # Stop loss at 6%
                     should_exit = True
-                    exit_reason = "Context swing stop: -6%"
+                    exit_reason = f"Context swing stop: -{_pct(params.context_swing_stop_loss)}"
             
             elif position.strategy == 'momentum':
                 # Take profit at 8%, stop loss at 4%
-                if profit_pct > 0.08:
+                if profit_pct > params.momentum_take_profit:
                     should_exit = True
                     exit_reason = "Take profit: Momentum target reached"
-                elif profit_pct < -0.04:
+                elif profit_pct < -params.momentum_stop_loss:
                     should_exit = True
                     exit_reason = "Stop loss: Momentum reversed"
             
@@ -1753,40 +2142,40 @@ Respond ONLY with valid JSON, no other text."""
                 entry_from_equilibrium = abs(position.entry_price - 0.5)
                 
                 # Exit if price moved significantly toward 0.5 (reversion occurred)
-                if price_from_equilibrium < entry_from_equilibrium * 0.7:  # Price moved 30%+ toward 0.5
+                if price_from_equilibrium < entry_from_equilibrium * params.mean_reversion_exit_ratio:  # Price moved 30%+ toward 0.5
                     should_exit = True
                     exit_reason = f"Mean reversion: Price moved toward equilibrium ({analysis.price_yes:.3f})"
                 # Or take profit at 10%
-                elif profit_pct > 0.10:
+                elif profit_pct > params.mean_reversion_take_profit:
                     should_exit = True
                     exit_reason = "Take profit: Mean reversion target met"
                 # Stop loss at 5%
-                elif profit_pct < -0.05:
+                elif profit_pct < -params.mean_reversion_stop_loss:
                     should_exit = True
                     exit_reason = "Stop loss: Mean reversion failed"
             
             elif position.strategy == 'volume_breakout':
                 # Take profit at 7%, stop loss at 3%
-                if profit_pct > 0.07:
+                if profit_pct > params.volume_breakout_take_profit:
                     should_exit = True
                     exit_reason = "Take profit: Breakout target reached"
-                elif profit_pct < -0.03:
+                elif profit_pct < -params.volume_breakout_stop_loss:
                     should_exit = True
                     exit_reason = "Stop loss: Breakout failed"
             
             # Default exit conditions for any strategy
             if not should_exit:
-                if profit_pct > 0.12:  # Take profit at 12%
+                if profit_pct > params.default_take_profit:  # Take profit at 12%
                     should_exit = True
                     exit_reason = "Take profit: Strong profit target"
-                elif profit_pct < -0.06:  # Stop loss at 6%
+                elif profit_pct < -params.default_stop_loss:  # Stop loss at 6%
                     should_exit = True
                     exit_reason = "Stop loss: Risk limit reached"
             
             if should_exit:
-                await self._close_position(position, current_price, market.get('question') or market.get('title') or 'Unknown', exit_reason)
+                await self._close_position(position, current_price, market.question or 'Unknown', exit_reason)
     
-    async def _open_position(self, market: dict, analysis: MarketAnalysis, outcome: str, 
+    async def _open_position(self, market: Market, analysis: MarketAnalysis, outcome: str, 
                             market_title: str, price: float, size: float, strategy: str, reason: str, trade_type: str = 'swing'):
         """Open a new trading position."""
         if size > self.balance:
@@ -1800,7 +2189,7 @@ Respond ONLY with valid JSON, no other text."""
             outcome=outcome,
             entry_price=price,
             size=size,
-            entry_time=datetime.now(),
+            entry_time=self.clock.now(),
             current_price=price,
             unrealized_pnl=0.0,
             strategy=strategy,
@@ -1810,14 +2199,13 @@ Respond ONLY with valid JSON, no other text."""
         self.positions[position_key] = position
         self.balance -= size
         
-        # Extract market image/icon from market data
-        market_image = market.get('image') or market.get('icon') or market.get('imageUrl') or None
+        market_image = market.image
         
         trade = SimulatedTrade(
-            id=f"trade-{datetime.now().timestamp()}-{random.random()}",
+            id=f"trade-{self.clock.now().timestamp()}-{self._rng.random()}",
             market_id=analysis.market_id,
             market_title=market_title,
-            timestamp=datetime.now(),
+            timestamp=self.clock.now(),
             action='BUY',
             outcome=outcome,
             price=price,
@@ -1829,6 +2217,12 @@ Respond ONLY with valid JSON, no other text."""
         )
         
         self.trades.insert(0, trade)
+        self._journal_event('open', {'key': position_key, 'position': asdict(position), 'trade': trade,
+                                     'balance': self.balance})
+        self._emit('position', {'key': position_key, 'position': self._position_to_dict(position)})
+        self._trade_dicts[trade.id] = self._trade_to_dict(trade)
+        self._emit('trade', self._trade_dicts[trade.id])
+        self._emit_stats()
         print(f"  -> ✓✓✓ TRADE CREATED (BUY): {trade.action} {trade.outcome} @ ${trade.price:.3f}, size: ${trade.size:.2f}")
         print(f"  -> Trade ID: {trade.id}, Market: {trade.market_title[:50]}")
         print(f"  -> Total trades in list: {len(self.trades)}")
@@ -1862,10 +2256,10 @@ Respond ONLY with valid JSON, no other text."""
         market_image = None
         
         trade = SimulatedTrade(
-            id=f"trade-{datetime.now().timestamp()}-{random.random()}",
+            id=f"trade-{self.clock.now().timestamp()}-{self._rng.random()}",
             market_id=position.market_id,
             market_title=market_title,
-            timestamp=datetime.now(),
+            timestamp=self.clock.now(),
             action='SELL',
             outcome=position.outcome,
             price=current_price,
@@ -1878,29 +2272,33 @@ Respond ONLY with valid JSON, no other text."""
         )
         
         self.trades.insert(0, trade)
+        self.realized_pnl += profit
         print(f"  -> ✓✓✓ TRADE CREATED (SELL): {trade.action} {trade.outcome} @ ${trade.price:.3f}, size: ${trade.size:.2f}, profit: ${profit:.2f}")
         print(f"  -> Trade ID: {trade.id}, Market: {trade.market_title[:50]}")
         print(f"  -> Total trades in list: {len(self.trades)}")
         print(f"  -> Trade object type: {type(trade)}")
         del self.positions[position_key]
+        self._journal_event('close', {'key': position_key, 'trade': trade, 'balance': self.balance})
+        self._emit('position', {'key': position_key, 'position': None})
+        self._trade_dicts[trade.id] = self._trade_to_dict(trade)
+        self._emit('trade', self._trade_dicts[trade.id])
+        self._emit_stats()
     
     def _update_pnl_history(self):
         """Update P&L history for charting."""
-        current_time = datetime.now()
+        current_time = self.clock.now()
         
         # Calculate total P&L (realized + unrealized)
-        completed_trades = [t for t in self.trades if t.profit is not None]
-        realized_pnl = sum(t.profit for t in completed_trades if t.profit is not None)
-        
-        # Calculate unrealized P&L from open positions
         unrealized_pnl = sum(p.unrealized_pnl for p in self.positions.values())
-        
-        total_pnl = realized_pnl + unrealized_pnl
+        total_pnl = self.realized_pnl + unrealized_pnl
         
         # Add to history (only if it changed significantly or enough time passed)
         if not self.pnl_history:
             # Initialize with starting point
             self.pnl_history.append((current_time, 0.0))
+            self._journal_event('pnl', {'timestamp': current_time, 'pnl': 0.0})
+            self._pnl_dicts.append(self._pnl_point_to_dict(current_time, 0.0))
+            self._emit('pnl', self._pnl_dicts[-1])
         else:
             # Only add if P&L changed by >$0.10 or 30+ seconds passed
             last_time, last_pnl = self.pnl_history[-1]
@@ -1909,23 +2307,31 @@ Respond ONLY with valid JSON, no other text."""
             
             if pnl_diff > 0.10 or time_diff > 30:
                 self.pnl_history.append((current_time, total_pnl))
+                self._journal_event('pnl', {'timestamp': current_time, 'pnl': total_pnl})
+                self._pnl_dicts.append(self._pnl_point_to_dict(current_time, total_pnl))
+                self._emit('pnl', self._pnl_dicts[-1])
         
         # Keep only last 200 data points (to prevent memory issues)
         if len(self.pnl_history) > 200:
             self.pnl_history = self.pnl_history[-200:]
+            self._pnl_dicts = self._pnl_dicts[-200:]
+    
+    def _sum_realized_pnl(self) -> float:
+        return sum(t.profit for t in self.trades if t.profit is not None)
     
     def _cleanup_old_data(self):
         """Clean up old data to prevent memory growth."""
         # Limit trades to last 1000
         if len(self.trades) > 1000:
             self.trades = self.trades[:1000]
+            self.realized_pnl = self._sum_realized_pnl()
         
         # Limit market analyses to last 500
         if len(self.market_analyses) > 500:
             # Keep most recent analyses
             sorted_analyses = sorted(
                 self.market_analyses.items(),
-                key=lambda x: getattr(x[1], 'timestamp', datetime.now()) if hasattr(x[1], 'timestamp') else datetime.now(),
+                key=lambda x: getattr(x[1], 'timestamp', self.clock.now()) if hasattr(x[1], 'timestamp') else self.clock.now(),
                 reverse=True
             )
             self.market_analyses = dict(sorted_analyses[:500])
@@ -1935,26 +2341,23 @@ Respond ONLY with valid JSON, no other text."""
             if len(self.price_history[market_id]) > 100:
                 self.price_history[market_id] = self.price_history[market_id][-100:]
     
-    def get_pnl_history(self, limit: int = 100) -> List[dict]:
-        """Get P&L history for charting."""
-        # Update P&L history before returning
-        self._update_pnl_history()
-        
-        # Convert to list of dicts with timestamp, pnl, balance, and netWorth
-        history = []
-        for timestamp, pnl in self.pnl_history[-limit:]:
-            balance = self.balance
-            net_worth = self.initial_balance + pnl
-            history.append({
-                'timestamp': timestamp.isoformat(),
-                'pnl': round(pnl, 2),
-                'balance': round(balance, 2),
-                'netWorth': round(net_worth, 2)
-            })
-        return history
+    def get_pnl_history(self, limit: int = 100) -> Tuple[dict, ...]:
+        """Get P&L history for charting (timestamp, pnl, balance and netWorth per point)."""
+        return self.snapshot.pnl_history[-limit:]
+    
+    def _pnl_point_to_dict(self, timestamp: datetime, pnl: float) -> dict:
+        return {
+            'timestamp': timestamp.isoformat(),
+            'pnl': round(pnl, 2),
+            'balance': round(self.balance, 2),
+            'netWorth': round(self.initial_balance + pnl, 2)
+        }
     
     def get_stats(self) -> dict:
         """Get trading statistics."""
+        return self.snapshot.stats
+    
+    def _compute_stats(self) -> dict:
         completed_trades = [t for t in self.trades if t.profit is not None]
         winning_trades = [t for t in completed_trades if t.profit and t.profit > 0]
         losing_trades = [t for t in completed_trades if t.profit and t.profit <= 0]
@@ -1973,9 +2376,6 @@ Respond ONLY with valid JSON, no other text."""
         # Both should equal the same thing
         net_worth = self.initial_balance + total_pnl
         
-        # Update P&L history when getting stats
-        self._update_pnl_history()
-        
         return {
             'balance': round(self.balance, 2),
             'initialBalance': self.initial_balance,
@@ -1990,81 +2390,67 @@ Respond ONLY with valid JSON, no other text."""
             'winRate': round((len(winning_trades) / len(completed_trades) * 100) if completed_trades else 0, 1)
         }
     
-    def get_positions(self) -> List[dict]:
+    def get_positions(self) -> Tuple[dict, ...]:
         """Get all open positions as dictionaries."""
-        return [
-            {
-                'marketId': p.market_id,
-                'marketTitle': p.market_title,
-                'outcome': p.outcome,
-                'entryPrice': round(p.entry_price, 4),
-                'currentPrice': round(p.current_price, 4),
-                'size': round(p.size, 2),
-                'unrealizedPnl': round(p.unrealized_pnl, 2),
-                'entryTime': p.entry_time.isoformat(),
-                'strategy': p.strategy,
-                'tradeType': p.trade_type
-            }
-            for p in self.positions.values()
-        ]
+        return self.snapshot.positions
     
-    def get_recent_trades(self, limit: int = 100) -> List[dict]:
+    @staticmethod
+    def _position_to_dict(p: TradingPosition) -> dict:
+        return {
+            'marketId': p.market_id,
+            'marketTitle': p.market_title,
+            'outcome': p.outcome,
+            'entryPrice': round(p.entry_price, 4),
+            'currentPrice': round(p.current_price, 4),
+            'size': round(p.size, 2),
+            'unrealizedPnl': round(p.unrealized_pnl, 2),
+            'entryTime': p.entry_time.isoformat(),
+            'strategy': p.strategy,
+            'tradeType': p.trade_type
+        }
+    
+    def get_recent_trades(self, limit: int = 100) -> Tuple[dict, ...]:
         """Get recent trades as dictionaries."""
-        print(f"get_recent_trades: Internal trades list has {len(self.trades)} trades")
-        if len(self.trades) > 0:
-            print(f"get_recent_trades: First trade type: {type(self.trades[0])}")
-            print(f"get_recent_trades: First trade id: {self.trades[0].id if hasattr(self.trades[0], 'id') else 'NO ID'}")
-        
-        trades_list = []
-        for t in self.trades[:limit]:
-            try:
-                trade_dict = {
-                    'id': t.id,
-                    'marketId': t.market_id,
-                    'marketTitle': t.market_title,
-                    'timestamp': t.timestamp.isoformat(),
-                    'action': t.action,
-                    'outcome': t.outcome,
-                    'price': round(t.price, 4),
-                    'size': round(t.size, 2),
-                    'reason': t.reason,
-                    'profit': round(t.profit, 2) if t.profit is not None else None,
-                    'strategy': t.strategy,
-                    'tradeType': getattr(t, 'trade_type', 'swing'),
-                    'marketImage': getattr(t, 'market_image', None)  # Include market image/icon
-                }
-                trades_list.append(trade_dict)
-            except Exception as e:
-                print(f"Error converting trade to dict: {e}")
-                print(f"Trade object: {t}")
-                import traceback
-                traceback.print_exc()
-                continue
-        
-        print(f"get_recent_trades: Returning {len(trades_list)} formatted trades")
-        return trades_list
+        return self.snapshot.trades[:limit]
     
-    def get_market_analyses(self) -> List[dict]:
+    @staticmethod
+    def _trade_to_dict(t: SimulatedTrade) -> dict:
+        return {
+            'id': t.id,
+            'marketId': t.market_id,
+            'marketTitle': t.market_title,
+            'timestamp': t.timestamp.isoformat(),
+            'action': t.action,
+            'outcome': t.outcome,
+            'price': round(t.price, 4),
+            'size': round(t.size, 2),
+            'reason': t.reason,
+            'profit': round(t.profit, 2) if t.profit is not None else None,
+            'strategy': t.strategy,
+            'tradeType': getattr(t, 'trade_type', 'swing'),
+            'marketImage': getattr(t, 'market_image', None)  # Include market image/icon
+        }
+    
+    def get_market_analyses(self) -> Tuple[dict, ...]:
         """Get market analyses as dictionaries."""
-        analyses_list = [
-            {
-                'marketId': a.market_id,
-                'volume': round(a.volume, 2),
-                'liquidity': round(a.liquidity, 2),
-                'trend': round(a.trend, 3),
-                'momentum': round(a.momentum, 2),
-                'sentiment': round(a.sentiment, 3),
-                'score': round(a.score, 1),
-                'arbitrageOpportunity': round(a.arbitrage_opportunity, 2) if a.arbitrage_opportunity else None,
-                'spread': round(a.spread, 4),
-                'priceYes': round(a.price_yes, 4),
-                'priceNo': round(a.price_no, 4),
-                'volume24h': round(a.volume_24h, 2)
-            }
-            for a in self.market_analyses.values()
-        ]
-        print(f"get_market_analyses: Returning {len(analyses_list)} analyses")
-        return analyses_list
+        return self.snapshot.analyses
+    
+    @staticmethod
+    def _analysis_to_dict(a: MarketAnalysis) -> dict:
+        return {
+            'marketId': a.market_id,
+            'volume': round(a.volume, 2),
+            'liquidity': round(a.liquidity, 2),
+            'trend': round(a.trend, 3),
+            'momentum': round(a.momentum, 2),
+            'sentiment': round(a.sentiment, 3),
+            'score': round(a.score, 1),
+            'arbitrageOpportunity': round(a.arbitrage_opportunity, 2) if a.arbitrage_opportunity else None,
+            'spread': round(a.spread, 4),
+            'priceYes': round(a.price_yes, 4),
+            'priceNo': round(a.price_no, 4),
+            'volume24h': round(a.volume_24h, 2)
+        }
 
 
 # Global trading bot instance
@@ -2075,5 +2461,6 @@ def get_trading_bot() -> TradingBot:
     """Get or create the global trading bot instance."""
     global _trading_bot
     if _trading_bot is None:
-        _trading_bot = TradingBot(initial_balance=2000.0)
+        _trading_bot = TradingBot(initial_balance=2000.0, journal=create_journal_from_env(),
+                                  tick_recorder=get_tick_recorder())
     return _trading_bot
@@ -0,0 +1,174 @@
+"""
+Bounded TTL/LRU cache with single-flight loading and stale-while-revalidate.
+
+Used for API responses that are expensive to rebuild but tolerate a few seconds
+of staleness. Expired entries are purged from a min-heap keyed by expiry time,
+so cleanup never scans the whole cache.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class _Entry:
+    __slots__ = ('value', 'fresh_until', 'stale_until')
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class TTLCache:
+    """Size-bounded LRU cache with per-entry TTL.
+
+    Entries are fresh for `ttl` seconds and may then be served stale for another
+    `stale_ttl` seconds while a single background task refreshes them. Concurrent
+    misses for the same key share one loader call.
+    """
+
+    def __init__(self, max_entries: int = 1000, name: str = "cache", clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.name = name
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = itertools.count()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shared_loads = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.load_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _purge_expired(self, now: float):
+        """Drop entries whose stale window has passed (amortized O(log n) each)."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            stale_until, _, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # Skip heap records left behind by a later set() of the same key
+            if entry is not None and entry.stale_until == stale_until:
+                del self._entries[key]
+                self.expirations += 1
+        # Rebuild when superseded records dominate the heap
+        if len(heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [(e.stale_until, next(self._counter), k) for k, e in self._entries.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh value without touching LRU order or statistics."""
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() < entry.fresh_until:
+            return entry.value
+        return None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value if it is still fresh."""
+        now = self._clock()
+        self._purge_expired(now)
+        entry = self._entries.get(key)
+        if entry is None or now >= entry.fresh_until:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: float, stale_ttl: float = 0.0):
+        """Store a value, evicting least recently used entries beyond max_entries."""
+        now = self._clock()
+        entry = _Entry(value, now + ttl, now + ttl + stale_ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (entry.stale_until, next(self._counter), key))
+        self._purge_expired(now)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Remove a key (its heap record is discarded lazily)."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._expiry_heap.clear()
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float) -> asyncio.Future:
+        # Run the loader as its own task so a disconnecting caller does not cancel
+        # it for the other callers waiting on the same key
+        task = asyncio.ensure_future(loader())
+        self._in_flight[key] = task
+
+        def _on_done(done: asyncio.Future):
+            self._in_flight.pop(key, None)
+            if done.cancelled():
+                return
+            if done.exception() is not None:
+                self.load_errors += 1
+                return
+            self.set(key, done.result(), ttl, stale_ttl)
+
+        task.add_done_callback(_on_done)
+        return task
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0.0,
+    ) -> Any:
+        """Return the cached value, loading it at most once across concurrent callers.
+
+        A stale value is returned immediately while a background refresh runs.
+        """
+        now = self._clock()
+        self._purge_expired(now)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                self.hits += 1
+                return entry.value
+            # Stale but inside the grace window: serve it and refresh once
+            self.stale_hits += 1
+            if key not in self._in_flight:
+                self._start_load(key, loader, ttl, stale_ttl)
+            return entry.value
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.shared_loads += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        return await asyncio.shield(self._start_load(key, loader, ttl, stale_ttl))
+
+    def stats(self) -> dict:
+        """Hit-ratio metrics for monitoring."""
+        lookups = self.hits + self.stale_hits + self.misses + self.shared_loads
+        served_from_cache = self.hits + self.stale_hits + self.shared_loads
+        return {
+            'name': self.name,
+            'entries': len(self._entries),
+            'maxEntries': self.max_entries,
+            'inFlight': len(self._in_flight),
+            'hits': self.hits,
+            'staleHits': self.stale_hits,
+            'misses': self.misses,
+            'sharedLoads': self.shared_loads,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'loadErrors': self.load_errors,
+            'hitRatio': round(served_from_cache / lookups, 3) if lookups else 0.0,
+        }
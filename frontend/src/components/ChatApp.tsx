@@ -14,6 +14,8 @@ import type { Message, ChatResponse, Market } from '../types'
 // Use relative URLs in production (proxy handles routing), or explicit URL if set
 // In production, always use relative URLs so the proxy can handle routing
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || ''
+// Recent messages sent with each request so the backend can re-seed a conversation it lost
+const RESEED_HISTORY_MESSAGES = 6
 
 // Log API URL for debugging (will show in browser console)
 if (import.meta.env.DEV) {
@@ -33,6 +35,11 @@ function ChatApp() {
   const [selectedMarketForTrades, setSelectedMarketForTrades] = useState<{id: string, title?: string} | null>(null)
   
   const messagesEndRef = useRef<HTMLDivElement>(null)
+  // Server-side conversation id - the backend keeps the full history
+  const conversationIdRef = useRef<string | null>(null)
+  // Last few successful exchanges, used by the backend only if it no longer has the conversation
+  // (server restart or eviction)
+  const recentHistoryRef = useRef<Message[]>([])
 
   // Fetch trending markets on component mount
   useEffect(() => {
@@ -72,13 +79,6 @@ function ChatApp() {
     setIsLoading(true)
 
     try {
-      // Send conversation history (last 10 messages BEFORE adding current message)
-      // This excludes the current message since it's sent separately
-      const conversationHistory = messages.slice(-10).map(msg => ({
-        role: msg.role,
-        content: msg.content
-      }))
-      
       // Ensure no double slashes in URL
       const baseUrl = API_BASE_URL.endsWith('/') ? API_BASE_URL.slice(0, -1) : API_BASE_URL
       const apiUrl = `${baseUrl}/api/chat`
@@ -88,16 +88,23 @@ function ChatApp() {
       const response = await axios.post<ChatResponse>(apiUrl, {
         message: message,
         search_query: message.toLowerCase().includes('search') ? message : null,
-        conversation_history: conversationHistory,
+        conversation_id: conversationIdRef.current,
+        conversation_history: recentHistoryRef.current,
         language: 'en'
       }, {
         timeout: 60000 // 60 second timeout
       })
 
+      if (response.data.conversation_id) {
+        conversationIdRef.current = response.data.conversation_id
+      }
+
       const assistantMessage: Message = {
         role: 'assistant',
         content: response.data.response
       }
+      recentHistoryRef.current = [...recentHistoryRef.current, userMessage, assistantMessage]
+        .slice(-RESEED_HISTORY_MESSAGES)
 
       setMessages(prev => [...prev, assistantMessage])
     } catch (error) {
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
 import axios from 'axios'
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts'
@@ -58,6 +58,19 @@ interface TradingStats {
   winRate: number
 }
 
+interface PnlPoint {
+  timestamp: string
+  pnl: number
+  balance: number
+  netWorth: number
+}
+
+interface TradingStreamMessage {
+  type: 'snapshot' | 'trade' | 'position' | 'pnl' | 'stats' | 'heartbeat'
+  version?: number
+  data?: any
+}
+
 function TradingDashboard() {
   const navigate = useNavigate()
   const [trades, setTrades] = useState<SimulatedTrade[]>([])
@@ -76,9 +89,11 @@ function TradingDashboard() {
   const [markets, setMarkets] = useState<any[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
-  const [pnlHistory, setPnlHistory] = useState<Array<{timestamp: string, pnl: number, balance: number, netWorth: number}>>([])
+  const [pnlHistory, setPnlHistory] = useState<PnlPoint[]>([])
   const [backendConnected, setBackendConnected] = useState(false)
   const [errorCount, setErrorCount] = useState(0)
+  // True while the push feed is live; REST polling below is the fallback
+  const streamConnectedRef = useRef(false)
 
   // Debug: Log when component mounts
   useEffect(() => {
@@ -102,110 +117,146 @@ function TradingDashboard() {
     fetchMarkets()
   }, [])
 
+  // Push feed: one snapshot, then trade/position/pnl/stats deltas
+  useEffect(() => {
+    let ws: WebSocket | null = null
+    let reconnectTimeout: ReturnType<typeof setTimeout> | null = null
+    let snapshotVersion = 0
+    let closed = false
+
+    const connect = () => {
+      const wsProtocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:'
+      const host = API_BASE_URL
+        ? API_BASE_URL.replace(/^https?:\/\//, '').replace(/\/$/, '')
+        : window.location.host
+      ws = new WebSocket(`${wsProtocol}//${host}/api/trading/stream`)
+
+      ws.onmessage = (event) => {
+        let message: TradingStreamMessage
+        try {
+          message = JSON.parse(event.data)
+        } catch (e) {
+          return
+        }
+
+        if (message.type === 'snapshot' && message.data) {
+          snapshotVersion = message.data.version ?? 0
+          setStats(message.data.stats)
+          setPositions(message.data.positions ?? [])
+          setTrades(message.data.trades ?? [])
+          setPnlHistory(message.data.pnlHistory ?? [])
+          streamConnectedRef.current = true
+          setBackendConnected(true)
+          setErrorCount(0)
+          setError(null)
+          setLoading(false)
+          return
+        }
+        // Deltas up to the snapshot version are already part of the snapshot
+        if (!streamConnectedRef.current || (message.version ?? 0) <= snapshotVersion) {
+          return
+        }
+
+        if (message.type === 'trade') {
+          const trade = message.data as SimulatedTrade
+          setTrades(prev => [trade, ...prev].slice(0, 100))
+        } else if (message.type === 'position') {
+          const { key, position } = message.data as { key: string, position: TradingPosition | null }
+          setPositions(prev => {
+            const index = prev.findIndex(p => `${p.marketId}-${p.outcome}` === key)
+            if (!position) return index === -1 ? prev : prev.filter((_, i) => i !== index)
+            if (index === -1) return [...prev, position]
+            const next = [...prev]
+            next[index] = position
+            return next
+          })
+        } else if (message.type === 'pnl') {
+          const point = message.data as PnlPoint
+          setPnlHistory(prev => [...prev, point].slice(-100))
+        } else if (message.type === 'stats') {
+          setStats(message.data as TradingStats)
+        }
+      }
+
+      ws.onclose = () => {
+        streamConnectedRef.current = false
+        if (!closed) {
+          // Polling takes over until the feed reconnects
+          reconnectTimeout = setTimeout(connect, 3000)
+        }
+      }
+    }
+
+    connect()
+
+    return () => {
+      closed = true
+      streamConnectedRef.current = false
+      if (reconnectTimeout) clearTimeout(reconnectTimeout)
+      ws?.close()
+    }
+  }, [])
+
   // Fetch trading data from backend
   useEffect(() => {
+    const fetchAnalyses = async () => {
+      const analysesResponse = await axios.get(`${API_BASE_URL}/api/trading/analyses`)
+      const analysesMap = new Map<string, MarketAnalysis>()
+      if (Array.isArray(analysesResponse.data?.analyses)) {
+        analysesResponse.data.analyses.forEach((a: MarketAnalysis) => {
+          if (a && a.marketId) {
+            analysesMap.set(a.marketId, a)
+          }
+        })
+      }
+      setAnalyses(analysesMap)
+    }
+
     const fetchTradingData = async () => {
+      // Stats, positions, trades and P&L arrive over the push feed while it is up;
+      // analyses are not streamed and are still polled
+      if (streamConnectedRef.current) {
+        try {
+          await fetchAnalyses()
+        } catch (error) {
+          // Analyses are non-critical; the feed reports connectivity
+        }
+        return
+      }
+
       try {
         // Only show error after multiple consecutive failures
         if (errorCount < 3) {
           setError(null)
         }
         
-        // Fetch stats
-        const statsUrl = `${API_BASE_URL}/api/trading/stats`
-        const statsResponse = await axios.get(statsUrl, {
+        // One request for stats, positions, trades and P&L history. The backend
+        // sends an ETag, so unchanged state is revalidated with a 304 and no body.
+        const snapshotResponse = await axios.get(`${API_BASE_URL}/api/trading/snapshot`, {
           timeout: 5000 // 5 second timeout
         })
-        // Stats fetched
-        if (statsResponse.data) {
-          // Log debug info from backend
-          if (statsResponse.data._debug) {
-            console.log('TradingDashboard: Stats Debug Info:', statsResponse.data._debug)
-            console.log(`  - Bot is running: ${statsResponse.data._debug.bot_is_running}`)
-            console.log(`  - Internal trades count: ${statsResponse.data._debug.internal_trades_count}`)
-            console.log(`  - Has Claude client: ${statsResponse.data._debug.has_claude_client}`)
-            console.log(`  - Has CLOB client: ${statsResponse.data._debug.has_clob_client}`)
-            console.log(`  - CLOB initialized: ${statsResponse.data._debug.clob_initialized}`)
-            console.log(`  - Market analyses: ${statsResponse.data._debug.market_analyses_count}`)
-            
-            if (!statsResponse.data._debug.bot_is_running) {
-              console.error('ERROR: Trading bot is not running! Check backend logs.')
-            }
-            if (!statsResponse.data._debug.has_claude_client) {
-              console.warn('WARNING: Claude client not initialized. Set ANTHROPIC_API_KEY environment variable.')
-            }
-            if (!statsResponse.data._debug.clob_initialized && !statsResponse.data._debug.has_clob_client) {
-              console.warn('WARNING: CLOB client not initialized. Install py-clob-client.')
-            }
-          }
-          
+        const snapshot = snapshotResponse.data ?? {}
+        if (snapshot.stats) {
           setStats({
-            balance: statsResponse.data.balance ?? 2000,
-            initialBalance: statsResponse.data.initialBalance ?? 2000,
-            totalProfit: statsResponse.data.totalProfit ?? 0,
-            realizedProfit: statsResponse.data.realizedProfit ?? 0,
-            unrealizedProfit: statsResponse.data.unrealizedProfit ?? 0,
-            netWorth: statsResponse.data.netWorth ?? (statsResponse.data.initialBalance ?? 2000),
-            totalTrades: statsResponse.data.totalTrades ?? 0,
-            winningTrades: statsResponse.data.winningTrades ?? 0,
-            losingTrades: statsResponse.data.losingTrades ?? 0,
-            activePositions: statsResponse.data.activePositions ?? 0,
-            winRate: statsResponse.data.winRate ?? 0
+            balance: snapshot.stats.balance ?? 2000,
+            initialBalance: snapshot.stats.initialBalance ?? 2000,
+            totalProfit: snapshot.stats.totalProfit ?? 0,
+            realizedProfit: snapshot.stats.realizedProfit ?? 0,
+            unrealizedProfit: snapshot.stats.unrealizedProfit ?? 0,
+            netWorth: snapshot.stats.netWorth ?? (snapshot.stats.initialBalance ?? 2000),
+            totalTrades: snapshot.stats.totalTrades ?? 0,
+            winningTrades: snapshot.stats.winningTrades ?? 0,
+            losingTrades: snapshot.stats.losingTrades ?? 0,
+            activePositions: snapshot.stats.activePositions ?? 0,
+            winRate: snapshot.stats.winRate ?? 0
           })
         }
-
-        // Fetch positions
-        const positionsResponse = await axios.get(`${API_BASE_URL}/api/trading/positions`)
-        const positionsList = Array.isArray(positionsResponse.data?.positions) ? positionsResponse.data.positions : []
-        setPositions(positionsList)
-
-        // Fetch trades
-        const tradesResponse = await axios.get(`${API_BASE_URL}/api/trading/trades?limit=100`)
-        // Log debug info from backend
-        if (tradesResponse.data?._debug) {
-          console.log('TradingDashboard: Backend Debug Info:', tradesResponse.data._debug)
-          console.log(`  - Bot is running: ${tradesResponse.data._debug.bot_is_running}`)
-          console.log(`  - Internal trades count: ${tradesResponse.data._debug.internal_trades_count}`)
-          console.log(`  - Returned trades count: ${tradesResponse.data._debug.returned_trades_count}`)
-          console.log(`  - Has Claude client: ${tradesResponse.data._debug.has_claude_client}`)
-          console.log(`  - Has CLOB client: ${tradesResponse.data._debug.has_clob_client}`)
-          console.log(`  - Market analyses: ${tradesResponse.data._debug.market_analyses_count}`)
-          console.log(`  - Positions: ${tradesResponse.data._debug.positions_count}`)
-          console.log(`  - Balance: $${tradesResponse.data._debug.balance}`)
-          
-          if (tradesResponse.data._debug.internal_trades_count > 0 && tradesResponse.data._debug.returned_trades_count === 0) {
-            console.error('ERROR: Backend has trades but get_recent_trades returned empty!')
-          }
-          if (!tradesResponse.data._debug.bot_is_running) {
-            console.error('ERROR: Trading bot is not running!')
-          }
-          if (!tradesResponse.data._debug.has_claude_client) {
-            console.warn('WARNING: Claude client not initialized - trading decisions will use algorithmic fallback')
-          }
-        }
-        
-        const tradesList = Array.isArray(tradesResponse.data?.trades) ? tradesResponse.data.trades : []
-        // Trades data processed
-        setTrades(tradesList)
+        setPositions(Array.isArray(snapshot.positions) ? snapshot.positions : [])
+        setTrades(Array.isArray(snapshot.trades) ? snapshot.trades : [])
+        setPnlHistory(Array.isArray(snapshot.pnlHistory) ? snapshot.pnlHistory : [])
 
         // Fetch analyses
-        const analysesResponse = await axios.get(`${API_BASE_URL}/api/trading/analyses`)
-        const analysesMap = new Map<string, MarketAnalysis>()
-        if (Array.isArray(analysesResponse.data?.analyses)) {
-          analysesResponse.data.analyses.forEach((a: MarketAnalysis) => {
-            if (a && a.marketId) {
-              analysesMap.set(a.marketId, a)
-            }
-          })
-        }
-        setAnalyses(analysesMap)
-        
-        // Fetch P&L history
-        const pnlResponse = await axios.get(`${API_BASE_URL}/api/trading/pnl-history?limit=100`, {
-          timeout: 5000
-        })
-        const pnlList = Array.isArray(pnlResponse.data?.history) ? pnlResponse.data.history : []
-        setPnlHistory(pnlList)
+        await fetchAnalyses()
         
         // Success - reset error count and mark as connected
         setBackendConnected(true)
@@ -237,27 +288,6 @@ function TradingDashboard() {
       }
     }
     
-    const fetchPnlHistory = async () => {
-      // Skip if backend is not connected to avoid spam
-      if (!backendConnected && errorCount >= 3) {
-        return
-      }
-      
-      try {
-        const pnlResponse = await axios.get(`${API_BASE_URL}/api/trading/pnl-history?limit=100`, {
-          timeout: 5000
-        })
-        if (Array.isArray(pnlResponse.data?.history)) {
-          setPnlHistory(pnlResponse.data.history)
-        }
-        setBackendConnected(true)
-        setErrorCount(0)
-      } catch (error) {
-        // Silently fail for P&L history to avoid error spam
-        // Error fetching P&L history (logged server-side)
-      }
-    }
-
     // Fetch immediately
     fetchTradingData()
 
@@ -266,13 +296,9 @@ function TradingDashboard() {
     const interval = setInterval(() => {
       fetchTradingData()
     }, 2000)
-    
-    // Fetch P&L history every 5 seconds (less frequent)
-    const pnlInterval = setInterval(fetchPnlHistory, 5000)
 
     return () => {
       clearInterval(interval)
-      clearInterval(pnlInterval)
     }
   }, []) // Empty deps - fetch functions use current state values via closure
 
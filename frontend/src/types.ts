@@ -6,6 +6,7 @@ export interface Message {
 export interface ChatResponse {
   response: string;
   markets?: Market[];
+  conversation_id?: string;
 }
 
 export interface Market {